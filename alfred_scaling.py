@@ -22,8 +22,12 @@ Memory addresses:
 Author: Reverse engineered from JUEGO.EXE
 """
 
+import hashlib
+import inspect
+import os
 import numpy as np
-from typing import Tuple, Optional
+from pathlib import Path
+from typing import Callable, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 
@@ -141,6 +145,80 @@ def generate_scale_table_62() -> np.ndarray:
     return table
 
 
+# =============================================================================
+# SHARED TABLE CACHE
+# =============================================================================
+#
+# The tables are generated once, saved as .npy files and memory-mapped on
+# first use; every AlfredScaler (and verify_and_demo_scaling.py) shares the
+# same arrays. The file name carries SCALE_TABLE_VERSION and a hash of the
+# generator's source, so a changed generator never reads a stale table.
+# verify_scale_tables() compares the cache against fresh generator output.
+
+SCALE_TABLE_VERSION = 1
+SCALE_TABLE_CACHE_DIR = Path(os.environ.get(
+    'ALFRED_SCALE_TABLE_CACHE', Path(__file__).resolve().parent / '.scale_table_cache'))
+
+SCALE_TABLE_GENERATORS: Dict[str, Callable[[], np.ndarray]] = {
+    'table_x': generate_scale_table_51,
+    'table_y': generate_scale_table_102,
+    'table_66': generate_scale_table_66,
+    'table_62': generate_scale_table_62,
+}
+
+_shared_tables: Dict[str, np.ndarray] = {}
+
+
+def _cache_path(name: str, source: Callable) -> Path:
+    source_hash = hashlib.sha256(inspect.getsource(source).encode()).hexdigest()[:12]
+    return SCALE_TABLE_CACHE_DIR / f"{name}.v{SCALE_TABLE_VERSION}.{source_hash}.npy"
+
+
+def cached_table(name: str, generator: Callable[[], np.ndarray],
+                 source: Optional[Callable] = None) -> np.ndarray:
+    """
+    Load a table from the shared cache, generating and saving it if needed.
+
+    source is the function whose code defines the table (defaults to
+    generator); its hash is part of the cache file name.
+
+    Returns a read-only memory-mapped array (or the generated array if the
+    cache directory is not writable).
+    """
+    table = _shared_tables.get(name)
+    if table is not None:
+        return table
+
+    path = _cache_path(name, source or generator)
+    try:
+        table = np.load(path, mmap_mode='r', allow_pickle=False)
+    except (OSError, ValueError):
+        table = np.asarray(generator(), dtype=np.uint8)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, table)
+            os.replace(tmp_path, path)
+            table = np.load(path, mmap_mode='r', allow_pickle=False)
+        except OSError:
+            pass  # Read-only location: keep the in-memory table
+
+    _shared_tables[name] = table
+    return table
+
+
+def load_scale_table(name: str) -> np.ndarray:
+    """One of the game's scale tables: table_x, table_y, table_66, table_62"""
+    return cached_table(name, SCALE_TABLE_GENERATORS[name])
+
+
+def verify_scale_tables() -> Dict[str, bool]:
+    """Compare every cached table against its generator"""
+    return {name: bool(np.array_equal(load_scale_table(name), generator()))
+            for name, generator in SCALE_TABLE_GENERATORS.items()}
+
+
 # =============================================================================
 # SCALE FACTOR CALCULATION (from load_room_data @ 0x0001585c)
 # =============================================================================
@@ -239,12 +317,22 @@ class AlfredScaler:
     ALFRED_WIDTH = 51   # 0x33
     ALFRED_HEIGHT = 102  # 0x66
 
-    def __init__(self):
-        """Initialize scaling tables."""
-        self.table_x = generate_scale_table_51()
-        self.table_y = generate_scale_table_102()
-        self.table_66 = generate_scale_table_66()
-        self.table_62 = generate_scale_table_62()
+    # Tables come from the shared cache on first access (see cached_table)
+    @property
+    def table_x(self) -> np.ndarray:
+        return load_scale_table('table_x')
+
+    @property
+    def table_y(self) -> np.ndarray:
+        return load_scale_table('table_y')
+
+    @property
+    def table_66(self) -> np.ndarray:
+        return load_scale_table('table_66')
+
+    @property
+    def table_62(self) -> np.ndarray:
+        return load_scale_table('table_62')
 
     def scale_sprite(
         self,
@@ -383,6 +471,10 @@ def demo_scaling():
 
     scaler = AlfredScaler()
 
+    mismatched = [name for name, ok in verify_scale_tables().items() if not ok]
+    print(f"\nScale table cache: {SCALE_TABLE_CACHE_DIR} "
+          f"({'consistent' if not mismatched else 'MISMATCH: ' + ', '.join(mismatched)})")
+
     # Show scale table samples
     print_scale_table_sample(scaler.table_x, "scale_table_x_51 (width scaling)")
     print_scale_table_sample(scaler.table_y, "scale_table_y_102 (height scaling)")
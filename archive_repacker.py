@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - RLE Encoder and Archive Repacker
+=================================================
+
+Re-encodes modified graphics and writes them back into the game archives.
+
+RLE format read and written here: (count, value) byte pairs, runs of at
+most 255, terminated by "BUDA" on a pair boundary. Background blocks
+whose stored size is exactly 0x8000 or 0x6800 are raw, so:
+
+  - a block is stored raw when RLE would not be smaller and its length is
+    one of the raw sizes (blocks 0-6 are 0x8000 pixels, block 7 0x6800)
+  - an RLE block whose size would collide with a raw size gets one run
+    split in two, so the game never mistakes it for raw data
+  - a 0x42 x 0x55 pair ("BU") followed by a 0x44 x 0x41 pair ("DA") is
+    written as 0x41 + 0x01 pixels of 0x55, so no run spells the marker
+
+Run boundaries are found with np.diff/np.flatnonzero and long runs are
+split at 255 without a Python loop per pixel.
+
+ALFRED.1 repacking (repack_alfred1):
+  The 56 x 104-byte directory holds 13 (offset u32, size u32) pairs per
+  room. Replaced pairs get new sizes; everything else in the file is
+  copied unchanged, zero-copy from an mmap of the original, and every
+  directory offset is shifted by the size change of the replaced spans
+  before it. The output is written in one sequential pass.
+
+ALFRED.7 (patch_alfred7_chunk):
+  JUEGO.EXE addresses ALFRED.7 resources by hardcoded offsets
+  (ALFRED7_ANIMATION_OFFSETS.md), so the file cannot be relaid out.
+  A re-encoded chunk is written in place and must fit in the original
+  chunk (up to and including its BUDA marker); leftover bytes after the
+  new marker are left as they were.
+
+Usage:
+    python3 archive_repacker.py background <alfred.1> <room> <image.png> <output.1>
+    python3 archive_repacker.py roundtrip <alfred.1> <output.1>
+"""
+
+import mmap
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+NUM_ROOMS = 56
+PAIRS_PER_ROOM = 13
+ROOM_STRUCT_SIZE = 104
+DIRECTORY_SIZE = NUM_ROOMS * ROOM_STRUCT_SIZE
+
+BUDA = b'BUDA'
+RAW_BLOCK_SIZES = (0x8000, 0x6800)
+MAX_RUN = 255
+
+BACKGROUND_BLOCK = 0x8000
+BACKGROUND_SIZE = 640 * 400
+BACKGROUND_PAIRS = 8
+
+
+class RepackError(Exception):
+    pass
+
+
+# =============================================================================
+# RLE
+# =============================================================================
+
+def rle_runs(pixels) -> Tuple[np.ndarray, np.ndarray]:
+    """(counts, values) of the RLE pairs for pixels, runs capped at 255"""
+    arr = np.frombuffer(bytes(pixels), dtype=np.uint8) if not isinstance(pixels, np.ndarray) \
+        else np.ascontiguousarray(pixels, dtype=np.uint8).reshape(-1)
+    if len(arr) == 0:
+        return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint8)
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(arr)) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(arr)])))
+    values = arr[starts]
+
+    # Split runs longer than 255 into full chunks plus a remainder
+    chunks = (lengths + MAX_RUN - 1) // MAX_RUN
+    run_of_chunk = np.repeat(np.arange(len(lengths)), chunks)
+    first_chunk = np.cumsum(chunks) - chunks
+    chunk_in_run = np.arange(len(run_of_chunk)) - first_chunk[run_of_chunk]
+    counts = np.minimum(lengths[run_of_chunk] - chunk_in_run * MAX_RUN, MAX_RUN)
+    return counts.astype(np.uint8), values[run_of_chunk]
+
+
+def is_marker_start(counts, values) -> np.ndarray:
+    """Pairs spelling "BU" that are followed by a pair spelling "DA" (a false terminator)"""
+    if len(counts) < 2:
+        return np.zeros(len(counts), dtype=bool)
+    bu = (counts[:-1] == BUDA[0]) & (values[:-1] == BUDA[1])
+    da = (counts[1:] == BUDA[2]) & (values[1:] == BUDA[3])
+    return np.concatenate((bu & da, [False]))
+
+
+def break_markers(counts, values) -> Tuple[np.ndarray, np.ndarray]:
+    """Split every "BU" run that precedes a "DA" run so the pairs never read as BUDA"""
+    hits = np.flatnonzero(is_marker_start(counts, values))
+    if len(hits) == 0:
+        return counts, values
+    counts = counts.copy()
+    counts[hits] -= 1
+    counts = np.insert(counts, hits + 1, 1).astype(np.uint8)
+    values = np.insert(values, hits + 1, values[hits])
+    return counts, values
+
+
+def pack_pairs(counts, values) -> bytes:
+    pairs = np.empty((len(counts), 2), dtype=np.uint8)
+    pairs[:, 0] = counts
+    pairs[:, 1] = values
+    return pairs.tobytes()
+
+
+def rle_encode(pixels) -> bytes:
+    """(count, value) pairs without terminator"""
+    return pack_pairs(*break_markers(*rle_runs(pixels)))
+
+
+def rle_decode(data, offset=0, size=None) -> bytes:
+    """Vectorized decoder matching decompress_rle_block (stops at BUDA)"""
+    end = len(data) if size is None else min(offset + size, len(data))
+    chunk = bytes(data[offset:end])
+    stop = chunk.find(BUDA)
+    while stop >= 0 and stop % 2:  # Markers sit on pair boundaries
+        stop = chunk.find(BUDA, stop + 1)
+    if stop < 0:
+        stop = len(chunk)
+    pairs = np.frombuffer(chunk, dtype=np.uint8, count=(stop // 2) * 2).reshape(-1, 2)
+    return np.repeat(pairs[:, 1], pairs[:, 0]).tobytes()
+
+
+def decode_block(data, offset, size) -> bytes:
+    if size in RAW_BLOCK_SIZES:
+        return bytes(data[offset:offset + size])
+    return rle_decode(data, offset, size)
+
+
+def encode_block(pixels) -> bytes:
+    """Encode one background block, raw or RLE + BUDA, whichever the game reads back"""
+    raw = bytes(pixels)
+    counts, values = break_markers(*rle_runs(raw))
+    encoded_size = len(counts) * 2 + len(BUDA)
+
+    if len(raw) in RAW_BLOCK_SIZES and encoded_size >= len(raw):
+        return raw
+
+    if encoded_size in RAW_BLOCK_SIZES:
+        # Split the first run of 2+ pixels so the size can't read as "raw",
+        # skipping runs whose remainder would spell "BU" before a "DA"
+        next_is_da = np.concatenate(((counts[1:] == BUDA[2]) & (values[1:] == BUDA[3]), [False]))
+        makes_marker = (counts == BUDA[0] + 1) & (values == BUDA[1]) & next_is_da
+        splittable = np.flatnonzero((counts >= 2) & ~makes_marker)
+        if len(splittable) == 0:
+            raise RepackError(f"Cannot encode {len(raw)} pixels without a raw-size collision")
+        i = int(splittable[0])
+        counts = np.concatenate((counts[:i], [1, counts[i] - 1], counts[i + 1:])).astype(np.uint8)
+        values = np.concatenate((values[:i], [values[i]], values[i:]))
+
+    return pack_pairs(counts, values) + BUDA
+
+
+# Runs that would spell the terminator must still decode in full
+_MARKER_RUNS = bytes([0x55] * 0x42 + [0x41] * 0x44 + [7] * 100)
+assert rle_decode(encode_block(_MARKER_RUNS)) == _MARKER_RUNS
+assert rle_decode(rle_encode(_MARKER_RUNS)) == _MARKER_RUNS
+
+
+def encode_background(pixels) -> List[bytes]:
+    """Split a 640x400 background into the 8 pair blocks and encode each"""
+    raw = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(-1) if isinstance(pixels, np.ndarray) \
+        else np.frombuffer(bytes(pixels), dtype=np.uint8)
+    if len(raw) != BACKGROUND_SIZE:
+        raise RepackError(f"Background must be {BACKGROUND_SIZE} pixels, got {len(raw)}")
+    return [encode_block(raw[start:start + BACKGROUND_BLOCK].tobytes())
+            for start in range(0, BACKGROUND_SIZE, BACKGROUND_BLOCK)]
+
+
+# =============================================================================
+# ALFRED.1
+# =============================================================================
+
+def read_directory(data) -> np.ndarray:
+    """(56, 13, 2) array of (offset, size) pairs"""
+    return np.frombuffer(data, dtype='<u4', count=NUM_ROOMS * PAIRS_PER_ROOM * 2).reshape(
+        NUM_ROOMS, PAIRS_PER_ROOM, 2).copy()
+
+
+def plan_repack(directory: np.ndarray, file_size: int,
+                replacements: Dict[Tuple[int, int], bytes]):
+    """New directory and the ordered list of file spans to write.
+
+    Returns (new_directory, segments) where each segment is either
+    ('copy', start, end) from the original or ('data', bytes).
+    """
+    spans = {}
+    for (room, pair), payload in replacements.items():
+        offset, size = (int(v) for v in directory[room, pair])
+        if offset == 0 and size == 0:
+            raise RepackError(f"Room {room} pair {pair} is empty; nothing to replace")
+        if (offset, size) in spans and spans[(offset, size)] != payload:
+            raise RepackError(f"Conflicting replacements for shared block at 0x{offset:x}")
+        spans[(offset, size)] = payload
+
+    ordered = sorted(spans.items())
+    for (a_off, a_size), _ in ordered:
+        if a_off < DIRECTORY_SIZE or a_off + a_size > file_size:
+            raise RepackError(f"Block 0x{a_off:x}+0x{a_size:x} outside the data area")
+    for ((a_off, a_size), _), ((b_off, _), _) in zip(ordered, ordered[1:]):
+        if a_off + a_size > b_off:
+            raise RepackError(f"Replaced blocks at 0x{a_off:x} and 0x{b_off:x} overlap")
+
+    # Offset shift for every original position
+    starts = np.array([off for (off, _), _ in ordered], dtype=np.int64)
+    ends = np.array([off + size for (off, size), _ in ordered], dtype=np.int64)
+    deltas = np.array([len(payload) - size for (_, size), payload in ordered], dtype=np.int64)
+    shift_after = np.concatenate(([0], np.cumsum(deltas)))
+
+    new_directory = directory.astype(np.int64)
+    offsets = new_directory[..., 0]
+    used = (offsets != 0) | (new_directory[..., 1] != 0)
+    # Number of replaced spans ending at or before each offset
+    passed = np.searchsorted(ends, offsets, side='right')
+    inside = np.searchsorted(starts, offsets, side='right') > passed
+    start_of_span = np.isin(offsets, starts)
+    if np.any(used & inside & ~start_of_span):
+        room, pair = np.argwhere(used & inside & ~start_of_span)[0]
+        raise RepackError(f"Room {room} pair {pair} points inside a replaced block")
+    new_directory[..., 0] = np.where(used, offsets + shift_after[passed], offsets)
+
+    for (offset, size), payload in ordered:
+        hits = used & (directory[..., 0] == offset) & (directory[..., 1] == size)
+        new_directory[..., 1][hits] = len(payload)
+
+    segments = []
+    pos = DIRECTORY_SIZE
+    for (offset, size), payload in ordered:
+        if offset > pos:
+            segments.append(('copy', pos, offset))
+        segments.append(('data', payload))
+        pos = offset + size
+    if pos < file_size:
+        segments.append(('copy', pos, file_size))
+
+    if new_directory.max(initial=0) > 0xFFFFFFFF:
+        raise RepackError("Repacked archive exceeds 4 GB offsets")
+    return new_directory.astype('<u4'), segments
+
+
+def repack_alfred1(src_path, dst_path, replacements: Dict[Tuple[int, int], bytes]) -> dict:
+    """Write src with the given (room, pair) -> payload replacements to dst"""
+    if Path(src_path).resolve() == Path(dst_path).resolve():
+        raise RepackError("Output must be a different file than the input")
+
+    with open(src_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            directory = read_directory(mm)
+            new_directory, segments = plan_repack(directory, len(mm), replacements)
+            copied = written = 0
+            with open(dst_path, 'wb') as out:
+                out.write(new_directory.tobytes())
+                for segment in segments:
+                    if segment[0] == 'copy':
+                        _, start, end = segment
+                        out.write(view[start:end])
+                        copied += end - start
+                    else:
+                        out.write(segment[1])
+                        written += len(segment[1])
+        finally:
+            view.release()
+
+    return {'copied': copied, 'written': written, 'replaced': len(replacements),
+            'size': DIRECTORY_SIZE + copied + written}
+
+
+def background_replacements(room, pixels) -> Dict[Tuple[int, int], bytes]:
+    return {(room, pair): block for pair, block in enumerate(encode_background(pixels))}
+
+
+def room_background(data, room) -> bytes:
+    directory = read_directory(data)
+    return b''.join(decode_block(data, int(o), int(s))
+                    for o, s in directory[room, :BACKGROUND_PAIRS] if o > 0 and s > 0)
+
+
+# =============================================================================
+# ALFRED.7
+# =============================================================================
+
+def chunk_slot(data, offset) -> int:
+    """Bytes from offset up to and including the chunk's BUDA marker"""
+    end = bytes(data[offset:offset + 0x100000]).find(BUDA)
+    if end < 0:
+        raise RepackError(f"No BUDA marker after 0x{offset:x}")
+    return end + len(BUDA)
+
+
+def patch_alfred7_chunk(path, offset, pixels, output_path=None) -> int:
+    """Re-encode pixels into the RLE chunk at offset (in place or on a copy).
+
+    Returns the bytes left unused in the original slot.
+    """
+    payload = rle_encode(pixels) + BUDA
+    data = bytearray(Path(path).read_bytes())
+    slot = chunk_slot(data, offset)
+    if len(payload) > slot:
+        raise RepackError(f"Encoded chunk is {len(payload)} bytes; slot at 0x{offset:x} "
+                          f"holds {slot} (offsets are hardcoded in JUEGO.EXE)")
+    data[offset:offset + len(payload)] = payload
+    Path(output_path or path).write_bytes(data)
+    return slot - len(payload)
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+
+    command, src = sys.argv[1], sys.argv[2]
+    began = time.perf_counter()
+
+    if command == 'background' and len(sys.argv) >= 6:
+        from PIL import Image
+        room, image_path, dst = int(sys.argv[3]), sys.argv[4], sys.argv[5]
+        img = Image.open(image_path)
+        if img.mode != 'P' or img.size != (640, 400):
+            print("Image must be a 640x400 indexed PNG (see palette_lut.py to convert RGB)")
+            sys.exit(1)
+        replacements = background_replacements(room, np.asarray(img))
+    elif command == 'roundtrip':
+        dst = sys.argv[3]
+        # Re-encode every background; a faithful encoder reproduces the images
+        with open(src, 'rb') as f:
+            data = f.read()
+        directory = read_directory(data)
+        replacements = {}
+        for room in range(NUM_ROOMS):
+            if np.all(directory[room, :BACKGROUND_PAIRS, 1] > 0):
+                background = room_background(data, room)
+                if len(background) == BACKGROUND_SIZE:
+                    replacements.update(background_replacements(room, background))
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    try:
+        stats = repack_alfred1(src, dst, replacements)
+    except RepackError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - began
+
+    print(f"✓ {dst}: {stats['replaced']} blocks replaced, {stats['written']} bytes encoded, "
+          f"{stats['copied']} bytes copied ({elapsed:.2f}s)")
+
+    if command == 'roundtrip':
+        with open(dst, 'rb') as f:
+            repacked = f.read()
+        bad = [room for room in {r for r, _ in replacements}
+               if room_background(repacked, room) != room_background(data, room)]
+        print(f"  Backgrounds identical after round trip: {not bad}" + (f" (rooms {sorted(bad)})" if bad else ""))
+
+
+if __name__ == '__main__':
+    main()
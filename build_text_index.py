@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Full-Text Index Over Every Game String
+======================================
+
+Collects all game text into one string table with source locations and
+builds a token-level inverted index that is stored on disk, so lookups no
+longer need a linear re-scan of the binaries.
+
+Sources:
+  - ALFRED.1 pair 12: hotspot/sprite descriptions and conversation lines
+    (same parsing as export_trees_correct.py)
+  - JUEGO.EXE 0x4715D-0x49018: inventory object descriptions
+    (extract_complete_inventory.parse_all_descriptions)
+  - JUEGO.EXE room names after the `fd 00 08 02` marker
+    (extract_text_properly.extract_room_names)
+
+Each string entry records:
+  kind, text, file, offset (absolute file offset of the text bytes),
+  room, item (hotspot/sprite id or object id), node (conversation element
+  index) and choice (conversation choice index).
+
+Tokens are lowercased and accent-folded, so "nino" finds "niño".
+
+Usage:
+    python3 build_text_index.py build [index.json]
+    python3 build_text_index.py search <word> [word ...] [--prefix]
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+import export_trees_correct as trees
+from extract_complete_inventory import parse_all_descriptions
+from extract_text_properly import extract_room_names
+
+ALFRED1_PATH = 'files/ALFRED.1'
+JUEGO_PATH = 'files/JUEGO.EXE'
+INDEX_PATH = 'text_index.json'
+INDEX_VERSION = 2
+# Inventory descriptions and room names start after an `fd 00 08 xx` marker;
+# their parsers report the marker position
+JUEGO_MARKER_SIZE = 4
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+# =============================================================================
+# TOKENIZATION
+# =============================================================================
+
+def normalize(text):
+    """Lowercase and strip accents (á -> a, ñ -> n)"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Split text into normalized word tokens"""
+    return TOKEN_RE.findall(normalize(text))
+
+
+# =============================================================================
+# STRING EXTRACTION
+# =============================================================================
+
+def iter_room_descriptions(pair12, base_offset):
+    """Yield (offset, item_id, text) for each description record in pair 12.
+
+    Mirrors export_trees_correct.extract_descriptions, but keeps the record
+    position and the item id byte that follows the 0xFF marker.
+    """
+    pos = 0
+    while pos < len(pair12):
+        if pair12[pos] != 0xFF:
+            pos += 1
+            continue
+
+        pos += 1
+        if pos >= len(pair12):
+            break
+        item_id = pair12[pos]
+
+        pos += 4  # Skip item_id and 2 bytes and index
+        if pos >= len(pair12):
+            break
+
+        text_start = pos
+        text = ""
+        while pos < len(pair12) and pair12[pos] != 0xFD:
+            char = trees.decode_byte(pair12[pos])
+            if char:
+                text += char
+            pos += 1
+
+        yield base_offset + text_start, item_id, text
+
+        if pos < len(pair12) and pair12[pos] == 0xFD:
+            pos += 1
+
+
+def collect_alfred1_strings(data, num_rooms=trees.NUM_ROOMS):
+    """Descriptions and conversation lines from every room's pair 12"""
+    entries = []
+
+    for room_num in range(num_rooms):
+        pair_pos = room_num * 104 + 12 * 8
+        pair_offset, pair_size = struct.unpack('<II', data[pair_pos:pair_pos+8])
+        pair12 = trees.read_room_pair(data, room_num, pair_num=12)
+        if pair12 is None:
+            continue
+
+        for offset, item_id, text in iter_room_descriptions(pair12, pair_offset):
+            if text:
+                entries.append({
+                    'kind': 'description', 'text': text, 'file': 'ALFRED.1',
+                    'offset': offset, 'room': room_num, 'item': item_id,
+                })
+
+        _, conv_start_pos = trees.extract_descriptions(pair12)
+        conv_data = pair12[conv_start_pos:]
+        elements, _ = trees.parse_elements_with_indices(conv_data)
+
+        for node, elem in enumerate(elements):
+            if 'text' not in elem:
+                continue
+            entries.append({
+                'kind': 'conversation',
+                'text': elem['text'],
+                'file': 'ALFRED.1',
+                'offset': pair_offset + conv_start_pos + elem['offset'],
+                'room': room_num,
+                'node': node,
+                'choice': elem.get('choice_index'),
+                'speaker': elem.get('speaker', 'ALFRED'),
+            })
+
+    return entries
+
+
+def collect_juego_strings(juego_path, data):
+    """Inventory descriptions and room names from JUEGO.EXE"""
+    entries = []
+
+    for desc in parse_all_descriptions(juego_path):
+        entries.append({
+            'kind': 'inventory', 'text': desc['text'], 'file': 'JUEGO.EXE',
+            'offset': desc['offset'] + JUEGO_MARKER_SIZE, 'item': desc['id'],
+        })
+
+    for ordinal, (offset, name) in enumerate(extract_room_names(data)):
+        entries.append({
+            'kind': 'room_name', 'text': name, 'file': 'JUEGO.EXE',
+            'offset': offset + JUEGO_MARKER_SIZE, 'item': ordinal,
+        })
+
+    return entries
+
+
+# =============================================================================
+# INDEX BUILD / LOAD
+# =============================================================================
+
+def source_stamp(path):
+    """Cheap change detector for a source file (size + mtime)"""
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime': st.st_mtime_ns}
+
+
+def build_index(alfred1_path=ALFRED1_PATH, juego_path=JUEGO_PATH, index_path=INDEX_PATH):
+    """Extract every string and write the string table + inverted index"""
+    strings = []
+    sources = {}
+
+    if Path(alfred1_path).exists():
+        with open(alfred1_path, 'rb') as f:
+            strings.extend(collect_alfred1_strings(f.read()))
+        sources['ALFRED.1'] = source_stamp(alfred1_path)
+
+    if Path(juego_path).exists():
+        with open(juego_path, 'rb') as f:
+            strings.extend(collect_juego_strings(juego_path, f.read()))
+        sources['JUEGO.EXE'] = source_stamp(juego_path)
+
+    postings = {}
+    for string_id, entry in enumerate(strings):
+        for token in set(tokenize(entry['text'])):
+            postings.setdefault(token, []).append(string_id)
+
+    index = {
+        'version': INDEX_VERSION,
+        'sources': sources,
+        'strings': strings,
+        'tokens': dict(sorted(postings.items())),
+    }
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    return index
+
+
+class TextIndex:
+    """Loaded inverted index with word and prefix queries"""
+
+    def __init__(self, index):
+        self.strings = index['strings']
+        self.tokens = index['tokens']
+        self.sorted_tokens = sorted(self.tokens)
+
+    @classmethod
+    def load(cls, index_path=INDEX_PATH):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path}: unsupported index version {index.get('version')}")
+        return cls(index)
+
+    def _ids_for_prefix(self, prefix):
+        ids = set()
+        i = bisect_left(self.sorted_tokens, prefix)
+        while i < len(self.sorted_tokens) and self.sorted_tokens[i].startswith(prefix):
+            ids.update(self.tokens[self.sorted_tokens[i]])
+            i += 1
+        return ids
+
+    def search(self, query, prefix=False):
+        """Return string entries containing every word in query"""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        result = None
+        for word in words:
+            ids = self._ids_for_prefix(word) if prefix else set(self.tokens.get(word, ()))
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+
+        return [self.strings[i] for i in sorted(result)]
+
+
+def load_or_build(alfred1_path=ALFRED1_PATH, juego_path=JUEGO_PATH, index_path=INDEX_PATH):
+    """Load the on-disk index, rebuilding it if a source file changed"""
+    if Path(index_path).exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        current = {}
+        for name, path in (('ALFRED.1', alfred1_path), ('JUEGO.EXE', juego_path)):
+            if Path(path).exists():
+                current[name] = source_stamp(path)
+        if index.get('version') == INDEX_VERSION and index.get('sources') == current:
+            return TextIndex(index)
+
+    return TextIndex(build_index(alfred1_path, juego_path, index_path))
+
+
+def format_location(entry):
+    parts = [f"{entry['file']}@0x{entry['offset']:05X}", entry['kind']]
+    if entry.get('room') is not None:
+        parts.append(f"room {entry['room']}")
+    if entry.get('item') is not None:
+        parts.append(f"id {entry['item']}")
+    if entry.get('node') is not None:
+        parts.append(f"node {entry['node']}")
+    if entry.get('choice') is not None:
+        parts.append(f"choice {entry['choice']}")
+    return ', '.join(parts)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('build', 'search'):
+        print("Usage: python3 build_text_index.py build [index.json]")
+        print("       python3 build_text_index.py search <word> [word ...] [--prefix]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'build':
+        index_path = sys.argv[2] if len(sys.argv) > 2 else INDEX_PATH
+        index = build_index(index_path=index_path)
+        print(f"Indexed {len(index['strings'])} strings, "
+              f"{len(index['tokens'])} distinct tokens -> {index_path}")
+        return
+
+    args = [a for a in sys.argv[2:] if a != '--prefix']
+    index = load_or_build()
+    matches = index.search(' '.join(args), prefix='--prefix' in sys.argv)
+
+    for entry in matches:
+        print(f"{format_location(entry)}")
+        print(f"    {entry['text']}")
+    print(f"\n{len(matches)} match(es)")
+
+
+if __name__ == '__main__':
+    main()
@@ -162,31 +162,13 @@ def map_char_palette_to_room(char_palette, room_palette):
     """Create mapping from character palette indices to room palette indices
 
     For each character color, finds the closest matching color in the room palette
+    (vectorized; see palette_lut.py for cached 6-bit lookup cubes)
     """
-    mapping = bytearray(256)
+    from palette_lut import nearest_indices
 
-    for char_idx in range(256):
-        char_r = char_palette[char_idx * 3]
-        char_g = char_palette[char_idx * 3 + 1]
-        char_b = char_palette[char_idx * 3 + 2]
-
-        # Find closest color in room palette
-        best_idx = 0
-        best_dist = 999999
-
-        for room_idx in range(256):
-            room_r = room_palette[room_idx * 3]
-            room_g = room_palette[room_idx * 3 + 1]
-            room_b = room_palette[room_idx * 3 + 2]
-
-            dist = (char_r - room_r)**2 + (char_g - room_g)**2 + (char_b - room_b)**2
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = room_idx
-
-        mapping[char_idx] = best_idx
-
-    return mapping
+    char_colors = np.frombuffer(bytes(bytearray(char_palette[:768])), dtype=np.uint8).reshape(256, 3)
+    room_colors = np.frombuffer(bytes(bytearray(room_palette[:768])), dtype=np.uint8).reshape(256, 3)
+    return bytearray(nearest_indices(char_colors, room_colors).tobytes())
 
 
 def load_character_shadow_remap(room_number):
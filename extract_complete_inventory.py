@@ -21,8 +21,8 @@ def get_vga_palette():
     return palette
 
 # Parse all 113 descriptions
-def parse_all_descriptions():
-    with open('files/JUEGO.EXE', 'rb') as f:
+def parse_all_descriptions(juego_path='files/JUEGO.EXE'):
+    with open(juego_path, 'rb') as f:
         data = f.read()
 
     start = 0x4715D
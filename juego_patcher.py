@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Transactional Batch Patcher for JUEGO.EXE
+=========================================
+
+Applies a declarative list of patches in one go:
+
+  1. All pattern-located patches are found in a single signature scan
+     (signature_scanner.py); offset patches need no search.
+  2. Every target is validated against its expected bytes before anything
+     is written. If one patch fails, nothing is written.
+  3. Patches are applied in place through an mmap, or to a copy with a
+     single write.
+  4. Before/after SHA-256 hashes are appended to <file>.patchlog.json.
+     A copy appends to the output's existing log; a new copy starts from
+     the input's log, so history survives patch sets chained via copies.
+
+Re-applying is idempotent: targets that already hold the replacement bytes
+are skipped, and when the file hash matches the last logged result for the
+same patch set the file isn't even scanned. Reverting swaps expected and
+replacement bytes, so cheat/debug patches can be toggled on test copies.
+
+Memory addresses map to file offsets as memory + 0x3200 for the .data
+section (see patch_juego_enable_cheat.py).
+
+Usage:
+    python3 juego_patcher.py <patch_set> [input.exe] [output.exe] [--revert]
+    python3 juego_patcher.py --list
+"""
+
+import hashlib
+import json
+import mmap
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from signature_scanner import SignatureScanner, parse_pattern
+
+
+@dataclass
+class Patch:
+    """A single patch, located either by file offset or by signature"""
+    name: str
+    replacement: bytes
+    expected: Optional[bytes] = None  # Bytes that must be present before patching
+    offset: Optional[int] = None      # Absolute file offset of the target
+    pattern: Optional[str] = None     # Signature locating the target (hex, ?? wildcards)
+    pattern_offset: int = 0           # Target position relative to the signature match
+
+    def reversed(self):
+        """The patch that undoes this one"""
+        if self.expected is None:
+            raise ValueError(f"Patch {self.name!r} has no expected bytes; cannot revert")
+        pattern = self.applied_pattern() if self.pattern is not None else None
+        return Patch(self.name, self.expected, self.replacement, self.offset,
+                     pattern, self.pattern_offset)
+
+    def applied_pattern(self):
+        """The signature as it looks after this patch has been applied"""
+        values = list(parse_pattern(self.pattern))
+        for i, b in enumerate(self.replacement):
+            j = self.pattern_offset + i
+            if 0 <= j < len(values):
+                values[j] = b
+        return ' '.join('??' if v is None else f'{v:02X}' for v in values)
+
+
+class PatchError(Exception):
+    pass
+
+
+# =============================================================================
+# KNOWN PATCHES
+# =============================================================================
+
+# CMP byte ptr [0x000495f3],0x0 ; JZ 0x00010621
+CHEAT_CHECK_PATTERN = "?? 3D F3 95 04 00 00 0F 84 14 01 00 00"
+
+PATCH_SETS: Dict[str, List[Patch]] = {
+    # Set the cheat flag at memory 0x495f3 (file 0x4C7F3) from 0x00 to 0x01
+    'enable_cheat': [
+        Patch('cheat_flag', replacement=b'\x01', expected=b'\x00',
+              offset=0x495f3 + 0x3200),
+    ],
+    # NOP the JZ after the flag check so the cheat is always tested
+    'nop_cheat_check': [
+        Patch('cheat_check_jz', replacement=b'\x90' * 6,
+              expected=bytes([0x0F, 0x84, 0x14, 0x01, 0x00, 0x00]),
+              pattern=CHEAT_CHECK_PATTERN, pattern_offset=7),
+    ],
+}
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class PatchEngine:
+    """Validates and applies a list of patches as one transaction"""
+
+    def __init__(self, patches: List[Patch]):
+        self.patches = list(patches)
+        names = [p.name for p in self.patches]
+        if len(set(names)) != len(names):
+            raise ValueError("Patch names must be unique")
+
+        signatures = {}
+        for patch in self.patches:
+            if patch.pattern is not None:
+                signatures[patch.name] = patch.pattern
+                signatures[patch.name + ':applied'] = patch.applied_pattern()
+        self.scanner = SignatureScanner(signatures) if signatures else None
+        self._targets = None
+
+    @property
+    def key(self):
+        """Identifies this patch set in the patch log"""
+        blob = repr([(p.name, p.replacement, p.expected, p.offset, p.pattern, p.pattern_offset)
+                     for p in self.patches])
+        return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+    def locate(self, data) -> Dict[str, int]:
+        """Resolve every patch to a file offset (one scan for all patterns)"""
+        matches = self.scanner.scan_cached(bytes(data)) if self.scanner else {}
+        targets = {}
+
+        for patch in self.patches:
+            if patch.pattern is None:
+                if patch.offset is None:
+                    raise PatchError(f"{patch.name}: needs an offset or a pattern")
+                targets[patch.name] = patch.offset
+                continue
+
+            starts = set(matches[patch.name]) | set(matches[patch.name + ':applied'])
+            if len(starts) != 1:
+                raise PatchError(f"{patch.name}: pattern matched {len(starts)} times, expected 1")
+            targets[patch.name] = starts.pop() + patch.pattern_offset
+
+        return targets
+
+    def plan(self, data):
+        """Validate all patches; return [(patch, offset)] still to be written"""
+        pending = []
+        for patch in self.patches:
+            offset = self.locate_one(data, patch)
+            end = offset + len(patch.replacement)
+            if end > len(data):
+                raise PatchError(f"{patch.name}: offset 0x{offset:06x} beyond file size")
+
+            current = bytes(data[offset:end])
+            if current == patch.replacement:
+                continue  # Already applied
+            if patch.expected is not None and current != patch.expected:
+                raise PatchError(f"{patch.name}: expected {patch.expected.hex(' ')} at "
+                                 f"0x{offset:06x}, found {current.hex(' ')}")
+            pending.append((patch, offset))
+        return pending
+
+    def locate_one(self, data, patch):
+        if self._targets is None:
+            self._targets = self.locate(data)
+        return self._targets[patch.name]
+
+    def apply(self, input_path, output_path=None, use_mmap=True):
+        """Apply all patches to input_path (in place) or to output_path (a copy).
+
+        In place, the file is patched through an mmap. For a copy, the
+        patched image is built in memory and written with a single write.
+        Returns a log entry dict with before/after hashes and the patches
+        that were written. The entry is appended to the target's log, or for
+        a new copy to a copy of the input's log.
+        """
+        input_path = Path(input_path)
+        target_path = Path(output_path) if output_path else input_path
+        in_place = target_path.resolve() == input_path.resolve()
+        log_path = target_path.with_name(target_path.name + '.patchlog.json')
+        input_log_path = input_path.with_name(input_path.name + '.patchlog.json')
+        log = load_patch_log(log_path if in_place or log_path.exists() else input_log_path)
+        self._targets = None
+
+        if in_place and use_mmap:
+            with open(input_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as data:
+                before = sha256(data)
+                if log and log[-1]['patch_set'] == self.key and log[-1]['after'] == before:
+                    return {'patch_set': self.key, 'before': before, 'after': before,
+                            'applied': [], 'skipped': 'already patched'}
+                pending = self._write(data)
+                data.flush()
+                after = sha256(data)
+        else:
+            with open(input_path, 'rb') as f:
+                data = bytearray(f.read())
+            before = sha256(data)
+            pending = self._write(data)
+            after = sha256(data)
+            if pending or not in_place:
+                with open(target_path, 'wb') as f:
+                    f.write(data)
+
+        entry = {
+            'patch_set': self.key,
+            'before': before,
+            'after': after,
+            'applied': [{'name': p.name, 'offset': off, 'bytes': p.replacement.hex(' ')}
+                        for p, off in pending],
+        }
+        log.append(entry)
+        with open(log_path, 'w') as f:
+            json.dump(log, f, indent=2)
+
+        return entry
+
+    def _write(self, data):
+        """Validate everything first, then write; raises before any change"""
+        pending = self.plan(data)
+        for patch, offset in pending:
+            data[offset:offset + len(patch.replacement)] = patch.replacement
+        return pending
+
+    def revert(self, input_path, output_path=None, use_mmap=True):
+        """Undo the patches (restore their expected bytes)"""
+        return PatchEngine([p.reversed() for p in self.patches]).apply(
+            input_path, output_path, use_mmap)
+
+
+def load_patch_log(log_path):
+    if Path(log_path).exists():
+        with open(log_path, 'r') as f:
+            return json.load(f)
+    return []
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == '--list':
+        for set_name, patches in PATCH_SETS.items():
+            print(f"{set_name}:")
+            for p in patches:
+                where = f"0x{p.offset:06x}" if p.offset is not None else f"[{p.pattern}]+{p.pattern_offset}"
+                print(f"  {p.name}: {where} -> {p.replacement.hex(' ')}")
+        return
+
+    args = [a for a in sys.argv[1:] if a != '--revert']
+    set_name = args[0]
+    input_path = args[1] if len(args) > 1 else 'files/JUEGO.EXE'
+    output_path = args[2] if len(args) > 2 else None
+
+    if set_name not in PATCH_SETS:
+        print(f"Unknown patch set {set_name!r} (see --list)")
+        sys.exit(1)
+
+    engine = PatchEngine(PATCH_SETS[set_name])
+    try:
+        if '--revert' in sys.argv:
+            entry = engine.revert(input_path, output_path)
+        else:
+            entry = engine.apply(input_path, output_path)
+    except PatchError as e:
+        print(f"✗ {e} (nothing written)")
+        sys.exit(1)
+
+    for applied in entry['applied']:
+        print(f"✓ {applied['name']} at 0x{applied['offset']:06x}: {applied['bytes']}")
+    if not entry['applied']:
+        print("✓ Already up to date")
+    print(f"  before: {entry['before']}")
+    print(f"  after:  {entry['after']}")
+
+
+if __name__ == '__main__':
+    main()
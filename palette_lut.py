@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Nearest-Palette-Color Lookup Cubes
+===================================================
+
+Fast RGB -> palette index conversion for edited or imported art.
+
+The game's palettes are VGA DAC palettes with 6-bit components (0-63,
+files store them that way; extractors multiply by 4). For a palette, a
+64x64x64 cube holds the nearest palette index for every 6-bit colour, so
+converting an RGB image is one `take` of its packed 18-bit colours:
+
+    lut = palette_lut(room_palette, six_bit=False)
+    indices = lut.quantize(rgb_image)      # (h, w) uint8
+
+8-bit input colours are reduced to VGA precision (>> 2) first. Palettes
+are passed with their scale (six_bit=True for file data, False for
+extractor output): a dark 8-bit palette looks like a 6-bit one, so the
+scale cannot be told from the values. Distances
+are squared RGB distances in 6-bit space; ties go to the lowest index,
+as in a first-match linear search.
+
+Cubes are built vectorized (one 4096x256 distance block per red level),
+cached in memory and in .palette_lut_cache/ by palette hash.
+
+Cross-palette remap tables (index in palette A -> nearest index in
+palette B) are cube lookups of A's colours: remap_table(a, b, six_bit), or
+remap_tables(palettes, target, six_bit) in bulk.
+
+Usage:
+    python3 palette_lut.py <room_number> <image.png> [output.png]
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+LEVELS = 64  # 6-bit VGA components
+CUBE_SIZE = LEVELS ** 3
+PALETTE_LUT_CACHE_DIR = Path(os.environ.get(
+    'ALFRED_PALETTE_LUT_CACHE', Path(__file__).resolve().parent / '.palette_lut_cache'))
+
+
+def palette_array(palette, six_bit: bool) -> np.ndarray:
+    """(256, 3) uint8 array of 6-bit components from a 768-entry palette.
+
+    six_bit=False palettes are 8-bit (extract_palette() style, value * 4)
+    and are shifted down.
+    """
+    arr = np.frombuffer(bytes(bytearray(palette)), dtype=np.uint8) if not isinstance(palette, np.ndarray) \
+        else palette.astype(np.uint8, copy=False)
+    arr = arr.reshape(-1, 3)[:256]
+    return arr if six_bit else arr >> 2
+
+
+def nearest_indices(colors, palette, candidates=None) -> np.ndarray:
+    """Nearest palette index for each colour (both in the same scale).
+
+    colors: (n, 3) array; palette: (256, 3) array. Ties go to the lowest
+    index. candidates optionally restricts the indices that may be chosen.
+    """
+    colors = np.asarray(colors, dtype=np.int32).reshape(-1, 3)
+    pal = np.asarray(palette, dtype=np.int32).reshape(-1, 3)
+    index_map = np.arange(len(pal))
+    if candidates is not None:
+        index_map = np.asarray(candidates, dtype=np.int64)
+        pal = pal[index_map]
+
+    diff = colors[:, None, :] - pal[None, :, :]
+    dist = np.einsum('ijk,ijk->ij', diff, diff)
+    return index_map[np.argmin(dist, axis=1)].astype(np.uint8)
+
+
+def build_cube(palette6: np.ndarray, candidates=None) -> np.ndarray:
+    """(64, 64, 64) nearest-index cube for a 6-bit palette"""
+    levels = np.arange(LEVELS, dtype=np.int32)
+    gb = np.stack(np.meshgrid(levels, levels, indexing='ij'), axis=-1).reshape(-1, 2)
+    cube = np.empty((LEVELS, LEVELS * LEVELS), dtype=np.uint8)
+    for r in range(LEVELS):
+        colors = np.column_stack([np.full(len(gb), r, dtype=np.int32), gb])
+        cube[r] = nearest_indices(colors, palette6, candidates)
+    return cube.reshape(LEVELS, LEVELS, LEVELS)
+
+
+def palette_hash(palette6: np.ndarray, candidates=None) -> str:
+    h = hashlib.sha1(palette6.tobytes())
+    if candidates is not None:
+        h.update(np.asarray(candidates, dtype=np.uint16).tobytes())
+    return h.hexdigest()
+
+
+class PaletteLUT:
+    """Nearest-colour cube for one palette"""
+
+    def __init__(self, palette6: np.ndarray, cube: np.ndarray):
+        self.palette = palette6
+        self.cube = cube
+        self._flat = cube.reshape(-1)
+
+    @staticmethod
+    def pack(rgb6) -> np.ndarray:
+        """Packed cube offsets (r << 12 | g << 6 | b) for 6-bit colours"""
+        rgb6 = np.asarray(rgb6, dtype=np.int32)
+        return (rgb6[..., 0] << 12) | (rgb6[..., 1] << 6) | rgb6[..., 2]
+
+    def lookup6(self, rgb6) -> np.ndarray:
+        """Indices for 6-bit colours of any shape (..., 3)"""
+        return self._flat.take(self.pack(rgb6))
+
+    def quantize(self, image, transparent: Optional[int] = None) -> np.ndarray:
+        """Convert an 8-bit RGB(A) image (PIL or array) to palette indices.
+
+        With an alpha channel and a transparent index, fully transparent
+        pixels become that index (0xFF for sprites).
+        """
+        arr = np.asarray(image.convert('RGBA') if hasattr(image, 'convert') else image, dtype=np.uint8)
+        indices = self.lookup6(arr[..., :3] >> 2)
+        if transparent is not None and arr.shape[-1] == 4:
+            indices[arr[..., 3] == 0] = transparent
+        return indices
+
+    def remap_from(self, palette, six_bit: bool) -> np.ndarray:
+        """256-entry table: index in `palette` -> nearest index in this palette"""
+        return self.lookup6(palette_array(palette, six_bit))
+
+
+_memory_cache: Dict[str, PaletteLUT] = {}
+
+
+def palette_lut(palette, six_bit: bool, candidates=None,
+                cache_dir: Optional[Path] = PALETTE_LUT_CACHE_DIR) -> PaletteLUT:
+    """Cube for a palette, from memory, the disk cache, or built and cached"""
+    palette6 = palette_array(palette, six_bit)
+    key = palette_hash(palette6, candidates)
+    lut = _memory_cache.get(key)
+    if lut is not None:
+        return lut
+
+    cube = None
+    path = Path(cache_dir) / f"{key}.npy" if cache_dir is not None else None
+    if path is not None and path.exists():
+        try:
+            cube = np.load(path, mmap_mode='r', allow_pickle=False)
+            if cube.shape != (LEVELS, LEVELS, LEVELS) or cube.dtype != np.uint8:
+                cube = None
+        except (OSError, ValueError):
+            cube = None
+
+    if cube is None:
+        cube = build_cube(palette6, candidates)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, cube)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+    lut = PaletteLUT(palette6, cube)
+    _memory_cache[key] = lut
+    return lut
+
+
+def remap_table(src_palette, dst_palette, six_bit: bool) -> np.ndarray:
+    """Index in src_palette -> nearest index in dst_palette (both in the same scale)"""
+    return palette_lut(dst_palette, six_bit).remap_from(src_palette, six_bit)
+
+
+def remap_tables(src_palettes: Sequence, dst_palette, six_bit: bool) -> np.ndarray:
+    """(n, 256) remap tables from many palettes into one target palette"""
+    lut = palette_lut(dst_palette, six_bit)
+    colors = np.stack([palette_array(p, six_bit) for p in src_palettes])
+    return lut.lookup6(colors)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    from PIL import Image
+    import demo_shadow_in_room as demo
+
+    room_number = int(sys.argv[1])
+    with open(demo.ALFRED1_PATH, 'rb') as f:
+        palette = demo.extract_palette(f.read(), room_number * demo.ROOM_STRUCT_SIZE)
+    if palette is None:
+        print(f"Room {room_number} has no palette")
+        sys.exit(1)
+
+    lut = palette_lut(palette, six_bit=False)  # extract_palette() multiplies by 4
+    indices = lut.quantize(Image.open(sys.argv[2]))
+    print(f"Room {room_number}: {sys.argv[2]} -> {indices.shape[1]}x{indices.shape[0]}, "
+          f"{len(np.unique(indices))} palette colours used")
+
+    if len(sys.argv) > 3:
+        img = Image.fromarray(indices, mode='P')
+        img.putpalette(list(palette))
+        img.save(sys.argv[3])
+        print(f"✓ Saved {sys.argv[3]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,24 +9,16 @@ import sys
 import os
 import shutil
 
+from juego_patcher import PATCH_SETS, PatchEngine, PatchError
+
 def patch_juego_exe(input_path, output_path=None):
     """Patch JUEGO.EXE to enable cheat code detection"""
 
-    # Read the original file
-    with open(input_path, 'rb') as f:
-        data = bytearray(f.read())
-
-    print(f"Loaded {input_path} ({len(data)} bytes)")
-
     # The flag address in memory is 0x000495f3
-    # Need to find it in the file (might be different offset due to DOS4GW header)
-    # Common DOS4GW offset is around 0x200-0x800
-
-    # Strategy 1: Calculate correct file offset for DOS4GW executable
     # DOS4GW LINEAR executables have different file vs memory layout
     # The cheat string is at file 0x44141, memory 0x40f41
     # Difference: 0x44141 - 0x40f41 = 0x3200
-    # So: file_offset = memory_address + 0x3200
+    # So: file_offset = memory_address + 0x3200 (see juego_patcher.PATCH_SETS)
 
     MEMORY_ADDRESS = 0x495f3
     FILE_OFFSET = MEMORY_ADDRESS + 0x3200  # = 0x4C7F3
@@ -34,53 +26,30 @@ def patch_juego_exe(input_path, output_path=None):
     print(f"\nMemory address: 0x{MEMORY_ADDRESS:06x}")
     print(f"Calculated file offset: 0x{FILE_OFFSET:06x}")
 
-    if FILE_OFFSET < len(data):
-        current_value = data[FILE_OFFSET]
-        print(f"Current value at file offset: 0x{current_value:02x}")
-
-        if current_value == 0x00:
-            print("✓ Found the flag (0x00), patching to 0x01...")
-            data[FILE_OFFSET] = 0x01
-        else:
-            print(f"⚠ Value is 0x{current_value:02x}, patching anyway...")
-            data[FILE_OFFSET] = 0x01
-    else:
-        print(f"⚠ Offset 0x{FILE_OFFSET:06x} beyond file size")
-
-    # Strategy 2: Search for the cheat string and work backwards
-    cheat_string = b'HIJODELAGRANPUTA'
-    cheat_pos = data.find(cheat_string)
-
-    if cheat_pos != -1:
-        print(f"\n✓ Found cheat string at file offset 0x{cheat_pos:06x}")
-        print(f"  Memory address would be around 0x{cheat_pos:06x}")
-
-        # The flag is read before the string comparison
-        # Let's search for the comparison instruction pattern near it
-        # This is more reliable than guessing the offset
-
-    # Strategy 3: Search for the initialization area
-    # Look for the pattern where DAT_00049604 is set (we know this from 'p' flag)
-    # The cheat flag should be nearby in the .data section
-
-    # For DOS4GW executables, the linear executable format means
-    # file offset ≈ memory address - 0x1000 (typical load address)
-    # But let's try memory address directly first
-
-    # Backup and save
+    # Backup before patching in place
     if output_path is None:
         backup_path = input_path + '.backup'
         if not os.path.exists(backup_path):
             shutil.copy2(input_path, backup_path)
             print(f"\n✓ Created backup: {backup_path}")
-        output_path = input_path
 
-    with open(output_path, 'wb') as f:
-        f.write(data)
+    engine = PatchEngine(PATCH_SETS['enable_cheat'])
+    try:
+        entry = engine.apply(input_path, output_path)
+    except PatchError as e:
+        print(f"✗ {e}")
+        print("If the flag moved, we may need to find the correct file offset.")
+        return False
+
+    if entry['applied']:
+        print("✓ Found the flag (0x00), patched to 0x01")
+    else:
+        print("✓ Flag already set to 0x01")
 
-    print(f"✓ Patched file saved to: {output_path}")
+    print(f"✓ Patched file saved to: {output_path or input_path}")
+    print(f"  SHA-256 before: {entry['before']}")
+    print(f"  SHA-256 after:  {entry['after']}")
     print("\nPatch complete! Try the cheat code 'HIJODELAGRANPUTA' in-game.")
-    print("If it doesn't work, we may need to find the correct file offset.")
 
     return True
 
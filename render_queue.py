@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Incremental Z-Order Render Queue
+=================================================
+
+Keeps the render queue in draw order without re-sorting it every frame.
+
+Draw order (Z_ORDER_SYSTEM_DOCUMENTATION.md): the game bubble-sorts the
+queue by descending Z each frame, so higher Z is drawn first (background)
+and lower Z last (foreground); equal Z keeps queue order. Here the order is
+the sorted list of (-z, index, key), and Z 0xFF means disabled (kept in the
+queue but never drawn).
+
+When Alfred's Y or a few sprite depths change, only those entries are
+removed and re-inserted with bisect. Every change returns the regions
+that actually need redrawing:
+
+  - moved/resized/re-framed entry: its old and new rectangles
+  - enabled/disabled entry: its rectangle
+  - Z change only: the overlap of its rectangle with each entry it moved
+    past in the order (nothing at all if it passed nobody it overlaps)
+
+Rectangles are (x0, y0, x1, y1) with exclusive ends.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+
+Z_DISABLED = 0xFF
+
+Rect = Tuple[int, int, int, int]
+
+_UNCHANGED = object()
+
+
+def rect_intersection(a: Rect, b: Rect) -> Optional[Rect]:
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+class RenderQueue:
+    """Render queue sorted by (descending z, index), updated by binary insertion"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, int, Optional[Rect]]] = {}  # key -> (z, index, rect)
+        self._order: List[Tuple[int, int, str]] = []  # (-z, index, key) of enabled entries
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[str]:
+        """Enabled keys in draw order (first drawn first)"""
+        return (key for _, _, key in self._order)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def z(self, key):
+        return self._entries[key][0]
+
+    def rect(self, key):
+        return self._entries[key][2]
+
+    def position(self, key) -> Optional[int]:
+        """Draw position of an enabled entry, None if disabled"""
+        z, index, _ = self._entries[key]
+        if z == Z_DISABLED:
+            return None
+        return bisect_left(self._order, (-z, index, key))
+
+    def overlapping(self, region: Rect) -> Iterator[str]:
+        """Enabled keys whose rectangle intersects region, in draw order"""
+        for _, _, key in self._order:
+            rect = self._entries[key][2]
+            if rect is not None and rect_intersection(rect, region) is not None:
+                yield key
+
+    def insert(self, key, z, index, rect: Optional[Rect]) -> List[Rect]:
+        if key in self._entries:
+            return self.update(key, z=z, rect=rect, redraw=True)
+        self._entries[key] = (z, index, rect)
+        if z == Z_DISABLED:
+            return []
+        insort(self._order, (-z, index, key))
+        return [rect] if rect is not None else []
+
+    def remove(self, key) -> List[Rect]:
+        z, index, rect = self._entries.pop(key)
+        if z == Z_DISABLED:
+            return []
+        del self._order[bisect_left(self._order, (-z, index, key))]
+        return [rect] if rect is not None else []
+
+    def update(self, key, z=None, rect=_UNCHANGED, redraw=False) -> List[Rect]:
+        """Change an entry's z and/or rect; returns the regions to redraw.
+
+        rect may be None for an entry that is entirely off screen.
+        redraw=True forces the whole (old and new) rect to be redrawn, for
+        when the entry's pixels changed even though its rect did not.
+        """
+        old_z, index, old_rect = self._entries[key]
+        new_z = old_z if z is None else z
+        new_rect = old_rect if rect is _UNCHANGED else rect
+        was_enabled, enabled = old_z != Z_DISABLED, new_z != Z_DISABLED
+
+        crossed = []
+        if new_z != old_z:
+            if was_enabled:
+                i = bisect_left(self._order, (-old_z, index, key))
+                del self._order[i]
+            if enabled:
+                j = bisect_left(self._order, (-new_z, index, key))
+                self._order.insert(j, (-new_z, index, key))
+                if was_enabled:
+                    # Entries passed over are between the old and new slots
+                    crossed = self._order[i:j] if j > i else self._order[j + 1:i + 1]
+        self._entries[key] = (new_z, index, new_rect)
+
+        if redraw or new_rect != old_rect or was_enabled != enabled:
+            regions = []
+            if was_enabled and old_rect is not None:
+                regions.append(old_rect)
+            if enabled and new_rect is not None and new_rect not in regions:
+                regions.append(new_rect)
+            return regions
+
+        if new_rect is None:
+            return []
+        regions = []
+        for _, _, other in crossed:
+            other_rect = self._entries[other][2]
+            if other_rect is not None:
+                overlap = rect_intersection(new_rect, other_rect)
+                if overlap is not None:
+                    regions.append(overlap)
+        return regions
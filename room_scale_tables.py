@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Per-Room Scale/Z Lookup Tables
+===============================================
+
+Evaluates the character scaling formula (load_room_data @ 0x0001585c, see
+alfred_scaling.compute_scale_factors) for every Y in 0..399 of every room
+in one vectorized pass, so renderers and validators index a table instead
+of redoing the integer divide per call.
+
+Each room's Pair 10 holds its scaling parameters at +0x214:
+  +0x214  reference_y (y_threshold)   u16
+  +0x216  scale_divisor               u8
+  +0x217  scaling_mode                u8  (0x00 normal, 0xFF fixed small,
+                                           0xFE / other: no scaling)
+
+Per (room, y) entry:
+  scale_down  rows skipped    (= compute_scale_factors scale_y)
+  scale_up    columns skipped (= compute_scale_factors scale_x)
+  width       Alfred's rendered width  (columns the 51x51 table keeps)
+  height      Alfred's rendered height (rows the 102x102 table keeps)
+  z           compute_z_depth_from_y(y)
+
+Y is Alfred's position as used by the game for both scaling and Z. Rooms
+in normal mode with a zero divisor are treated as unscaled.
+
+All 56 rooms are cached in one binary file (scale_tables.bin):
+  header   '<4sHHHQQ' magic 'SCLT', version, rooms, ys, source size, mtime_ns
+  params   rooms x PARAMS_DTYPE   (4 bytes each)
+  tables   rooms x ys x SCALE_DTYPE (5 bytes each)
+
+Usage:
+    python3 room_scale_tables.py <alfred.1> [scale_tables.bin] [room [y]]
+"""
+
+import os
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from alfred_scaling import AlfredScaler, RoomScalingConfig
+
+NUM_ROOMS = 56
+NUM_Y = 400
+ROOM_STRUCT_SIZE = 104
+SCALING_PARAMS_OFFSET = 0x214
+
+MODE_NORMAL = 0x00
+MODE_FIXED = 0xFF
+FIXED_SCALE_DOWN = 0x5E  # 94
+FIXED_SCALE_UP = 0x2F    # 47
+MAX_SCALE_DOWN = 101
+MAX_SCALE_UP = 50
+
+SCALE_TABLES_PATH = 'scale_tables.bin'
+SCALE_TABLES_MAGIC = b'SCLT'
+SCALE_TABLES_VERSION = 1
+HEADER_FORMAT = '<4sHHHQQ'
+
+PARAMS_DTYPE = np.dtype([
+    ('reference_y', '<u2'),
+    ('scale_divisor', 'u1'),
+    ('scaling_mode', 'u1'),
+])
+
+SCALE_DTYPE = np.dtype([
+    ('scale_down', 'u1'),
+    ('scale_up', 'u1'),
+    ('width', 'u1'),
+    ('height', 'u1'),
+    ('z', 'u1'),
+])
+
+# Rooms without Pair 10 data behave as "no scaling"
+NO_SCALING = (0, 0, 0xFE)
+
+
+def read_scaling_params(data, num_rooms=NUM_ROOMS) -> np.ndarray:
+    """Scaling parameters of every room as a PARAMS_DTYPE array"""
+    params = np.array([NO_SCALING] * num_rooms, dtype=PARAMS_DTYPE)
+    for room_num in range(num_rooms):
+        pair_pos = room_num * ROOM_STRUCT_SIZE + 10 * 8
+        if pair_pos + 8 > len(data):
+            break
+        offset, size = struct.unpack('<II', data[pair_pos:pair_pos + 8])
+        start = offset + SCALING_PARAMS_OFFSET
+        if size > SCALING_PARAMS_OFFSET + 3 and start + 4 <= len(data):
+            params[room_num] = np.frombuffer(data, dtype=PARAMS_DTYPE, count=1, offset=start)[0]
+    return params
+
+
+def read_scaling_config(data, room_num) -> RoomScalingConfig:
+    p = read_scaling_params(data, room_num + 1)[room_num]
+    return RoomScalingConfig(int(p['scaling_mode']), int(p['reference_y']), int(p['scale_divisor']))
+
+
+def config_params(config: RoomScalingConfig) -> np.ndarray:
+    return np.array([(config.reference_y, config.scale_divisor, config.scaling_mode & 0xFF)],
+                    dtype=PARAMS_DTYPE)
+
+
+@lru_cache(maxsize=1)
+def _kept_sizes():
+    """Rendered (widths, heights) indexed by scale_up / scale_down"""
+    scaler = AlfredScaler()
+    widths = (scaler.table_x[:AlfredScaler.ALFRED_WIDTH] == 0).sum(axis=0)
+    heights = (scaler.table_y[:AlfredScaler.ALFRED_HEIGHT] == 0).sum(axis=0)
+    widths[0] = AlfredScaler.ALFRED_WIDTH
+    heights[0] = AlfredScaler.ALFRED_HEIGHT
+    return widths, heights
+
+
+def build_scale_tables(params: np.ndarray, num_y=NUM_Y) -> np.ndarray:
+    """(rooms, num_y) SCALE_DTYPE tables for a PARAMS_DTYPE array"""
+    y = np.arange(num_y, dtype=np.int32)[None, :]
+    reference_y = params['reference_y'].astype(np.int32)[:, None]
+    divisor = params['scale_divisor'].astype(np.int32)[:, None]
+    mode = params['scaling_mode'][:, None]
+
+    normal = (mode == MODE_NORMAL) & (divisor > 0) & (y <= reference_y)
+    delta = np.where(normal, (reference_y - y) // np.maximum(divisor, 1), 0)
+    scale_down = np.minimum(delta, MAX_SCALE_DOWN)
+    scale_up = np.minimum(delta // 2, MAX_SCALE_UP)
+
+    fixed = np.broadcast_to(mode == MODE_FIXED, scale_down.shape)
+    scale_down = np.where(fixed, FIXED_SCALE_DOWN, scale_down)
+    scale_up = np.where(fixed, FIXED_SCALE_UP, scale_up)
+
+    widths, heights = _kept_sizes()
+    tables = np.empty(scale_down.shape, dtype=SCALE_DTYPE)
+    tables['scale_down'] = scale_down
+    tables['scale_up'] = scale_up
+    tables['width'] = widths[scale_up]
+    tables['height'] = heights[scale_down]
+    tables['z'] = ((399 - y) & 0xFFFE) // 2 + 10
+    return tables
+
+
+def room_scale_table(config: RoomScalingConfig) -> np.ndarray:
+    """The 400-entry table for a single scaling config"""
+    return build_scale_tables(config_params(config))[0]
+
+
+# =============================================================================
+# CACHE FILE
+# =============================================================================
+
+def save_scale_tables(path, params, tables, source_path=None):
+    size = mtime = 0
+    if source_path is not None:
+        st = os.stat(source_path)
+        size, mtime = st.st_size, st.st_mtime_ns
+    rooms, num_y = tables.shape
+    with open(path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, SCALE_TABLES_MAGIC, SCALE_TABLES_VERSION,
+                            rooms, num_y, size, mtime))
+        f.write(params.tobytes())
+        f.write(tables.tobytes())
+
+
+def load_scale_tables(path):
+    """(params, tables, (source size, mtime_ns)) from a cache file"""
+    data = Path(path).read_bytes()
+    magic, version, rooms, num_y, size, mtime = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != SCALE_TABLES_MAGIC or version != SCALE_TABLES_VERSION:
+        raise ValueError(f"{path}: not a version {SCALE_TABLES_VERSION} scale table file")
+    offset = struct.calcsize(HEADER_FORMAT)
+    params = np.frombuffer(data, dtype=PARAMS_DTYPE, count=rooms, offset=offset)
+    offset += params.nbytes
+    tables = np.frombuffer(data, dtype=SCALE_DTYPE, count=rooms * num_y, offset=offset)
+    return params, tables.reshape(rooms, num_y), (size, mtime)
+
+
+def load_or_build(alfred1_path='files/ALFRED.1', path=SCALE_TABLES_PATH):
+    """All rooms' tables, rebuilt when ALFRED.1 changed since the cache was written"""
+    st = os.stat(alfred1_path)
+    if Path(path).exists():
+        try:
+            params, tables, stamp = load_scale_tables(path)
+            if stamp == (st.st_size, st.st_mtime_ns):
+                return tables
+        except (ValueError, struct.error):
+            pass
+
+    with open(alfred1_path, 'rb') as f:
+        params = read_scaling_params(f.read())
+    tables = build_scale_tables(params)
+    save_scale_tables(path, params, tables, alfred1_path)
+    return tables
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    alfred1_path = sys.argv[1]
+    rest = sys.argv[2:]
+    path = rest.pop(0) if rest and not rest[0].isdigit() else SCALE_TABLES_PATH
+    tables = load_or_build(alfred1_path, path)
+    params, _, _ = load_scale_tables(path)
+
+    if not rest:
+        print(f"✓ {path}: {tables.shape[0]} rooms x {tables.shape[1]} Y positions")
+        for room_num, p in enumerate(params):
+            t = tables[room_num]
+            print(f"  Room {room_num:2d}: mode 0x{p['scaling_mode']:02X} ref_y {p['reference_y']:3d} "
+                  f"div {p['scale_divisor']:3d}  size {t['width'].min()}x{t['height'].min()}"
+                  f"..{t['width'].max()}x{t['height'].max()}")
+        return
+
+    room_num = int(rest[0])
+    ys = [int(rest[1])] if len(rest) > 1 else range(0, NUM_Y, 25)
+    print(f"Room {room_num}:   Y  down  up  size     z")
+    for y in ys:
+        e = tables[room_num, y]
+        print(f"         {y:3d}  {e['scale_down']:4d} {e['scale_up']:3d}  "
+              f"{e['width']:2d}x{e['height']:<3d}  {e['z']:3d}")
+
+
+if __name__ == '__main__':
+    main()
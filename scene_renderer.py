@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Composite Scene Renderer
+=========================================
+
+Composites a room scene (background + room sprites + Alfred) the way the
+game's render loop does, but only re-draws what changed each tick.
+
+  - The decoded background is held once as a 400x640 uint8 array.
+  - Every drawable is a render-list entry with a Z depth. Room sprites take
+    Z from sprite byte +0x21 (0xFF = disabled); Alfred's Z comes from his
+    Y position via compute_z_depth_from_y():
+        z = ((399 - y) & 0xFFFE) / 2 + 10
+  - Draw order follows Z_ORDER_SYSTEM_DOCUMENTATION.md: higher Z
+    (background) is drawn first and lower Z (foreground) last, ties by
+    render-list index. The order is kept by render_queue.RenderQueue,
+    which re-inserts only the entries whose Z changed.
+  - Alfred is scaled with the game's lookup tables (alfred_scaling.py),
+    with the scale factors for his Y read from the room's scale table
+    (room_scale_tables.py), and shadowed with the room's character remap
+    when the shadow map (ALFRED.5) under his feet is not 0xFF.
+
+Moving, adding or removing an entry marks its old and new rectangles
+dirty; a pure Z change marks only its overlaps with the entries it moved
+past. render() restores only those rectangles from the background and redraws
+the entries intersecting them in Z order, using masked NumPy copies
+(0xFF = transparent) instead of per-pixel loops.
+
+Usage:
+    python3 scene_renderer.py <room_number> [output.png] [--ticks N]
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from alfred_scaling import AlfredScaler, RoomScalingConfig, compute_z_depth_from_y
+from render_queue import RenderQueue
+from room_scale_tables import read_scaling_config, room_scale_table
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 400
+TRANSPARENT = 0xFF
+Z_DISABLED = 0xFF
+TICK_RATE = 18.2  # PIT default, ticks per second
+
+ALFRED_KEY = 'alfred'
+ALFRED_INDEX = 1  # Alfred lives in render_queue[1]
+
+Rect = Tuple[int, int, int, int]  # x0, y0, x1, y1 (exclusive), clipped to the screen
+
+
+def clip_rect(x, y, width, height) -> Optional[Rect]:
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, SCREEN_WIDTH), min(y + height, SCREEN_HEIGHT)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def rects_overlap(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def union_rect(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def merge_rects(rects: List[Rect]) -> List[Rect]:
+    """Merge overlapping rectangles until none overlap"""
+    merged = []
+    for rect in rects:
+        while True:
+            for i, other in enumerate(merged):
+                if rects_overlap(rect, other):
+                    rect = union_rect(rect, merged.pop(i))
+                    break
+            else:
+                break
+        merged.append(rect)
+    return merged
+
+
+def blit(target, pixels, x, y, region: Optional[Rect] = None):
+    """Copy the opaque pixels of a sprite into target, clipped to region"""
+    height, width = pixels.shape
+    rect = clip_rect(x, y, width, height)
+    if rect is None:
+        return
+    if region is not None:
+        if not rects_overlap(rect, region):
+            return
+        rect = (max(rect[0], region[0]), max(rect[1], region[1]),
+                min(rect[2], region[2]), min(rect[3], region[3]))
+
+    x0, y0, x1, y1 = rect
+    src = pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+    dst = target[y0:y1, x0:x1]
+    mask = src != TRANSPARENT
+    dst[mask] = src[mask]
+
+
+def scale_alfred(scaler: AlfredScaler, pixels, scale_x, scale_y):
+    """Vectorized AlfredScaler.scale_sprite: keep rows/columns the tables don't skip"""
+    height, width = pixels.shape
+    scale_x = min(scale_x, width - 1)
+    scale_y = min(scale_y, height - 1)
+
+    rows = np.arange(height)
+    cols = np.arange(width)
+    if scale_y > 0:
+        rows = rows[scaler.table_y[:height, scale_y] == 0]
+    if scale_x > 0:
+        cols = cols[scaler.table_x[:width, scale_x] == 0]
+    return pixels[np.ix_(rows, cols)]
+
+
+@dataclass
+class RenderEntry:
+    key: str
+    pixels: np.ndarray  # height x width uint8, 0xFF transparent
+    x: int
+    y: int
+    z: int
+    index: int          # Render queue slot; breaks ties between equal Z
+
+    @property
+    def visible(self):
+        return self.z != Z_DISABLED
+
+    @property
+    def rect(self) -> Optional[Rect]:
+        height, width = self.pixels.shape
+        return clip_rect(self.x, self.y, width, height)
+
+
+class SceneRenderer:
+    """Background + z-sorted render list, recomposited by dirty rectangles"""
+
+    def __init__(self, background, scaling: Optional[RoomScalingConfig] = None,
+                 shadow_map=None, shadow_remap=None):
+        bg = np.frombuffer(bytes(background), dtype=np.uint8) if not isinstance(background, np.ndarray) else background
+        self.background = np.ascontiguousarray(bg[:SCREEN_WIDTH * SCREEN_HEIGHT]).reshape(SCREEN_HEIGHT, SCREEN_WIDTH)
+        self.frame = self.background.copy()
+
+        self.scaling = scaling
+        self.scaler = AlfredScaler() if scaling is not None else None
+        self.scale_table = room_scale_table(scaling) if scaling is not None else None
+        self.shadow_map = (None if shadow_map is None else
+                           np.frombuffer(bytes(shadow_map), dtype=np.uint8)[:SCREEN_WIDTH * SCREEN_HEIGHT]
+                           .reshape(SCREEN_HEIGHT, SCREEN_WIDTH))
+        self.shadow_remap = None
+        if shadow_remap is not None:
+            remap = np.frombuffer(bytes(shadow_remap), dtype=np.uint8)[:256]
+            self.shadow_remap = np.concatenate([remap, np.arange(len(remap), 256, dtype=np.uint8)])
+            self.shadow_remap[TRANSPARENT] = TRANSPARENT
+
+        self.entries: Dict[str, RenderEntry] = {}
+        self.queue = RenderQueue()
+        self._dirty: List[Rect] = []
+        self._next_index = 2  # Room sprites are numbered from 2, after Alfred
+        self._alfred_frames: Dict[Tuple, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Render list
+    # ------------------------------------------------------------------
+
+    def add(self, key, pixels, x, y, z, index=None) -> RenderEntry:
+        """Add (or replace) a render-list entry"""
+        if index is None:
+            old = self.entries.get(key)
+            index = old.index if old is not None else self._next_index
+        self._next_index = max(self._next_index, index + 1)
+
+        if key in self.entries:
+            self._dirty.extend(self.queue.remove(key))
+        entry = RenderEntry(key, np.asarray(pixels, dtype=np.uint8), x, y, z, index)
+        self.entries[key] = entry
+        self._dirty.extend(self.queue.insert(key, z, index, entry.rect))
+        return entry
+
+    def update(self, key, x=None, y=None, z=None, pixels=None):
+        """Move, re-depth or re-frame an entry.
+
+        Only the regions the render queue reports (old/new rects, or the
+        overlaps with entries passed in Z order) are marked dirty.
+        """
+        entry = self.entries[key]
+        redraw = pixels is not None and pixels is not entry.pixels
+        if x is not None:
+            entry.x = x
+        if y is not None:
+            entry.y = y
+        if redraw:
+            entry.pixels = np.asarray(pixels, dtype=np.uint8)
+        if z is not None:
+            entry.z = z
+        self._dirty.extend(self.queue.update(key, z=z, rect=entry.rect, redraw=redraw))
+
+    def remove(self, key):
+        if self.entries.pop(key, None) is not None:
+            self._dirty.extend(self.queue.remove(key))
+
+    def add_room_sprite(self, key, pixels, x, y, z_depth, index=None):
+        """Room sprite; z_depth is the sprite's byte +0x21 (0xFF = disabled)"""
+        return self.add(key, pixels, x, y, z_depth, index)
+
+    def set_alfred(self, pixels, x, y, scaled=True, shadowed=True, frame_key=None):
+        """Place Alfred with his feet at (x, y).
+
+        The frame is scaled from the room's scaling config, remapped
+        through the shadow table if the shadow map at (x, y) is set, and
+        drawn bottom-aligned at y. Z follows compute_z_depth_from_y(y).
+
+        With a frame_key (e.g. the animation frame number), the scaled and
+        shadowed result is cached per (frame_key, scale, shadow), so walk
+        cycles only scale each frame once per size.
+        """
+        scale = (0, 0)
+        if scaled and self.scale_table is not None:
+            entry = self.scale_table[min(max(y, 0), len(self.scale_table) - 1)]
+            scale = (int(entry['scale_up']), int(entry['scale_down']))
+        shadow = shadowed and self.in_shadow(x, y) and self.shadow_remap is not None
+
+        cache_key = (frame_key, scale, shadow)
+        cached = self._alfred_frames.get(cache_key) if frame_key is not None else None
+        if cached is None:
+            cached = np.asarray(pixels, dtype=np.uint8)
+            if scale != (0, 0):
+                cached = scale_alfred(self.scaler, cached, *scale)
+            if shadow:
+                cached = self.shadow_remap[cached]
+            if frame_key is not None:
+                self._alfred_frames[cache_key] = cached
+        pixels = cached
+
+        top = y - pixels.shape[0]
+        z = compute_z_depth_from_y(y)
+        if ALFRED_KEY in self.entries:
+            self.update(ALFRED_KEY, x=x, y=top, z=z, pixels=pixels)
+        else:
+            self.add(ALFRED_KEY, pixels, x, top, z, index=ALFRED_INDEX)
+
+    def in_shadow(self, x, y):
+        if self.shadow_map is None or not (0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT):
+            return False
+        return self.shadow_map[y, x] != 0xFF
+
+    @property
+    def draw_order(self) -> List[str]:
+        return list(self.queue)
+
+    # ------------------------------------------------------------------
+    # Compositing
+    # ------------------------------------------------------------------
+
+    def render(self) -> List[Rect]:
+        """Recomposite the dirty rectangles; returns the rectangles redrawn"""
+        dirty = merge_rects(self._dirty)
+        self._dirty = []
+
+        for region in dirty:
+            x0, y0, x1, y1 = region
+            self.frame[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+            for key in self.queue.overlapping(region):
+                entry = self.entries[key]
+                blit(self.frame, entry.pixels, entry.x, entry.y, region)
+
+        return dirty
+
+    def render_full(self) -> np.ndarray:
+        """Recomposite the whole frame from scratch"""
+        self._dirty = [(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+        self.render()
+        return self.frame
+
+    def to_image(self, palette):
+        from PIL import Image
+        img = Image.fromarray(self.frame, mode='P')
+        img.putpalette(palette)
+        return img
+
+
+@lru_cache(maxsize=None)
+def load_room_assets(room_number):
+    """(background, palette, scaling, shadow_map, shadow_remap) for a room, loaded once"""
+    import demo_shadow_in_room as demo
+
+    with open(demo.ALFRED1_PATH, 'rb') as f:
+        alfred1 = f.read()
+    room_offset = room_number * demo.ROOM_STRUCT_SIZE
+
+    background = demo.extract_background(alfred1, room_offset)
+    palette = demo.extract_palette(alfred1, room_offset)
+
+    scaling = read_scaling_config(alfred1, room_number)
+
+    with open(demo.ALFRED5_PATH, 'rb') as f:
+        shadow_map = demo.extract_shadow_map(f.read(), room_number)
+    shadow_remap = demo.load_character_shadow_remap(room_number)
+
+    return bytes(background), palette, scaling, bytes(shadow_map), shadow_remap
+
+
+def load_room_scene(room_number):
+    """SceneRenderer for a room with background, scaling and shadow tables"""
+    background, palette, scaling, shadow_map, shadow_remap = load_room_assets(room_number)
+    return SceneRenderer(background, scaling, shadow_map, shadow_remap), palette
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    import demo_shadow_in_room as demo
+
+    room_number = int(sys.argv[1])
+    output = next((a for a in sys.argv[2:] if a.endswith('.png')), None)
+    ticks = int(sys.argv[sys.argv.index('--ticks') + 1]) if '--ticks' in sys.argv else 200
+
+    scene, palette = load_room_scene(room_number)
+    sprite, width, height = demo.extract_character_sprite()
+    alfred = np.frombuffer(sprite, dtype=np.uint8).reshape(height, width)
+
+    scene.set_alfred(alfred, 100, 300)
+    scene.render_full()
+
+    # Walk Alfred back and forth across the room, one step per tick
+    start = time.perf_counter()
+    redrawn = 0
+    for tick in range(ticks):
+        x = 100 + (tick * 4) % 400
+        y = 250 + (tick % 50)
+        scene.set_alfred(alfred, x, y)
+        for x0, y0, x1, y1 in scene.render():
+            redrawn += (x1 - x0) * (y1 - y0)
+    elapsed = time.perf_counter() - start
+
+    print(f"Room {room_number}: {ticks} ticks in {elapsed:.3f}s "
+          f"({ticks / elapsed:.0f} ticks/s, game runs at {TICK_RATE} Hz)")
+    print(f"  Average redraw: {redrawn / max(ticks, 1):.0f} px/tick "
+          f"of {SCREEN_WIDTH * SCREEN_HEIGHT}")
+
+    if output and palette:
+        scene.to_image(palette).save(output)
+        print(f"✓ Saved {output}")
+
+
+if __name__ == '__main__':
+    main()
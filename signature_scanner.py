@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Multi-Pattern Binary Signature Scanner
+======================================
+
+Compiles many byte signatures into a single Aho-Corasick automaton and
+reports every match of every signature in one pass over the file.
+
+Signatures are written as hex strings and may contain wildcard bytes:
+
+    "80 3D ?? ?? ?? 00 00 0F 84"
+
+Wildcards are handled by anchoring each signature on its longest run of
+fixed bytes. The automaton finds the anchors; each anchor hit is then
+verified against the full signature at the implied start offset.
+
+Results of scan_file() are cached per (file SHA-256, signature set), in
+memory and optionally on disk, so scripts that hunt the same signatures in
+the same JUEGO.EXE don't pay for the scan twice.
+
+Usage:
+    python3 signature_scanner.py <file> "<hex pattern>" ["<hex pattern>" ...]
+
+Example:
+    python3 signature_scanner.py files/JUEGO.EXE "80 3D ?? ?? ?? 00 00 0F 84" "HIJODELAGRANPUTA"
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+CACHE_DIR = '.signature_cache'
+WILDCARDS = ('??', '?', '**')
+
+
+def parse_pattern(pattern):
+    """Parse a signature into a tuple of byte values (None = wildcard).
+
+    Accepts a hex string ("0F 84 ?? 01"), bytes, or an iterable of
+    int/None values.
+    """
+    if isinstance(pattern, (bytes, bytearray)):
+        return tuple(pattern)
+    if isinstance(pattern, str):
+        values = []
+        for token in pattern.split():
+            if token in WILDCARDS:
+                values.append(None)
+            elif len(token) == 2:
+                values.append(int(token, 16))
+            else:
+                raise ValueError(f"Bad signature byte {token!r} in {pattern!r}")
+        return tuple(values)
+    return tuple(pattern)
+
+
+def format_pattern(values):
+    """Inverse of parse_pattern for display"""
+    return ' '.join('??' if v is None else f'{v:02X}' for v in values)
+
+
+def _longest_fixed_run(values):
+    """Return (start, length) of the longest run without wildcards"""
+    best_start, best_len = 0, 0
+    run_start = None
+    for i, v in enumerate(values + (None,)):
+        if v is not None:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start > best_len:
+                best_start, best_len = run_start, i - run_start
+            run_start = None
+    return best_start, best_len
+
+
+class SignatureScanner:
+    """Aho-Corasick scanner over a fixed set of named signatures"""
+
+    def __init__(self, signatures):
+        """signatures: dict of name -> pattern (see parse_pattern)"""
+        self.signatures = {name: parse_pattern(p) for name, p in signatures.items()}
+        self._anchors = []  # (name, pattern, anchor_start, anchor_bytes)
+
+        for name, values in self.signatures.items():
+            if not values:
+                raise ValueError(f"Signature {name!r} is empty")
+            start, length = _longest_fixed_run(values)
+            if length == 0:
+                raise ValueError(f"Signature {name!r} has no fixed bytes")
+            anchor = bytes(values[start:start + length])
+            self._anchors.append((name, values, start, anchor))
+
+        self._build_automaton()
+
+    def _build_automaton(self):
+        """Build a full DFA (256 transitions per state) over the anchors"""
+        goto = [{}]
+        outputs = [[]]
+
+        for anchor_id, (_, _, _, anchor) in enumerate(self._anchors):
+            state = 0
+            for b in anchor:
+                nxt = goto[state].get(b)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][b] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(anchor_id)
+
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = [goto[0].get(b, 0) for b in range(256)]
+
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            row = list(delta[fail[state]])
+            for b, nxt in goto[state].items():
+                row[b] = nxt
+                fail[nxt] = delta[fail[state]][b]
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                queue.append(nxt)
+            delta[state] = row
+
+        self._delta = delta
+        self._outputs = outputs
+
+    @property
+    def key(self):
+        """Stable hash of the signature set (used for result caching)"""
+        blob = json.dumps(sorted((name, format_pattern(v)) for name, v in self.signatures.items()))
+        return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+    def scan(self, data):
+        """Scan data once; return {name: [match offsets]} for all signatures"""
+        results = {name: [] for name in self.signatures}
+        delta = self._delta
+        outputs = self._outputs
+        anchors = self._anchors
+        size = len(data)
+
+        state = 0
+        for pos, b in enumerate(data):
+            state = delta[state][b]
+            if not outputs[state]:
+                continue
+            for anchor_id in outputs[state]:
+                name, values, anchor_start, anchor = anchors[anchor_id]
+                start = pos - len(anchor) + 1 - anchor_start
+                if start < 0 or start + len(values) > size:
+                    continue
+                for i, v in enumerate(values):
+                    if v is not None and data[start + i] != v:
+                        break
+                else:
+                    results[name].append(start)
+
+        for offsets in results.values():
+            offsets.sort()
+        return results
+
+    def scan_file(self, path, cache_dir=CACHE_DIR):
+        """Scan a file, reusing cached results for identical content"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.scan_cached(data, cache_dir)
+
+    def scan_cached(self, data, cache_dir=CACHE_DIR):
+        file_hash = hashlib.sha256(data).hexdigest()
+        cache_key = (file_hash, self.key)
+
+        if cache_key in _memory_cache:
+            return _memory_cache[cache_key]
+
+        cache_file = None
+        if cache_dir is not None:
+            cache_file = Path(cache_dir) / f"{file_hash[:16]}_{self.key}.json"
+            if cache_file.exists():
+                with open(cache_file, 'r') as f:
+                    results = json.load(f)
+                _memory_cache[cache_key] = results
+                return results
+
+        results = self.scan(data)
+        _memory_cache[cache_key] = results
+
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(results, f)
+
+        return results
+
+
+_memory_cache = {}
+
+
+def scan_file(path, signatures, cache_dir=CACHE_DIR):
+    """Convenience wrapper: scan one file for a dict of signatures"""
+    return SignatureScanner(signatures).scan_file(path, cache_dir)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    signatures = {}
+    for pattern in sys.argv[2:]:
+        # Plain text (no hex tokens) is searched as ASCII
+        try:
+            signatures[pattern] = parse_pattern(pattern)
+        except ValueError:
+            signatures[pattern] = pattern.encode('latin-1')
+
+    results = scan_file(path, signatures)
+    for name, offsets in results.items():
+        print(f"{name}: {len(offsets)} match(es)")
+        for offset in offsets:
+            print(f"  0x{offset:06x}")
+
+
+if __name__ == '__main__':
+    main()
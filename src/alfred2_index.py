@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+ALFRED.2 - Random-Access Talking Animation Index
+
+Parses the 55-byte header table once into a NumPy structured array and
+pairs every animation set with its compressed byte range, so a single
+animation can be decoded without walking the file:
+
+  start = header data_offset (u32, 0 = empty header)
+  end   = first BUDA marker at or after start (end of file if none)
+
+The table has 55 headers; the bytes between it and the first pixel data
+are not headers. Each set's RLE data holds animation A's frames, then
+animation B's, then BUDA (ALFRED2_DOCS.MD). Animation B starts at the
+pair after the one that completes animation A.
+
+The index is cached in alfred2_index.bin:
+  header    '<4sHHQQ' magic 'A2IX', version, headers, source size, mtime_ns
+  headers   headers x HEADER_DTYPE (55 bytes each)
+  segments  headers x 2 x u32 (start, end)
+
+Usage:
+    python3 alfred2_index.py <ALFRED.2> [animation_index]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from palette_catalog import find_budas
+
+HEADER_SIZE = 55
+NUM_HEADERS = 55  # File.anims[55] in alfred2.imhex.hexpat
+
+ALFRED2_INDEX_PATH = 'alfred2_index.bin'
+INDEX_MAGIC = b'A2IX'
+INDEX_VERSION = 1
+INDEX_HEADER_FORMAT = '<4sHHQQ'
+
+HEADER_DTYPE = np.dtype([
+    ('data_offset', '<u4'),
+    ('unknown1', 'u1', (3,)),
+    ('a_x', 'u1'),
+    ('a_y', 'u1'),
+    ('a_width', 'u1'),
+    ('a_height', 'u1'),
+    ('a_unknown', 'u1', (2,)),
+    ('a_frames', 'u1'),
+    ('unknown2', 'u1', (5,)),
+    ('b_x', 'u1'),
+    ('b_y', 'u1'),
+    ('b_width', 'u1'),
+    ('b_height', 'u1'),
+    ('b_unknown', 'u1', (2,)),
+    ('b_frames', 'u1'),
+    ('unknown3', 'u1', (29,)),
+])
+assert HEADER_DTYPE.itemsize == HEADER_SIZE
+
+Animation = Tuple[Optional[np.ndarray], Optional[np.ndarray]]
+
+
+def count_headers(data) -> int:
+    """Headers in the table: NUM_HEADERS, or fewer if pixel data starts earlier"""
+    first_data = len(data)
+    count = 0
+    while count < NUM_HEADERS and (count + 1) * HEADER_SIZE <= first_data:
+        data_offset = struct.unpack_from('<I', data, count * HEADER_SIZE)[0]
+        if data_offset:
+            first_data = min(first_data, data_offset)
+        count += 1
+    return count
+
+
+def build_index(data) -> Tuple[np.ndarray, np.ndarray]:
+    """(headers, segments) for an ALFRED.2 image"""
+    count = count_headers(data)
+    headers = np.frombuffer(data, dtype=HEADER_DTYPE, count=count).copy()
+
+    budas = np.asarray(find_budas(data), dtype=np.int64)
+    starts = headers['data_offset'].astype(np.int64)
+    following = np.searchsorted(budas, starts)
+    ends = np.where(following < len(budas), budas[np.minimum(following, len(budas) - 1)], len(data))
+
+    segments = np.zeros((count, 2), dtype='<u4')
+    valid = (starts != 0) & (starts < len(data))
+    segments[valid, 0] = starts[valid]
+    segments[valid, 1] = ends[valid]
+    return headers, segments
+
+
+def save_index(path, headers, segments, source_path=None):
+    size = mtime = 0
+    if source_path is not None:
+        st = os.stat(source_path)
+        size, mtime = st.st_size, st.st_mtime_ns
+    with open(path, 'wb') as f:
+        f.write(struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION, len(headers), size, mtime))
+        f.write(headers.tobytes())
+        f.write(segments.tobytes())
+
+
+def load_index(path):
+    """(headers, segments, (source size, mtime_ns)) from an index file"""
+    data = Path(path).read_bytes()
+    magic, version, count, size, mtime = struct.unpack_from(INDEX_HEADER_FORMAT, data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        raise ValueError(f"{path}: not a version {INDEX_VERSION} ALFRED.2 index")
+    offset = struct.calcsize(INDEX_HEADER_FORMAT)
+    headers = np.frombuffer(data, dtype=HEADER_DTYPE, count=count, offset=offset)
+    offset += headers.nbytes
+    segments = np.frombuffer(data, dtype='<u4', count=count * 2, offset=offset).reshape(count, 2)
+    return headers, segments, (size, mtime)
+
+
+def decode_animation(data, header, start, end) -> Animation:
+    """(anim_a, anim_b) frame arrays, each (frames, h, w) or None"""
+    length = max(0, (end - start) // 2) * 2
+    pairs = np.frombuffer(data, dtype=np.uint8, count=length, offset=start).reshape(-1, 2)
+    counts = pairs[:, 0].astype(np.int64)
+    ends = np.cumsum(counts)
+
+    result = []
+    first = 0
+    for part in ('a', 'b'):
+        w, h, n = (int(header[f'{part}_{field}']) for field in ('width', 'height', 'frames'))
+        size = w * h * n
+        if size == 0 or first >= len(pairs):
+            result.append(None)
+            continue
+
+        base = ends[first - 1] if first else 0
+        # Runs are taken until the animation is complete, like the game's loader
+        last = min(bisect_left(ends, base + size, lo=first), len(pairs) - 1)
+        frames = np.zeros(size, dtype=np.uint8)
+        pixels = np.repeat(pairs[first:last + 1, 1], counts[first:last + 1])[:size]
+        frames[:len(pixels)] = pixels
+        result.append(frames.reshape(n, h, w))
+        first = last + 1
+    return result[0], result[1]
+
+
+class Alfred2Index:
+    """Header table and compressed ranges of ALFRED.2, with decoded animations cached"""
+
+    def __init__(self, data, headers: np.ndarray, segments: np.ndarray):
+        self.data = data
+        self.headers = headers
+        self.segments = segments
+        self._animations: Dict[int, Animation] = {}
+
+    @classmethod
+    def load(cls, alfred2_path='files/ALFRED.2', path=ALFRED2_INDEX_PATH):
+        """Index for a file, rebuilt when the file changed since the cache was written"""
+        with open(alfred2_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        st = os.stat(alfred2_path)
+        if path is not None and Path(path).exists():
+            try:
+                headers, segments, stamp = load_index(path)
+                if stamp == (st.st_size, st.st_mtime_ns):
+                    return cls(data, headers, segments)
+            except (ValueError, struct.error):
+                pass
+
+        headers, segments = build_index(data)
+        if path is not None:
+            save_index(path, headers, segments, alfred2_path)
+        return cls(data, headers, segments)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def is_valid(self, index) -> bool:
+        return 0 <= index < len(self.headers) and self.segments[index, 1] != 0
+
+    def valid_indices(self) -> List[int]:
+        return np.flatnonzero(self.segments[:, 1]).tolist()
+
+    def info(self, index) -> Optional[Dict]:
+        """Header fields of an animation set, None for an empty header"""
+        if not self.is_valid(index):
+            return None
+        h = self.headers[index]
+        return {
+            'index': index,
+            'data_offset': int(h['data_offset']),
+            'palette_id': index * 13 + 11,
+            'anim1': {'width': int(h['a_width']), 'height': int(h['a_height']), 'frames': int(h['a_frames'])},
+            'anim2': {'width': int(h['b_width']), 'height': int(h['b_height']), 'frames': int(h['b_frames'])},
+        }
+
+    def get_animation(self, index) -> Animation:
+        """Decoded (anim_a, anim_b) of one animation set"""
+        animation = self._animations.get(index)
+        if animation is None:
+            if not self.is_valid(index):
+                raise IndexError(f"ALFRED.2 header {index} is empty")
+            start, end = (int(v) for v in self.segments[index])
+            animation = decode_animation(self.data, self.headers[index], start, end)
+            self._animations[index] = animation
+        return animation
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    index = Alfred2Index.load(sys.argv[1])
+    if len(sys.argv) > 2:
+        indices = [int(sys.argv[2])]
+    else:
+        indices = index.valid_indices()
+        print(f"{sys.argv[1]}: {len(index)} headers, {len(indices)} animation sets")
+
+    for i in indices:
+        start, end = index.segments[i]
+        anim_a, anim_b = index.get_animation(i)
+        shapes = ', '.join('x'.join(map(str, a.shape)) for a in (anim_a, anim_b) if a is not None)
+        print(f"  {i:3d}: 0x{start:06X}-0x{end:06X}  {shapes or 'no frames'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,195 +5,242 @@ ALFRED.1 ↔ ALFRED.2 Animation Lookup Tool
 Practical utilities for mapping between room sprites and talking animations
 """
 
-import struct
+import hashlib
+import inspect
+import mmap
+import os
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 
-HEADER_SIZE = 55
+import numpy as np
+
+from alfred2_index import INDEX_VERSION, Alfred2Index, build_index
+
 ROOM_HEADER_SIZE = 0x68
+NUM_ROOMS = 56
+PAIRS_PER_ROOM = 13
+
+# Sprite structures start at offset 98 of Pair 10, each is 44 bytes.
+# Sprites are numbered from 2, so slot (sprite_index - 2) holds sprite_index.
+SPRITE_TABLE_OFFSET = 98
+SPRITE_STRUCT_SIZE = 44
+ACTION_TALK = 0x10
+
+MAPPING_CACHE_DIR = Path(os.environ.get(
+    'ALFRED_MAPPING_CACHE', Path(__file__).resolve().parent / '.alfred_mapping_cache'))
+
+# One row per sprite slot that fits in its room's Pair 10
+MAPPING_DTYPE = np.dtype([
+    ('room', 'u1'),
+    ('sprite', 'u1'),
+    ('in_room', '?'),         # sprite < the room's sprite count
+    ('x', '<u2'),
+    ('y', '<u2'),
+    ('width', 'u1'),
+    ('height', 'u1'),
+    ('num_anims', 'u1'),
+    ('sprite_type', 'u1'),
+    ('action_flags', 'u1'),   # byte 34 (0x22)
+    ('is_hotspot', 'u1'),
+    ('animation_index', '<i2'),  # ALFRED.2 header index, -1 if none
+])
+
+
+def read_directory(alfred1) -> np.ndarray:
+    """(56, 13, 2) array of (offset, size) pairs"""
+    return np.frombuffer(alfred1, dtype='<u4', count=NUM_ROOMS * PAIRS_PER_ROOM * 2).reshape(
+        NUM_ROOMS, PAIRS_PER_ROOM, 2)
+
+
+def room_sprite_counts(alfred1) -> List[int]:
+    """Sprite count of every room (byte 5 of Pair 10, 0 if missing)"""
+    counts = []
+    for metadata_offset, metadata_size in read_directory(alfred1)[:, 10]:
+        pos = int(metadata_offset) + 5
+        counts.append(alfred1[pos] if metadata_size > 5 and pos < len(alfred1) else 0)
+    return counts
+
+
+def build_mapping_table(alfred1, alfred2_index: Alfred2Index) -> np.ndarray:
+    """Every (room, sprite) slot with its flags and ALFRED.2 animation.
+
+    A talking sprite's animation is the n-th non-empty ALFRED.2 header,
+    n being the number of talking sprites before it in (room, sprite)
+    order, counting only sprites below each room's sprite count.
+    """
+    directory = read_directory(alfred1)
+    sprite_counts = room_sprite_counts(alfred1)
+
+    rows = []
+    for room_id in range(NUM_ROOMS):
+        metadata_offset, metadata_size = (int(v) for v in directory[room_id, 10])
+        metadata_size = max(0, min(metadata_size, len(alfred1) - metadata_offset))
+        if metadata_size <= SPRITE_TABLE_OFFSET:
+            continue
+        num_sprites = sprite_counts[room_id]
+
+        slots = (metadata_size - SPRITE_TABLE_OFFSET) // SPRITE_STRUCT_SIZE
+        sprites = np.frombuffer(alfred1, dtype=np.uint8, count=slots * SPRITE_STRUCT_SIZE,
+                                offset=metadata_offset + SPRITE_TABLE_OFFSET).reshape(slots, SPRITE_STRUCT_SIZE)
+        room_rows = np.zeros(slots, dtype=MAPPING_DTYPE)
+        room_rows['room'] = room_id
+        room_rows['sprite'] = np.arange(2, slots + 2)
+        room_rows['in_room'] = room_rows['sprite'] < num_sprites
+        room_rows['x'] = sprites[:, 0].astype(np.uint16) | (sprites[:, 1].astype(np.uint16) << 8)
+        room_rows['y'] = sprites[:, 2].astype(np.uint16) | (sprites[:, 3].astype(np.uint16) << 8)
+        room_rows['width'] = sprites[:, 4]
+        room_rows['height'] = sprites[:, 5]
+        room_rows['num_anims'] = sprites[:, 8]
+        room_rows['sprite_type'] = sprites[:, 33]
+        room_rows['action_flags'] = sprites[:, 34]
+        room_rows['is_hotspot'] = sprites[:, 38]
+        rows.append(room_rows)
+
+    table = np.concatenate(rows) if rows else np.zeros(0, dtype=MAPPING_DTYPE)
+    talks = (table['action_flags'] & ACTION_TALK) != 0
+
+    # Talking sprites counted before each slot (out-of-room slots follow their room's sprites)
+    counted = (talks & table['in_room']).astype(np.int64)
+    counter = np.cumsum(counted) - counted
+
+    animations = np.asarray(alfred2_index.valid_indices(), dtype=np.int64)
+    has_animation = talks & (counter < len(animations))
+    table['animation_index'] = -1
+    table['animation_index'][has_animation] = animations[counter[has_animation]]
+    return table
+
+
+def mapping_key(alfred1, alfred2) -> str:
+    """Cache key: both files' contents and the source of everything the table is built with"""
+    h = hashlib.sha1()
+    for builder in (build_mapping_table, read_directory, room_sprite_counts,
+                    build_index, Alfred2Index.valid_indices):
+        h.update(inspect.getsource(builder).encode())
+    h.update(str(INDEX_VERSION).encode())
+    h.update(repr(MAPPING_DTYPE.descr).encode())
+    h.update(alfred1)
+    h.update(alfred2)
+    return h.hexdigest()
+
+
+def _map_file(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
 
 class AlfredAnimationMapper:
-    """Maps ALFRED.1 room sprites to ALFRED.2 animations"""
+    """Maps ALFRED.1 room sprites to ALFRED.2 animations.
 
-    def __init__(self, alfred1_path: str, alfred2_path: str):
+    The full (room, sprite) table is built once from the mapped files (or
+    loaded from .alfred_mapping_cache/) and every lookup is served from it;
+    animation info comes from the in-memory ALFRED.2 header table.
+    """
+
+    def __init__(self, alfred1_path: str, alfred2_path: str,
+                 cache_dir: Optional[Path] = MAPPING_CACHE_DIR):
         self.alfred1_path = Path(alfred1_path)
         self.alfred2_path = Path(alfred2_path)
+        self.cache_dir = cache_dir
         self._mapping_cache = None
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self._num_sprites: List[int] = []
+        self._alfred2_index = None
+
+    def _index(self) -> Alfred2Index:
+        if self._alfred2_index is None:
+            alfred2 = _map_file(self.alfred2_path)
+            self._alfred2_index = Alfred2Index(alfred2, *build_index(alfred2))
+        return self._alfred2_index
+
+    def _table(self) -> np.ndarray:
+        if self._mapping_cache is not None:
+            return self._mapping_cache
+
+        alfred1 = _map_file(self.alfred1_path)
+        alfred2 = _map_file(self.alfred2_path)
+        key = mapping_key(alfred1, alfred2)
+        path = Path(self.cache_dir) / f"{key}.npy" if self.cache_dir is not None else None
+
+        table = None
+        if path is not None and path.exists():
+            try:
+                table = np.load(path, allow_pickle=False)
+                if table.dtype != MAPPING_DTYPE:
+                    table = None
+            except (OSError, ValueError):
+                table = None
+
+        if table is None:
+            table = build_mapping_table(alfred1, self._index())
+            if path is not None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                    with open(tmp_path, 'wb') as f:
+                        np.save(f, table)
+                    os.replace(tmp_path, path)
+                except OSError:
+                    pass
+
+        self._rows = {(int(r), int(s)): i for i, (r, s) in enumerate(zip(table['room'], table['sprite']))}
+        self._num_sprites = room_sprite_counts(alfred1)
+        self._mapping_cache = table
+        return table
+
+    def _row(self, room_id: int, sprite_index: int):
+        table = self._table()
+        i = self._rows.get((room_id, sprite_index))
+        return table[i] if i is not None else None
 
     def get_sprite_action_flags(self, room_id: int, sprite_index: int) -> int:
         """Get the action_flags byte for a specific sprite"""
-        with open(self.alfred1_path, 'rb') as f:
-            data = f.read()
-
-        # Get room metadata offset
-        room_offset = room_id * ROOM_HEADER_SIZE
-        pairs = []
-        for i in range(13):
-            pair_offset = room_offset + (i * 8)
-            offset_val = struct.unpack('<I', data[pair_offset:pair_offset+4])[0]
-            size_val = struct.unpack('<I', data[pair_offset+4:pair_offset+8])[0]
-            pairs.append({'offset': offset_val, 'size': size_val})
-
-        metadata_offset = pairs[10]['offset']
-        metadata_size = pairs[10]['size']
-        metadata_data = data[metadata_offset:metadata_offset + metadata_size]
-
-        # Sprite structures start at offset 98, each is 44 bytes
-        # Sprites are numbered from 2, so actual index is (sprite_index - 2)
-        sprite_offset = 98 + (sprite_index - 2) * 44
-
-        if sprite_offset + 44 > len(metadata_data):
-            return 0
-
-        sprite_data = metadata_data[sprite_offset:sprite_offset + 44]
-
-        # action_flags is at byte 34 (0x22)
-        return sprite_data[34] if len(sprite_data) > 34 else 0
+        row = self._row(room_id, sprite_index)
+        return int(row['action_flags']) if row is not None else 0
 
     def sprite_can_talk(self, room_id: int, sprite_index: int) -> bool:
         """Check if a sprite has the TALK action flag"""
-        action_flags = self.get_sprite_action_flags(room_id, sprite_index)
-        return (action_flags & 0x10) != 0
+        return (self.get_sprite_action_flags(room_id, sprite_index) & ACTION_TALK) != 0
 
     def get_animation_index(self, room_id: int, sprite_index: int) -> Optional[int]:
         """
         Get the ALFRED.2 animation index for a specific sprite.
         Returns None if the sprite doesn't have talking animations.
         """
-        # Check if this sprite can talk
-        if not self.sprite_can_talk(room_id, sprite_index):
+        row = self._row(room_id, sprite_index)
+        if row is None or row['animation_index'] < 0:
             return None
-
-        # Count talking sprites before this one
-        counter = 0
-
-        for r in range(room_id):
-            num_sprites = self._get_num_sprites_in_room(r)
-            for s in range(2, num_sprites):
-                if self.sprite_can_talk(r, s):
-                    counter += 1
-
-        # Count sprites before this one in the same room
-        num_sprites = self._get_num_sprites_in_room(room_id)
-        for s in range(2, min(sprite_index, num_sprites)):
-            if self.sprite_can_talk(room_id, s):
-                counter += 1
-
-        # Now find the actual ALFRED.2 index (skipping empty headers)
-        with open(self.alfred2_path, 'rb') as f:
-            data = f.read()
-
-        found_count = 0
-        offset = 0
-        index = 0
-
-        while offset < len(data) - HEADER_SIZE:
-            data_offset = struct.unpack('<H', data[offset:offset+2])[0]
-
-            if data_offset != 0:  # Valid header
-                if found_count == counter:
-                    return index
-                found_count += 1
-
-            offset += HEADER_SIZE
-            index += 1
-
-            # Safety check
-            if index > 100:
-                break
-
-        return None
+        return int(row['animation_index'])
 
     def _get_num_sprites_in_room(self, room_id: int) -> int:
         """Get the number of sprites in a room"""
-        with open(self.alfred1_path, 'rb') as f:
-            data = f.read()
-
-        room_offset = room_id * ROOM_HEADER_SIZE
-        pairs = []
-        for i in range(13):
-            pair_offset = room_offset + (i * 8)
-            offset_val = struct.unpack('<I', data[pair_offset:pair_offset+4])[0]
-            size_val = struct.unpack('<I', data[pair_offset+4:pair_offset+8])[0]
-            pairs.append({'offset': offset_val, 'size': size_val})
-
-        metadata_offset = pairs[10]['offset']
-        metadata_size = pairs[10]['size']
-        metadata_data = data[metadata_offset:metadata_offset + metadata_size]
-
-        return metadata_data[5]
+        self._table()
+        return self._num_sprites[room_id]
 
     def get_animation_info(self, animation_index: int) -> Optional[Dict]:
-        """Get information about an ALFRED.2 animation"""
-        with open(self.alfred2_path, 'rb') as f:
-            data = f.read()
-
-        offset = animation_index * HEADER_SIZE
-
-        if offset + HEADER_SIZE > len(data):
-            return None
-
-        header_data = data[offset:offset + HEADER_SIZE]
-        data_offset = struct.unpack('<H', header_data[0:2])[0]
+        """Get information about an ALFRED.2 animation.
 
-        if data_offset == 0:
-            return None
-
-        return {
-            'index': animation_index,
-            'data_offset': data_offset,
-            'palette_id': (animation_index * 13) + 11,
-            'anim1': {
-                'width': header_data[9],
-                'height': header_data[10],
-                'frames': header_data[13],
-            },
-            'anim2': {
-                'width': header_data[21],
-                'height': header_data[22],
-                'frames': header_data[25],
-            }
-        }
+        data_offset is the header's full u32 field; it used to be read as a
+        u16, which truncated offsets past 64 KB.
+        """
+        return self._index().info(animation_index)
 
     def get_sprite_info(self, room_id: int, sprite_index: int) -> Optional[Dict]:
         """Get detailed information about a sprite"""
-        with open(self.alfred1_path, 'rb') as f:
-            data = f.read()
-
-        room_offset = room_id * ROOM_HEADER_SIZE
-        pairs = []
-        for i in range(13):
-            pair_offset = room_offset + (i * 8)
-            offset_val = struct.unpack('<I', data[pair_offset:pair_offset+4])[0]
-            size_val = struct.unpack('<I', data[pair_offset+4:pair_offset+8])[0]
-            pairs.append({'offset': offset_val, 'size': size_val})
-
-        metadata_offset = pairs[10]['offset']
-        metadata_size = pairs[10]['size']
-        metadata_data = data[metadata_offset:metadata_offset + metadata_size]
-
-        sprite_offset = 98 + (sprite_index - 2) * 44
-
-        if sprite_offset + 44 > len(metadata_data):
+        row = self._row(room_id, sprite_index)
+        if row is None:
             return None
-
-        sprite_data = metadata_data[sprite_offset:sprite_offset + 44]
-
-        x = struct.unpack('<H', sprite_data[0:2])[0]
-        y = struct.unpack('<H', sprite_data[2:4])[0]
-
         return {
             'room_id': room_id,
             'sprite_index': sprite_index,
-            'x': x,
-            'y': y,
-            'width': sprite_data[4],
-            'height': sprite_data[5],
-            'num_anims': sprite_data[8],
-            'sprite_type': sprite_data[33] if len(sprite_data) > 33 else 0,
-            'action_flags': sprite_data[34] if len(sprite_data) > 34 else 0,
-            'is_hotspot': sprite_data[38] if len(sprite_data) > 38 else 0,
-            'can_talk': self.sprite_can_talk(room_id, sprite_index)
+            'x': int(row['x']),
+            'y': int(row['y']),
+            'width': int(row['width']),
+            'height': int(row['height']),
+            'num_anims': int(row['num_anims']),
+            'sprite_type': int(row['sprite_type']),
+            'action_flags': int(row['action_flags']),
+            'is_hotspot': int(row['is_hotspot']),
+            'can_talk': bool(row['action_flags'] & ACTION_TALK)
         }
 
     def find_all_talking_sprites(self) -> List[Tuple[int, int, int]]:
@@ -201,16 +248,11 @@ class AlfredAnimationMapper:
         Find all talking sprites in the game.
         Returns list of (room_id, sprite_index, animation_index) tuples.
         """
-        results = []
-
-        for room_id in range(56):
-            num_sprites = self._get_num_sprites_in_room(room_id)
-            for sprite_index in range(2, num_sprites):
-                if self.sprite_can_talk(room_id, sprite_index):
-                    anim_idx = self.get_animation_index(room_id, sprite_index)
-                    results.append((room_id, sprite_index, anim_idx))
-
-        return results
+        table = self._table()
+        talking = table[table['in_room'] & ((table['action_flags'] & ACTION_TALK) != 0)]
+        return [(int(r['room']), int(r['sprite']),
+                 int(r['animation_index']) if r['animation_index'] >= 0 else None)
+                for r in talking]
 
     def lookup(self, room_id: int, sprite_index: int) -> Dict:
         """
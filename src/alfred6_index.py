@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+ALFRED.6 - Binary Sprite Index ("pegatinas")
+
+Builds a fixed-width record index of ALFRED.6 (ALFRED6_FILE_FORMAT.md) that
+is memory-mapped instead of parsed, and serves sprites straight from a
+mapping of ALFRED.6.
+
+Records are located with the extractor's scan (src/alfred6.c): a 6-byte
+header (x u16, y u16, width u8, height u8) and width*height raw pixels,
+0xBF separators after the first 6 sprites, and the jumps at sprites 37,
+67, 68 and 88. Headers with a zero dimension are skipped. The room whose
+palette a sprite uses comes from tablapaletas.
+
+Identical frames (same size and pixels) are stored once: every record
+carries `frame`, the index of the first sprite with the same content, and
+that sprite's pixel offset, so duplicates decode to the same array.
+
+Index file (alfred6_index.bin):
+  header   '<4sHHQQ' magic 'A6IX', version, sprites, source size, mtime_ns
+  records  sprites x SPRITE_DTYPE (32 bytes each), np.memmap'd
+
+Usage:
+    python3 alfred6_index.py <ALFRED.6> [sprite_index]
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+HEADER_SIZE = 6
+SEPARATOR = 0xBF
+SEPARATED_SPRITES = 6
+
+# Sprites whose records are not where the previous one ends
+SPRITE_JUMPS = {37: 0x1B8C4, 67: 0x3F813, 68: 0x4115D, 88: 0x58969}
+
+# Room palette per sprite (tablapaletas in src/alfred6.c); later sprites use room 0
+TABLAPALETAS = (
+    0, 0, 0, 0, 0, 0, 0,
+    2, 2,
+    3, 3, 3, 3, 3, 3, 3, 3,
+    4, 4, 4, 4, 4,
+    5, 5,
+    7,
+    8, 8,
+    9, 9, 9, 9, 9,
+    12, 12,
+    13, 13, 13,
+    12,
+    15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15,
+    16, 16,
+    17, 17,
+    19, 19, 19, 19, 19,
+    0, 0, 0, 0, 0, 0, 0,
+    33, 33,
+    29, 29,
+    0, 0, 0,
+    34, 35, 31, 25,
+    31,
+    32,
+    21, 25,
+    0,
+    0, 0, 0, 0, 0,
+    4, 4, 4, 4,
+    0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0,
+    33, 33,
+    47, 47,
+    52, 52, 52, 52, 52,
+    52, 52, 52, 52, 52, 52,
+    41,
+    0,
+    30,
+    44, 44, 44, 44,
+    31,
+    46, 46,
+    31,
+    51, 52, 53, 54,
+)
+
+ALFRED6_INDEX_PATH = 'alfred6_index.bin'
+INDEX_MAGIC = b'A6IX'
+INDEX_VERSION = 1
+INDEX_HEADER_FORMAT = '<4sHHQQ'
+
+SPRITE_DTYPE = np.dtype([
+    ('offset', '<u4'),        # record (header) offset in ALFRED.6
+    ('pixel_offset', '<u4'),  # pixels of `frame`, shared by duplicates
+    ('x', '<u2'),
+    ('y', '<u2'),
+    ('width', 'u1'),
+    ('height', 'u1'),
+    ('room', 'u1'),
+    ('pad', 'u1'),
+    ('frame', '<u2'),         # first sprite with identical pixels
+    ('pad2', 'u1', (6,)),
+    ('digest', '<u8'),        # first 8 bytes of the frame's BLAKE2b
+])
+assert SPRITE_DTYPE.itemsize == 32
+
+
+def scan_records(data):
+    """(offset, x, y, width, height) of every sprite, in index order"""
+    records = []
+    size = len(data)
+    offset = 0
+    while offset + HEADER_SIZE <= size:
+        j = len(records)
+        offset = SPRITE_JUMPS.get(j, offset)
+        x, y, width, height = struct.unpack_from('<HHBB', data, offset)
+        if width and height:
+            records.append((offset, x, y, width, height))
+
+        offset += width * height + HEADER_SIZE
+        if len(records) < SEPARATED_SPRITES:
+            while offset < size and data[offset] != SEPARATOR:
+                offset += 1
+        while offset < size and data[offset] == SEPARATOR:
+            offset += 1
+    return records
+
+
+def build_index(data) -> np.ndarray:
+    records = scan_records(data)
+    index = np.zeros(len(records), dtype=SPRITE_DTYPE)
+    frames: Dict[bytes, int] = {}
+    for i, (offset, x, y, width, height) in enumerate(records):
+        pixel_offset = offset + HEADER_SIZE
+        h = hashlib.blake2b(bytes([width, height]), digest_size=16)
+        h.update(data[pixel_offset:pixel_offset + width * height])
+        digest = h.digest()
+        frame = frames.setdefault(digest, i)
+
+        index[i] = (offset, index[frame]['pixel_offset'] if frame != i else pixel_offset,
+                    x, y, width, height, TABLAPALETAS[i] if i < len(TABLAPALETAS) else 0, 0,
+                    frame, (0,) * 6, int.from_bytes(digest[:8], 'little'))
+    return index
+
+
+def save_index(path, index, source_path=None):
+    size = mtime = 0
+    if source_path is not None:
+        st = os.stat(source_path)
+        size, mtime = st.st_size, st.st_mtime_ns
+    with open(path, 'wb') as f:
+        f.write(struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION, len(index), size, mtime))
+        f.write(index.tobytes())
+
+
+def load_index(path):
+    """(memory-mapped records, (source size, mtime_ns)) from an index file"""
+    with open(path, 'rb') as f:
+        header = f.read(struct.calcsize(INDEX_HEADER_FORMAT))
+    magic, version, count, size, mtime = struct.unpack(INDEX_HEADER_FORMAT, header)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        raise ValueError(f"{path}: not a version {INDEX_VERSION} ALFRED.6 index")
+    records = np.memmap(path, dtype=SPRITE_DTYPE, mode='r', offset=len(header), shape=(count,))
+    return records, (size, mtime)
+
+
+class Alfred6Index:
+    """Sprite records of ALFRED.6 with pixels served from a mapping of the file"""
+
+    def __init__(self, data, records: np.ndarray):
+        self.data = data
+        self.records = records
+        self._frames: Dict[int, np.ndarray] = {}
+
+    @classmethod
+    def load(cls, alfred6_path='files/ALFRED.6', path=ALFRED6_INDEX_PATH):
+        """Index for a file, rebuilt when the file changed since the index was written"""
+        with open(alfred6_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        st = os.stat(alfred6_path)
+        if path is not None and Path(path).exists():
+            try:
+                records, stamp = load_index(path)
+                if stamp == (st.st_size, st.st_mtime_ns):
+                    return cls(data, records)
+            except (ValueError, struct.error):
+                pass
+
+        records = build_index(data)
+        if path is not None:
+            save_index(path, records, alfred6_path)
+        return cls(data, records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def unique_frames(self) -> int:
+        return int(np.count_nonzero(self.records['frame'] == np.arange(len(self.records))))
+
+    def info(self, i) -> Dict:
+        r = self.records[i]
+        return {'index': i, 'offset': int(r['offset']), 'x': int(r['x']), 'y': int(r['y']),
+                'width': int(r['width']), 'height': int(r['height']), 'room': int(r['room']),
+                'frame': int(r['frame'])}
+
+    def get_sprite(self, i) -> np.ndarray:
+        """(height, width) pixels of sprite i, a read-only view of the mapped file"""
+        r = self.records[i]
+        frame = int(r['frame'])
+        pixels = self._frames.get(frame)
+        if pixels is None:
+            width, height = int(r['width']), int(r['height'])
+            start = int(r['pixel_offset'])
+            count = min(width * height, max(0, len(self.data) - start))
+            pixels = np.frombuffer(self.data, dtype=np.uint8, count=count, offset=start)
+            if count < width * height:  # Truncated last record reads as 0, like the extractor
+                pixels = np.concatenate([pixels, np.zeros(width * height - count, dtype=np.uint8)])
+            pixels = pixels.reshape(height, width)
+            self._frames[frame] = pixels
+        return pixels
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    index = Alfred6Index.load(sys.argv[1])
+    if len(sys.argv) > 2:
+        i = int(sys.argv[2])
+        info = index.info(i)
+        pixels = index.get_sprite(i)
+        print(f"Sprite {i}: offset 0x{info['offset']:06X} at ({info['x']}, {info['y']}) "
+              f"{pixels.shape[1]}x{pixels.shape[0]} room {info['room']} frame {info['frame']}")
+        return
+
+    print(f"{sys.argv[1]}: {len(index)} sprites, {index.unique_frames()} unique frames")
+    for i in range(len(index)):
+        info = index.info(i)
+        shared = f" = {info['frame']}" if info['frame'] != i else ''
+        print(f"  {i:3d}: 0x{info['offset']:06X} ({info['x']:3d}, {info['y']:3d}) "
+              f"{info['width']:3d}x{info['height']:<3d} room {info['room']:2d}{shared}")
+
+
+if __name__ == '__main__':
+    main()
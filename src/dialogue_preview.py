@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Dialogue Preview Compositor
+
+Renders what the player sees for every page of every dialogue line: the
+room background, a speech balloon frame from ALFRED.4 and the wrapped,
+bordered text on top, as 640x400 palette-index images.
+
+Everything that can be shared is built once per batch:
+  - balloon frames are decoded once (extract_balloons.load_balloon_frames)
+  - background + balloon are composited once into a base frame
+  - all strings are wrapped and paginated in one layout_strings() call
+  - wrapped lines are bordered LINE_CHUNK at a time by text_layers()
+so each preview is a copy of the base frame plus one masked copy of
+each of its lines' pre-colored glyph and border pixels.
+
+Placement: the balloon's top-left corner is `balloon_pos`; each line is
+centered on `anchor` (by default the balloon's center) using its pixel
+width from the layout, and a page's lines are centered vertically on it.
+Balloon pixels equal to `transparent` (0xFF) show the background. Pixels
+outside the screen are clipped.
+
+Dialogue text is read as raw Pair 12 bytes of ALFRED.1, so every glyph
+the game would draw (0x7B-0x83: accented letters, n-tilde, N-tilde and
+the inverted ! and ?) reaches the font unchanged; only control bytes
+below 0x20 are dropped.
+
+Usage:
+    python3 dialogue_preview.py <ALFRED.1> <room> [output_dir] [--background image.png]
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from extract_balloons import BALLOON_HEIGHT, BALLOON_WIDTH, BUDA_OFFSETS, extract_palette_11, load_balloon_frames
+from font_atlas import FontAtlas, load_atlas
+from render_font_border import BORDER_INDEX, PINK_INDEX, TRANSPARENT_INDEX, text_layers
+from text_layout import TextLayout, layout_strings
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 400
+BALLOON_SET = 1  # the larger balloon set in ALFRED.4
+LINE_CHUNK = 1024  # wrapped lines bordered per text_layers() call
+
+# Font codes of the letters outside ASCII (large font glyphs 123-131)
+GAME_CHARS = {'á': 0x7B, 'é': 0x7C, 'í': 0x7D, 'ó': 0x7E, 'ú': 0x7F,
+              'ñ': 0x80, 'Ñ': 0x81, '¡': 0x82, '¿': 0x83}
+
+
+# Bytes that end a line of conversation text (parse_elements_with_indices())
+TEXT_END = frozenset([0x08, 0xFB, 0xF1, 0xF8, 0xFD, 0xFC, 0xF4, 0xF7, 0xF5, 0xFE, 0xEB, 0xF0])
+SPEAKER_MARKER = 0x08
+CHOICE_MARKERS = (0xFB, 0xF1)
+ACTION_MARKER = 0xF8
+ALFRED_SPEAKER = 0x0D
+UPPERCASE = frozenset(range(ord('A'), ord('Z') + 1)) | {GAME_CHARS['Ñ']}
+OPENERS = frozenset([GAME_CHARS['¡'], GAME_CHARS['¿'], ord('[')])
+
+
+@dataclass
+class Preview:
+    string: int          # index in the string table
+    page: int
+    pixels: np.ndarray   # (SCREEN_HEIGHT, SCREEN_WIDTH) palette indices
+
+
+def blit(target: np.ndarray, source: np.ndarray, x: int, y: int, mask: Optional[np.ndarray] = None):
+    """Copy source (or source where mask) into target at (x, y), clipped to target"""
+    h, w = source.shape
+    tx0, ty0 = max(x, 0), max(y, 0)
+    tx1, ty1 = min(x + w, target.shape[1]), min(y + h, target.shape[0])
+    if tx0 >= tx1 or ty0 >= ty1:
+        return
+    src = source[ty0 - y:ty1 - y, tx0 - x:tx1 - x]
+    dst = target[ty0:ty1, tx0:tx1]
+    if mask is None:
+        dst[...] = src
+    else:
+        np.copyto(dst, src, where=mask[ty0 - y:ty1 - y, tx0 - x:tx1 - x])
+
+
+class DialogueCompositor:
+    """Base frame (background + balloon) and font shared by a batch of previews"""
+
+    def __init__(self, atlas: FontAtlas, balloon: Optional[np.ndarray] = None,
+                 background: Optional[np.ndarray] = None,
+                 balloon_pos: Tuple[int, int] = ((SCREEN_WIDTH - BALLOON_WIDTH) // 2, 16),
+                 anchor: Optional[Tuple[int, int]] = None, transparent: int = TRANSPARENT_INDEX):
+        self.atlas = atlas
+        if background is None:
+            background = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH), dtype=np.uint8)
+        self.base = np.array(background, dtype=np.uint8)
+        if balloon is not None:
+            blit(self.base, balloon, balloon_pos[0], balloon_pos[1], balloon != transparent)
+        if anchor is None:
+            anchor = (balloon_pos[0] + BALLOON_WIDTH // 2, balloon_pos[1] + BALLOON_HEIGHT // 2)
+        self.anchor = anchor
+
+    def iter_previews(self, texts: Sequence, text_color=PINK_INDEX, border_color=BORDER_INDEX,
+                      colors: Optional[Sequence[int]] = None) -> Iterator[Preview]:
+        """Previews of every page of every string, in string then page order.
+
+        colors optionally gives a text color per string (e.g. per speaker).
+        """
+        layout = layout_strings(texts)
+        yield from self.compose(layout, text_color, border_color, colors)
+
+    def compose(self, layout: TextLayout, text_color=PINK_INDEX, border_color=BORDER_INDEX,
+                colors: Optional[Sequence[int]] = None) -> Iterator[Preview]:
+        lines = layout.lines
+        if len(lines) == 0:
+            return
+
+        # One preview per (string, page); rows are in string then page order
+        key = lines['string'].astype(np.int64) * 65536 + lines['page']
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        ends = np.r_[starts[1:], len(lines)]
+        ax, ay = self.anchor
+        row_colors = np.full(len(lines), text_color, dtype=np.uint8)
+        if colors is not None:
+            row_colors[:] = np.asarray(colors, dtype=np.uint8)[lines['string']]
+
+        chunk_start = chunk_end = 0
+        for start, end in zip(starts, ends):
+            if end > chunk_end:
+                # Border the next block of lines in one call (a page never spans two blocks)
+                chunk_start, chunk_end = start, min(start + LINE_CHUNK, len(lines))
+                glyphs, border = text_layers(self.atlas, [layout.line_text(row)
+                                                          for row in range(chunk_start, chunk_end)])
+                ink = np.where(glyphs, row_colors[chunk_start:chunk_end, None, None], np.uint8(border_color))
+                inked = glyphs | border
+                line_height = glyphs.shape[1]
+
+            pixels = self.base.copy()
+            top = ay - (end - start) * line_height // 2
+            for row in range(start, end):
+                width = int(lines['width'][row])
+                i = row - chunk_start
+                blit(pixels, ink[i, :, :width + 1], ax - width // 2, top + (row - start) * line_height,
+                     inked[i, :, :width + 1])
+            yield Preview(int(lines['string'][start]), int(lines['page'][start]), pixels)
+
+    def render_previews(self, texts: Sequence, text_color=PINK_INDEX, border_color=BORDER_INDEX,
+                        colors: Optional[Sequence[int]] = None) -> List[Preview]:
+        return list(self.iter_previews(texts, text_color, border_color, colors))
+
+
+def clean_line(text: bytes) -> bytes:
+    """clean_text() of export_trees_correct.py on raw game bytes"""
+    text = text.strip(b' ')
+
+    # Leading [XX][00] patterns
+    while b'[' in text[:15]:
+        idx = text.find(b'[')
+        end_idx = text.find(b']', idx)
+        if idx >= 10 or not idx < end_idx < idx + 10:
+            break
+        text = text[end_idx + 1:].lstrip(b' ')
+
+    # A single leading control character
+    if len(text) > 1 and ((text[0] in b'AH' and (text[1] in UPPERCASE or text[1] in OPENERS))
+                          or text[0] in b'#%\')!+,.-"*&$(/'):
+        text = text[1:].lstrip(b' ')
+    return text.strip(b' ')
+
+
+def read_text(conv_data: bytes, pos: int) -> Tuple[bytes, int]:
+    """Raw text from pos to the next end byte, control bytes removed, and the end position"""
+    end = pos
+    while end < len(conv_data) and conv_data[end] not in TEXT_END:
+        end += 1
+    return bytes(b for b in conv_data[pos:end] if b >= 0x20), end
+
+
+def conversation_lines(alfred1_path, room) -> List[Dict]:
+    """Spoken lines of a room's conversations: {'speaker', 'text' (raw game bytes)}
+
+    Walks the conversation data as parse_elements_with_indices() does, but
+    keeps the text bytes instead of decoding them.
+    """
+    from export_trees_correct import extract_descriptions, read_room_pair
+
+    data = Path(alfred1_path).read_bytes()
+    pair12 = read_room_pair(data, room, pair_num=12)
+    if pair12 is None:
+        return []
+    _, conv_start_pos = extract_descriptions(pair12)
+    conv_data = pair12[conv_start_pos:]
+
+    lines = []
+    pos = 0
+    while pos < len(conv_data):
+        b = conv_data[pos]
+        if b == SPEAKER_MARKER and pos + 1 < len(conv_data):
+            speaker = 'ALFRED' if conv_data[pos + 1] == ALFRED_SPEAKER else 'NPC'
+            text, pos = read_text(conv_data, pos + 2)
+            text = clean_line(text)
+            if text:
+                lines.append({'speaker': speaker, 'text': text})
+        elif b in CHOICE_MARKERS:
+            # Choice index and speaker marker, then the option text
+            _, pos = read_text(conv_data, min(pos + 4, len(conv_data)))
+        elif b == ACTION_MARKER:
+            pos += 3
+        else:
+            pos += 1
+    return lines
+
+
+def main():
+    args = sys.argv[1:]
+    background = None
+    if '--background' in args:
+        i = args.index('--background')
+        background = np.asarray(Image.open(args[i + 1]))
+        del args[i:i + 2]
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    alfred1_path, room = args[0], int(args[1])
+    output_dir = Path(args[2] if len(args) > 2 else f"dialogue_previews/room{room:02d}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open('files/ALFRED.4', 'rb') as f:
+        balloons, _, _ = load_balloon_frames(f.read(), BUDA_OFFSETS[BALLOON_SET])
+    palette = extract_palette_11(alfred1_path)
+
+    lines = conversation_lines(alfred1_path, room)
+    compositor = DialogueCompositor(load_atlas('large'), balloons[0], background)
+    count = 0
+    for preview in compositor.iter_previews([line['text'] for line in lines]):
+        img = Image.fromarray(preview.pixels, 'P')
+        if palette is not None:
+            img.putpalette(palette)
+        img.save(output_dir / f"line{preview.string:03d}_page{preview.page}.png")
+        count += 1
+    print(f"✓ Room {room}: {len(lines)} dialogue lines, {count} previews in {output_dir}/")
+
+
+if __name__ == '__main__':
+    main()
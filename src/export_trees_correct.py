@@ -8,14 +8,27 @@ player choice menu. If it appears only once, it's automatic dialogue continuatio
 
 Usage:
     python3 export_trees_correct.py [room_number]
-    python3 export_trees_correct.py --all
+    python3 export_trees_correct.py --all [--jobs N]
+
+With --all, rooms are exported in parallel by a process pool. Each tree file
+is streamed to disk as soon as its room finishes, and a combined index.json
+(room -> tree file, node count, choice count) is written at the end.
+
+The top-level export_trees_correct.py is a thin wrapper around this file.
 """
 
+import json
+import mmap
+import os
 import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from collections import Counter
 
+ALFRED1_PATH = 'files/ALFRED.1'
+NUM_ROOMS = 55
+
 def read_room_pair(data, room_num, pair_num):
     """Read a specific pair from a room"""
     room_offset = room_num * 104
@@ -116,6 +129,7 @@ def parse_elements_with_indices(conv_data):
                 pos += 1
 
                 # Read text
+                text_offset = pos
                 text = ""
                 while pos < len(conv_data) and conv_data[pos] not in [0x08, 0xFB, 0xF1, 0xF8, 0xFD, 0xFC, 0xF4, 0xF7, 0xF5, 0xFE, 0xEB, 0xF0]:
                     char = decode_byte(conv_data[pos])
@@ -125,7 +139,8 @@ def parse_elements_with_indices(conv_data):
 
                 text = clean_text(text)
                 if text:
-                    elements.append({'type': 'dialogue', 'speaker': speaker, 'text': text, 'choice_index': None})
+                    elements.append({'type': 'dialogue', 'speaker': speaker, 'text': text, 'choice_index': None,
+                                     'offset': text_offset})
 
         elif b in [0xFB, 0xF1]:  # CHOICE marker
             pos += 1
@@ -142,6 +157,7 @@ def parse_elements_with_indices(conv_data):
                 pos += 1
 
             # Read text
+            text_offset = pos
             text = ""
             while pos < len(conv_data) and conv_data[pos] not in [0x08, 0xFB, 0xF1, 0xF8, 0xFD, 0xFC, 0xF4, 0xF7, 0xF5, 0xFE, 0xEB, 0xF0]:
                 char = decode_byte(conv_data[pos])
@@ -151,7 +167,8 @@ def parse_elements_with_indices(conv_data):
 
             text = clean_text(text)
             if text:
-                elements.append({'type': 'choice_marker', 'text': text, 'choice_index': choice_index})
+                elements.append({'type': 'choice_marker', 'text': text, 'choice_index': choice_index,
+                                 'offset': text_offset})
 
         elif b == 0xF8:  # ACTION
             pos += 3
@@ -252,34 +269,58 @@ def build_tree_structure(elements):
 
     return roots
 
-def format_tree_output(roots, output_lines=None):
-    """Format tree with proper indentation"""
-    if output_lines is None:
-        output_lines = []
-
+def iter_tree_lines(roots):
+    """Yield formatted tree lines one at a time (no intermediate list)"""
     for root in roots:
-        output_lines.append(f"NPC: {root['text']}")
+        yield f"NPC: {root['text']}"
 
         for choice_idx, choice in enumerate(root['choices'], 1):
-            format_choice(choice, choice_idx, 1, output_lines)
-
-    return output_lines
+            yield from iter_choice_lines(choice, choice_idx, 1)
 
-def format_choice(choice, choice_num, indent_level, output_lines):
-    """Recursively format a choice"""
+def iter_choice_lines(choice, choice_num, indent_level):
+    """Recursively yield the lines for a choice"""
     indent = "    " * indent_level
 
-    output_lines.append(f"{indent}CHOICE {choice_num}: {choice['text']}")
-    output_lines.append(f"{indent}    ALFRED: {choice['text']}")
+    yield f"{indent}CHOICE {choice_num}: {choice['text']}"
+    yield f"{indent}    ALFRED: {choice['text']}"
 
     for response in choice.get('responses', []):
-        output_lines.append(f"{indent}    {response['speaker']}: {response['text']}")
+        yield f"{indent}    {response['speaker']}: {response['text']}"
 
     for sub_idx, subchoice in enumerate(choice.get('subchoices', []), 1):
-        format_choice(subchoice, sub_idx, indent_level + 1, output_lines)
+        yield from iter_choice_lines(subchoice, sub_idx, indent_level + 1)
 
     if choice.get('terminated'):
-        output_lines.append(f"{indent}    TERMINATES CONVERSATION AND REMOVES BRANCH")
+        yield f"{indent}    TERMINATES CONVERSATION AND REMOVES BRANCH"
+
+def format_tree_output(roots, output_lines=None):
+    """Format tree with proper indentation"""
+    if output_lines is None:
+        output_lines = []
+
+    output_lines.extend(iter_tree_lines(roots))
+    return output_lines
+
+def format_choice(choice, choice_num, indent_level, output_lines):
+    """Recursively format a choice"""
+    output_lines.extend(iter_choice_lines(choice, choice_num, indent_level))
+
+def count_tree_nodes(roots):
+    """Return (node_count, choice_count) for a list of root nodes"""
+    nodes = 0
+    choices = 0
+    pending = []
+    for root in roots:
+        nodes += 1
+        pending.extend(root['choices'])
+
+    while pending:
+        choice = pending.pop()
+        nodes += 1
+        choices += 1
+        pending.extend(choice.get('subchoices', []))
+
+    return nodes, choices
 
 def export_room_tree(data, room_num, output_dir):
     """Export conversation tree for a room"""
@@ -296,8 +337,9 @@ def export_room_tree(data, room_num, output_dir):
 
     elements, index_counts = parse_elements_with_indices(conv_data)
     roots = build_tree_structure(elements)
+    node_count, choice_count = count_tree_nodes(roots)
 
-    output_file = output_dir / f"room{room_num:02d}_tree.txt"
+    output_file = Path(output_dir) / f"room{room_num:02d}_tree.txt"
 
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"ROOM {room_num} - CONVERSATION TREE\n")
@@ -312,33 +354,81 @@ def export_room_tree(data, room_num, output_dir):
         f.write("CONVERSATION TREE:\n")
         f.write("=" * 80 + "\n\n")
 
-        output_lines = format_tree_output(roots)
-        for line in output_lines:
+        for line in iter_tree_lines(roots):
             f.write(line + "\n")
 
-    return {'room': room_num, 'has_conversations': True, 'file': str(output_file)}
+    return {
+        'room': room_num,
+        'has_conversations': True,
+        'file': str(output_file),
+        'nodes': node_count,
+        'choices': choice_count,
+    }
+
+# Per-worker view of ALFRED.1, opened once by _init_worker
+_worker_data = None
+
+def _init_worker(alfred1_path):
+    """Pool initializer: map ALFRED.1 once per worker process"""
+    global _worker_data
+    with open(alfred1_path, 'rb') as f:
+        _worker_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _export_room_worker(room_num, output_dir):
+    return export_room_tree(_worker_data, room_num, output_dir)
+
+def export_all_rooms(alfred1_path, output_dir, jobs=None, num_rooms=NUM_ROOMS):
+    """Export every room in parallel, yielding results as rooms complete.
+
+    Writes <output_dir>/index.json once all rooms are done.
+    """
+    output_dir = Path(output_dir)
+    index = []
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(str(alfred1_path),)) as pool:
+        futures = [pool.submit(_export_room_worker, room_num, str(output_dir))
+                   for room_num in range(num_rooms)]
+        for future in as_completed(futures):
+            result = future.result()
+            if result and result['has_conversations']:
+                index.append({
+                    'room': result['room'],
+                    'file': Path(result['file']).name,
+                    'nodes': result['nodes'],
+                    'choices': result['choices'],
+                })
+            yield result
+
+    index.sort(key=lambda entry: entry['room'])
+    with open(output_dir / 'index.json', 'w', encoding='utf-8') as f:
+        json.dump({'rooms': index}, f, indent=2)
 
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 export_trees_correct.py [room_number]")
-        print("       python3 export_trees_correct.py --all")
+        print("       python3 export_trees_correct.py --all [--jobs N]")
         sys.exit(1)
 
-    print("Loading ALFRED.1...")
-    with open('files/ALFRED.1', 'rb') as f:
-        data = f.read()
-
     output_dir = Path('conversation_trees_final')
     output_dir.mkdir(exist_ok=True)
 
     if sys.argv[1] == '--all':
-        print("Exporting all rooms...")
-        for room_num in range(55):
-            result = export_room_tree(data, room_num, output_dir)
+        jobs = None
+        if '--jobs' in sys.argv:
+            jobs = int(sys.argv[sys.argv.index('--jobs') + 1])
+
+        print(f"Exporting all rooms ({jobs or os.cpu_count()} workers)...")
+        for result in export_all_rooms(ALFRED1_PATH, output_dir, jobs=jobs):
             if result and result['has_conversations']:
-                print(f"  Room {room_num:02d}: ✓")
-        print(f"\nDone! Trees exported to {output_dir}/")
+                print(f"  Room {result['room']:02d}: ✓ "
+                      f"({result['nodes']} nodes, {result['choices']} choices)")
+        print(f"\nDone! Trees exported to {output_dir}/ (index: {output_dir / 'index.json'})")
     else:
+        print("Loading ALFRED.1...")
+        with open(ALFRED1_PATH, 'rb') as f:
+            data = f.read()
+
         room_num = int(sys.argv[1])
         print(f"Exporting room {room_num}...")
         result = export_room_tree(data, room_num, output_dir)
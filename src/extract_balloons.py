@@ -8,6 +8,17 @@ import sys
 import struct
 from pathlib import Path
 from PIL import Image
+import numpy as np
+
+ICON_WIDTH = 60
+ICON_HEIGHT = 60
+ICON_SIZE = ICON_WIDTH * ICON_HEIGHT
+NUM_ICONS = 9
+
+BALLOON_WIDTH = 247
+BALLOON_HEIGHT = 112
+FRAME_SIZE = BALLOON_WIDTH * BALLOON_HEIGHT
+BUDA_OFFSETS = [0x008F2E, 0x00A57A]
 
 def extract_palette_11(alfred1_path):
     """Extract palette 11 from ALFRED.1 room 0"""
@@ -27,33 +38,50 @@ def extract_palette_11(alfred1_path):
         print(f"Warning: Palette size is {size}, expected 768")
         return None
 
-    palette_data = data[offset:offset+768]
-
     # Convert VGA 6-bit to 8-bit (multiply by 4)
-    palette = []
-    for i in range(256):
-        r = palette_data[i*3] * 4
-        g = palette_data[i*3+1] * 4
-        b = palette_data[i*3+2] * 4
-        palette.extend([r, g, b])
-
-    return palette
+    palette_data = np.frombuffer(data, dtype=np.uint8, count=768, offset=offset)
+    return (palette_data.astype(np.int32) * 4).tolist()
 
 def decompress_rle(data, offset, max_size=200000):
-    """Decompress RLE data"""
-    result = bytearray()
-    pos = offset
-
-    while len(result) < max_size and pos + 2 <= len(data):
-        if pos + 4 <= len(data) and data[pos:pos+4] == b'BUDA':
-            break
-
-        count = data[pos]
-        value = data[pos + 1]
-        result.extend([value] * count)
-        pos += 2
-
-    return bytes(result), pos - offset
+    """Decompress RLE data
+
+    (count, value) pairs from offset, up to a BUDA marker at a pair boundary,
+    stopping once max_size bytes have been produced.
+    """
+    if offset >= len(data):
+        return b'', 0
+    pair_count = max(0, (len(data) - offset) // 2)
+    marker = data.find(b'BUDA', offset)
+    while marker >= 0 and (marker - offset) % 2:
+        marker = data.find(b'BUDA', marker + 1)
+    if marker >= 0:
+        pair_count = min(pair_count, (marker - offset) // 2)
+
+    pairs = np.frombuffer(data, dtype=np.uint8, count=pair_count * 2, offset=offset).reshape(-1, 2)
+    counts = pairs[:, 0].astype(np.int64)
+    # A pair is taken while fewer than max_size bytes have been produced before it
+    taken = min(pair_count, int(np.searchsorted(np.cumsum(counts), max_size)) + 1) if max_size > 0 else 0
+    result = np.repeat(pairs[:taken, 1], counts[:taken])
+    return result.tobytes(), taken * 2
+
+def load_icons(data):
+    """(NUM_ICONS, 60, 60) popup icons from the start of ALFRED.4"""
+    return np.frombuffer(data, dtype=np.uint8, count=ICON_SIZE * NUM_ICONS).reshape(NUM_ICONS, ICON_HEIGHT, ICON_WIDTH)
+
+def load_balloon_frames(data, buda_offset):
+    """(frames, 112, 247) frames of a balloon set, zero padded, and the decompressed bytes"""
+    decompressed, compressed_size = decompress_rle(data, buda_offset + 4, FRAME_SIZE * 4 + 10000)
+    frames = 4 if len(decompressed) >= FRAME_SIZE * 4 * 0.9 else 2
+
+    pixels = np.zeros(FRAME_SIZE * frames, dtype=np.uint8)
+    actual = np.frombuffer(decompressed, dtype=np.uint8, count=min(len(decompressed), len(pixels)))
+    pixels[:len(actual)] = actual
+    return pixels.reshape(frames, BALLOON_HEIGHT, BALLOON_WIDTH), decompressed, compressed_size
+
+def side_by_side(images):
+    """(n, h, w) images as one (h, n * w) strip"""
+    n, h, w = images.shape
+    return images.transpose(1, 0, 2).reshape(h, n * w)
 
 def extract_alfred4_with_palette(alfred4_path, alfred1_path, output_dir):
     """Extract all graphics with correct palette"""
@@ -78,57 +106,31 @@ def extract_alfred4_with_palette(alfred4_path, alfred1_path, output_dir):
     print()
 
     # ===== POPUP ICONS =====
-    ICON_WIDTH = 60
-    ICON_HEIGHT = 60
-    ICON_SIZE = ICON_WIDTH * ICON_HEIGHT
-    NUM_ICONS = 9
-
     print(f"POPUP ICONS ({ICON_WIDTH}×{ICON_HEIGHT}):")
     print(f"  Offset: 0x000000")
     print(f"  Count: {NUM_ICONS}")
     print()
 
-    icons_data = data[0:ICON_SIZE * NUM_ICONS]
+    icons = load_icons(data)
 
     # Extract individual icons with palette
     for i in range(NUM_ICONS):
-        icon_offset = i * ICON_SIZE
-        icon_data = icons_data[icon_offset:icon_offset + ICON_SIZE]
-
         # Save with color
-        icon_img = Image.new('P', (ICON_WIDTH, ICON_HEIGHT))
+        icon_img = Image.fromarray(icons[i], 'P')
         icon_img.putpalette(palette)
-        icon_img.putdata(icon_data)
 
         icon_file = output_path / f"popup_icon_{i}_color.png"
         icon_img.save(icon_file)
         print(f"  Icon {i}: {icon_file.name}")
 
     # Create strip with all icons
-    strip_width = ICON_WIDTH * NUM_ICONS
-    strip_img = Image.new('P', (strip_width, ICON_HEIGHT))
+    strip_img = Image.fromarray(side_by_side(icons), 'P')
     strip_img.putpalette(palette)
-
-    strip_pixels = []
-    for y in range(ICON_HEIGHT):
-        for icon in range(NUM_ICONS):
-            icon_offset = icon * ICON_SIZE
-            for x in range(ICON_WIDTH):
-                pixel_offset = icon_offset + (y * ICON_WIDTH) + x
-                strip_pixels.append(icons_data[pixel_offset])
-
-    strip_img.putdata(strip_pixels)
     strip_file = output_path / "popup_icons_strip_color.png"
     strip_img.save(strip_file)
     print(f"\n  All icons strip: {strip_file.name}")
 
     # ===== SPEECH BALLOONS =====
-    BALLOON_WIDTH = 247
-    BALLOON_HEIGHT = 112
-    FRAME_SIZE = BALLOON_WIDTH * BALLOON_HEIGHT
-
-    BUDA_OFFSETS = [0x008F2E, 0x00A57A]
-
     print()
     print(f"SPEECH BALLOONS ({BALLOON_WIDTH}×{BALLOON_HEIGHT}):")
     print()
@@ -137,7 +139,8 @@ def extract_alfred4_with_palette(alfred4_path, alfred1_path, output_dir):
         print(f"  Set {buda_idx} (BUDA at 0x{buda_offset:06X}):")
 
         # Decompress
-        decompressed, compressed_size = decompress_rle(data, buda_offset + 4, FRAME_SIZE * 4 + 10000)
+        balloon_frames, decompressed, compressed_size = load_balloon_frames(data, buda_offset)
+        frames = len(balloon_frames)
 
         print(f"    Compressed: {compressed_size} bytes")
         print(f"    Decompressed: {len(decompressed)} bytes")
@@ -147,52 +150,28 @@ def extract_alfred4_with_palette(alfred4_path, alfred1_path, output_dir):
         with open(rle_raw, 'wb') as f:
             f.write(decompressed)
 
-
-        # Determine frames
-        frames = 4 if len(decompressed) >= FRAME_SIZE * 4 * 0.9 else 2
-        # frames = 2
         print(f"    Frames: {frames}")
 
-        actual_data = decompressed[:FRAME_SIZE * frames]
-
         # Save combined preview
-        preview_width = BALLOON_WIDTH * frames
-        combined_img = Image.new('P', (preview_width, BALLOON_HEIGHT))
+        combined_img = Image.fromarray(side_by_side(balloon_frames), 'P')
         combined_img.putpalette(palette)
-
-        combined_pixels = []
-        for y in range(BALLOON_HEIGHT):
-            for f in range(frames):
-                frame_offset = f * FRAME_SIZE
-                for x in range(BALLOON_WIDTH):
-                    pixel_offset = frame_offset + (y * BALLOON_WIDTH) + x
-                    if pixel_offset < len(actual_data):
-                        combined_pixels.append(actual_data[pixel_offset])
-                    else:
-                        combined_pixels.append(0)
-
-        combined_img.putdata(combined_pixels)
         combined_file = output_path / f"speech_balloon_{buda_idx}_4frames_color.png"
         combined_img.save(combined_file)
         print(f"    Combined: {combined_file.name}")
 
         # Extract individual frames
         for f in range(frames):
-            frame_offset = f * FRAME_SIZE
-            frame_data = actual_data[frame_offset:frame_offset + FRAME_SIZE]
-
-            if len(frame_data) < FRAME_SIZE:
+            if len(decompressed) < (f + 1) * FRAME_SIZE:
                 break
 
             # Save raw
             frame_raw = output_path / f"speech_balloon_{buda_idx}_frame{f}.bin"
             with open(frame_raw, 'wb') as file:
-                file.write(frame_data)
+                file.write(balloon_frames[f].tobytes())
 
             # Save with color
-            frame_img = Image.new('P', (BALLOON_WIDTH, BALLOON_HEIGHT))
+            frame_img = Image.fromarray(balloon_frames[f], 'P')
             frame_img.putpalette(palette)
-            frame_img.putdata(frame_data)
 
             frame_file = output_path / f"speech_balloon_{buda_idx}_frame{f}_color.png"
             frame_img.save(frame_file)
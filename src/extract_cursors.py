@@ -14,6 +14,8 @@ import sys
 from pathlib import Path
 from PIL import Image
 
+from palette_catalog import PaletteCatalog
+
 # Cursor data locations (hardcoded in game executable)
 CURSORS = [
     {
@@ -82,35 +84,6 @@ def decompress_rle(data, offset, size):
 
     return bytes(result)
 
-def find_budas(data):
-    """Find all BUDA markers in the file"""
-    budas = []
-    pos = 0
-    while pos < len(data) - 4:
-        if data[pos:pos+4] == b'BUDA':
-            budas.append(pos)
-        pos += 1
-    return budas
-
-def is_valid_palette(data, offset):
-    """Check if data at offset looks like a VGA palette"""
-    if offset + 768 > len(data):
-        return False
-    pal_data = data[offset:offset+768]
-    # VGA palettes use 6-bit values (0-63)
-    return all(b <= 63 for b in pal_data) and len(set(pal_data)) > 10
-
-def extract_palette(data, offset):
-    """Extract VGA palette and convert to 8-bit RGB"""
-    pal_data = data[offset:offset+768]
-    palette = []
-    for i in range(256):
-        r = min(255, pal_data[i * 3] * 4)
-        g = min(255, pal_data[i * 3 + 1] * 4)
-        b = min(255, pal_data[i * 3 + 2] * 4)
-        palette.extend([r, g, b])
-    return palette
-
 def create_grayscale_palette():
     """Create a simple grayscale palette"""
     palette = []
@@ -124,20 +97,6 @@ def extract_cursor(data, offset):
         return None
     return data[offset:offset + CURSOR_SIZE]
 
-def find_nearest_palette(data, budas, cursor_offset):
-    """Find the nearest palette BUDA before cursor offset"""
-    best_palette = None
-    best_distance = float('inf')
-
-    for buda_offset in budas:
-        if buda_offset < cursor_offset and is_valid_palette(data, buda_offset + 4):
-            distance = cursor_offset - buda_offset
-            if distance < best_distance:
-                best_distance = distance
-                best_palette = extract_palette(data, buda_offset + 4)
-
-    return best_palette
-
 def main():
     if len(sys.argv) < 2:
         print("Alfred Pelrock - Enhanced Cursor Extractor")
@@ -178,20 +137,14 @@ def main():
 
     # Find all BUDA markers and palettes
     print("Scanning for BUDA markers and palettes...")
-    budas = find_budas(data)
-    print(f"Found {len(budas)} BUDA markers")
-
-    palette_count = 0
-    for buda in budas:
-        if is_valid_palette(data, buda + 4):
-            palette_count += 1
-    print(f"Found {palette_count} palette BUDAs")
+    catalog = PaletteCatalog(data)
+    print(f"Found {len(catalog.budas)} BUDA markers")
+    print(f"Found {len(catalog)} palette BUDAs")
     print()
 
     # Check if cursor palette exists at known offset
-    cursor_palette = None
-    if is_valid_palette(data, POTENTIAL_PALETTE_OFFSET):
-        cursor_palette = extract_palette(data, POTENTIAL_PALETTE_OFFSET)
+    cursor_palette = catalog.palette_at(POTENTIAL_PALETTE_OFFSET)
+    if cursor_palette is not None:
         print(f"✓ Found palette at 0x{POTENTIAL_PALETTE_OFFSET:06X} (potential cursor palette)")
     else:
         print(f"✗ No valid palette at 0x{POTENTIAL_PALETTE_OFFSET:06X}")
@@ -222,7 +175,7 @@ def main():
         palette_source = "cursor palette"
 
         if palette_to_use is None:
-            palette_to_use = find_nearest_palette(data, budas, cursor['offset'])
+            palette_to_use = catalog.palette_before(cursor['offset'])
             if palette_to_use:
                 palette_source = "nearest BUDA palette"
             else:
@@ -8,40 +8,15 @@ def extract_large_font_char(data, char_index):
     """Extract a single character from the large font data (12x24 pixels)
     Each character is 48 bytes (24 rows × 2 bytes per row)"""
     offset = char_index * 0x30  # 48 bytes per character
-    char_data = data[offset:offset + 0x30]
-
-    # Create 12x24 pixel array
-    pixels = np.zeros((24, 12), dtype=np.uint8)
-
-    # Process each row (2 bytes per row)
-    for row in range(24):
-        byte1 = char_data[row * 2]
-        byte2 = char_data[row * 2 + 1]
-
-        # Process 12 bits (12 pixels) from the two bytes
-        for bit in range(8):
-            pixels[row, bit] = 255 if (byte1 & (0x80 >> bit)) else 0
-        for bit in range(4):
-            pixels[row, bit + 8] = 255 if (byte2 & (0x80 >> bit)) else 0
-
-    return pixels
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=0x30, offset=offset).reshape(24, 2), axis=1)
+    return bits[:, :12] * np.uint8(255)
 
 def extract_small_font_char(data, char_index):
     """Extract a single character from the small font data (8x8 pixels)
     Each character is 8 bytes (8 rows × 1 byte per row)"""
     offset = char_index * 8  # 8 bytes per character
-    char_data = data[offset:offset + 8]
-
-    # Create 8x8 pixel array
-    pixels = np.zeros((8, 8), dtype=np.uint8)
-
-    # Process each row (1 byte per row)
-    for row in range(8):
-        byte = char_data[row]
-        for bit in range(8):
-            pixels[row, bit] = 255 if (byte & (0x80 >> bit)) else 0
-
-    return pixels
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=8, offset=offset).reshape(8, 1), axis=1)
+    return bits * np.uint8(255)
 
 def create_font_image(chars, char_width, char_height, chars_per_row=16):
     """Create a single image containing all characters in a grid"""
@@ -79,11 +54,11 @@ FONT_SPECS = {
     'large': {
         'file': "files/ALFRED.7",
         'offset': 0x7DC8,
-        'size': 0x12C0,     # 96 characters × 48 bytes
+        'size': 0x12C0,     # 100 characters × 48 bytes
         'char_size': 0x30,  # 48 bytes per character (12×24 pixels)
         'width': 12,
         'height': 24,
-        'chars': 96
+        'chars': 100
     },
     'computer': {
         'file': "files/ALFRED.7",
@@ -105,15 +80,11 @@ def extract_font(font_type):
             data = f.read()
 
         font_data = data[spec['offset']:spec['offset'] + spec['size']]
-        chars = []
-
-        # Extract each character
-        for i in range(spec['chars']):
-            if font_type == 'large':
-                char = extract_large_font_char(font_data, i)
-            else:
-                char = extract_small_font_char(font_data, i)
-            chars.append(char)
+        row_bytes = spec['char_size'] // spec['height']
+        glyphs = np.unpackbits(
+            np.frombuffer(font_data, dtype=np.uint8, count=spec['chars'] * spec['char_size'])
+            .reshape(spec['chars'], spec['height'], row_bytes), axis=-1)
+        chars = list(glyphs[:, :, :spec['width']] * np.uint8(255))
 
         return font_data, chars
 
@@ -13,6 +13,8 @@ import sys
 from pathlib import Path
 from PIL import Image
 
+from palette_catalog import PaletteCatalog
+
 # Balloon/icon data
 BALLOON_OFFSET = 0xFE945
 BALLOON_SIZE = 0x129E  # 4,766 bytes compressed
@@ -33,48 +35,6 @@ def decompress_rle(data, offset, size):
 
     return bytes(result)
 
-def find_budas(data):
-    """Find BUDA markers"""
-    budas = []
-    pos = 0
-    while pos < len(data) - 4:
-        if data[pos:pos+4] == b'BUDA':
-            budas.append(pos)
-        pos += 1
-    return budas
-
-def is_valid_palette(data, offset):
-    """Check for VGA palette"""
-    if offset + 768 > len(data):
-        return False
-    pal_data = data[offset:offset+768]
-    return all(b <= 63 for b in pal_data) and len(set(pal_data)) > 10
-
-def extract_palette(data, offset):
-    """Extract VGA palette"""
-    pal_data = data[offset:offset+768]
-    palette = []
-    for i in range(256):
-        r = min(255, pal_data[i * 3] * 4)
-        g = min(255, pal_data[i * 3 + 1] * 4)
-        b = min(255, pal_data[i * 3 + 2] * 4)
-        palette.extend([r, g, b])
-    return palette
-
-def find_nearest_palette(data, budas, target_offset):
-    """Find nearest palette"""
-    best_palette = None
-    best_distance = float('inf')
-
-    for buda in budas:
-        if is_valid_palette(data, buda + 4):
-            distance = abs(buda - target_offset)
-            if distance < best_distance:
-                best_distance = distance
-                best_palette = extract_palette(data, buda + 4)
-
-    return best_palette
-
 def main():
     if len(sys.argv) < 2:
         print("Alfred Pelrock - Balloon & Action Icon Extractor")
@@ -112,8 +72,7 @@ def main():
 
     # Find palette
     print("Finding palette...")
-    budas = find_budas(data)
-    palette = find_nearest_palette(data, budas, BALLOON_OFFSET)
+    palette = PaletteCatalog(data).nearest_palette(BALLOON_OFFSET)
 
     if not palette:
         print("Warning: No palette found, using grayscale")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Pre-Rasterized Font Atlases
+
+Decodes the game's two bitmap fonts once with np.unpackbits into boolean
+(256, height, width) atlases indexed by character code, and renders whole
+strings by indexing the atlas with the string's codes:
+
+    atlas = load_atlas('large')
+    img = atlas.render_text("Hello world", fg=(255, 255, 255), scale=3)
+
+Font data (FONT_SPECS in extract_large_font.py):
+  small  8x8,   256 chars, 1 byte/row  ALFRED.4 at 0x8F32
+  large  12x24, 100 chars (32-131), 2 bytes/row, top 12 bits used,
+         ALFRED.7 at 0x7DC8 (the same 0x12C0 bytes as LETRAS.BIN)
+
+Bit 7 of a row byte is the leftmost pixel. The large font's last four
+glyphs (128-131) are n-tilde, N-tilde and the inverted ! and ?. Codes
+without a glyph (large font outside 32-131) render blank.
+
+Atlases are cached in memory and in .font_atlas_cache/ by a hash of the
+font bytes.
+
+Usage:
+    python3 font_atlas.py <small|large> "text" [output.png] [font_file]
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+FONTS = {
+    'small': {
+        'file': 'files/ALFRED.4',
+        'offset': 0x8F32,
+        'width': 8,
+        'height': 8,
+        'row_bytes': 1,
+        'chars': 256,
+        'first_char': 0,
+    },
+    'large': {
+        'file': 'files/ALFRED.7',
+        'offset': 0x7DC8,
+        'width': 12,
+        'height': 24,
+        'row_bytes': 2,
+        'chars': 100,
+        'first_char': 32,
+    },
+}
+FONT_ATLAS_CACHE_DIR = Path(os.environ.get(
+    'ALFRED_FONT_ATLAS_CACHE', Path(__file__).resolve().parent / '.font_atlas_cache'))
+
+Color = Union[int, Tuple[int, int, int]]
+Text = Union[str, bytes, Sequence[int]]
+
+
+def font_size(spec) -> int:
+    return spec['chars'] * spec['height'] * spec['row_bytes']
+
+
+def read_font(name, path=None) -> bytes:
+    """Raw glyph bytes of a font; LETRAS.BIN-style files hold only the font"""
+    spec = FONTS[name]
+    path = Path(path if path is not None else spec['file'])
+    size = font_size(spec)
+    data = path.read_bytes()
+    offset = 0 if len(data) == size else spec['offset']
+    font_data = data[offset:offset + size]
+    if len(font_data) != size:
+        raise ValueError(f"{path}: expected {size} bytes of {name} font at 0x{offset:X}, got {len(font_data)}")
+    return font_data
+
+
+def decode_glyphs(font_data, spec) -> np.ndarray:
+    """(chars, height, width) bool glyphs of raw font bytes"""
+    raw = np.frombuffer(font_data, dtype=np.uint8, count=font_size(spec))
+    bits = np.unpackbits(raw.reshape(spec['chars'], spec['height'], spec['row_bytes']), axis=-1)
+    return bits[:, :, :spec['width']].astype(bool)
+
+
+def build_atlas(font_data, spec) -> np.ndarray:
+    """(256, height, width) atlas indexed by character code"""
+    atlas = np.zeros((256, spec['height'], spec['width']), dtype=bool)
+    first = spec['first_char']
+    atlas[first:first + spec['chars']] = decode_glyphs(font_data, spec)
+    return atlas
+
+
+def encode(text: Text) -> np.ndarray:
+    """Character codes of a string (latin-1, '?' for anything else) or of raw bytes"""
+    if isinstance(text, str):
+        text = text.encode('latin-1', errors='replace')
+    return np.frombuffer(bytes(text), dtype=np.uint8)
+
+
+def colorize(mask: np.ndarray, fg: Color, bg: Color) -> np.ndarray:
+    """Index image for int colours, (..., 3) RGB image for tuples"""
+    if np.ndim(fg) == 0 and np.ndim(bg) == 0:
+        return np.where(mask, np.uint8(fg), np.uint8(bg))
+    fg = np.broadcast_to(np.asarray(fg, dtype=np.uint8), (3,))
+    bg = np.broadcast_to(np.asarray(bg, dtype=np.uint8), (3,))
+    return np.where(mask[..., None], fg, bg)
+
+
+def upscale(pixels: np.ndarray, scale: int) -> np.ndarray:
+    if scale == 1:
+        return pixels
+    return pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+
+
+class FontAtlas:
+    """Boolean glyph atlas of one font"""
+
+    def __init__(self, name, atlas: np.ndarray):
+        self.name = name
+        self.atlas = atlas
+        self.height, self.width = atlas.shape[1:]
+
+    def glyph(self, code) -> np.ndarray:
+        return self.atlas[code]
+
+    def mask(self, text: Text, spacing=0) -> np.ndarray:
+        """(height, n * (width + spacing)) bool mask of a string"""
+        glyphs = self.atlas[encode(text)]
+        if spacing:
+            glyphs = np.pad(glyphs, ((0, 0), (0, 0), (0, spacing)))
+        n, h, w = glyphs.shape
+        return glyphs.transpose(1, 0, 2).reshape(h, n * w)
+
+    def mask_lines(self, lines: Sequence[Text], spacing=0) -> np.ndarray:
+        """(lines * height, longest * (width + spacing)) mask, one gather for all lines"""
+        codes = [encode(line) for line in lines]
+        longest = max((len(c) for c in codes), default=0)
+        table = np.full((len(codes), longest), ord(' '), dtype=np.uint8)
+        for i, c in enumerate(codes):
+            table[i, :len(c)] = c
+
+        glyphs = self.atlas[table]
+        if spacing:
+            glyphs = np.pad(glyphs, ((0, 0), (0, 0), (0, 0), (0, spacing)))
+        rows, n, h, w = glyphs.shape
+        return glyphs.transpose(0, 2, 1, 3).reshape(rows * h, n * w)
+
+    def render_text(self, text: Text, fg: Color = (255, 255, 255), bg: Color = (0, 0, 0),
+                    scale=1, spacing=1) -> np.ndarray:
+        """String as an index (int colours) or RGB (tuple colours) array"""
+        return upscale(colorize(self.mask(text, spacing), fg, bg), scale)
+
+    def render_lines(self, lines: Sequence[Text], fg: Color = (255, 255, 255), bg: Color = (0, 0, 0),
+                     scale=1, spacing=1) -> np.ndarray:
+        """Strings stacked top to bottom, left aligned, as one array"""
+        return upscale(colorize(self.mask_lines(lines, spacing), fg, bg), scale)
+
+
+_memory_cache: Dict[str, FontAtlas] = {}
+
+
+def atlas_from_bytes(name, font_data, cache_dir: Optional[Path] = FONT_ATLAS_CACHE_DIR) -> FontAtlas:
+    """Atlas for raw font bytes, from memory, the disk cache, or decoded and cached"""
+    spec = FONTS[name]
+    key = f"{name}-{hashlib.sha1(bytes(font_data[:font_size(spec)])).hexdigest()}"
+    atlas = _memory_cache.get(key)
+    if atlas is not None:
+        return atlas
+
+    glyphs = None
+    shape = (256, spec['height'], spec['width'])
+    path = Path(cache_dir) / f"{key}.npy" if cache_dir is not None else None
+    if path is not None and path.exists():
+        try:
+            glyphs = np.load(path, allow_pickle=False)
+            if glyphs.shape != shape or glyphs.dtype != bool:
+                glyphs = None
+        except (OSError, ValueError):
+            glyphs = None
+
+    if glyphs is None:
+        glyphs = build_atlas(font_data, spec)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, glyphs)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+    atlas = FontAtlas(name, glyphs)
+    _memory_cache[key] = atlas
+    return atlas
+
+
+def load_atlas(name, path=None, cache_dir: Optional[Path] = FONT_ATLAS_CACHE_DIR) -> FontAtlas:
+    """Atlas of a font read from its game file (or a LETRAS.BIN-style dump)"""
+    return atlas_from_bytes(name, read_font(name, path), cache_dir)
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in FONTS:
+        print(__doc__)
+        sys.exit(1)
+
+    from PIL import Image
+
+    name, text = sys.argv[1], sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) > 3 else f"rendered_{name}.png"
+    atlas = load_atlas(name, sys.argv[4] if len(sys.argv) > 4 else None)
+    pixels = atlas.render_text(text, scale=3)
+    Image.fromarray(pixels, 'RGB').save(output)
+    print(f"{name} font {atlas.width}x{atlas.height}: \"{text}\" -> {output} "
+          f"({pixels.shape[1]}x{pixels.shape[0]})")
+
+
+if __name__ == '__main__':
+    main()
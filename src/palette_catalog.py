@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - BUDA Palette Catalog
+
+Finds every VGA palette that follows a BUDA marker in one NumPy pass and
+answers "nearest palette before/after offset X" with bisect, so extractors
+no longer re-validate and re-extract the same palettes per target.
+
+A palette candidate is the 768 bytes after a BUDA marker; it is valid when
+every component is 6-bit (<= 63) and it has more than 10 distinct values.
+Palettes are keyed by the offset of their BUDA marker, and decoded 8-bit
+palettes (component * 4, as extract_palette() did) are cached by offset.
+
+Usage:
+    python3 palette_catalog.py <file> [offset]
+"""
+
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PALETTE_SIZE = 768
+MIN_DISTINCT_VALUES = 10
+
+
+def find_budas(data) -> List[int]:
+    """Offsets of all BUDA markers"""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    if len(arr) < 5:
+        return []
+    hits = ((arr[:-4] == ord('B')) & (arr[1:-3] == ord('U')) &
+            (arr[2:-2] == ord('D')) & (arr[3:-1] == ord('A')))
+    return np.flatnonzero(hits).tolist()
+
+
+def valid_palette_mask(data, offsets) -> np.ndarray:
+    """Which of the offsets start a valid 6-bit palette, all in one pass"""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    mask = offsets + PALETTE_SIZE <= len(arr)
+    if not mask.any():
+        return mask
+
+    windows = arr[offsets[mask, None] + np.arange(PALETTE_SIZE)]
+    six_bit = windows.max(axis=1) <= 63
+    ordered = np.sort(windows, axis=1)
+    distinct = (np.diff(ordered, axis=1) != 0).sum(axis=1) + 1
+    mask[mask] = six_bit & (distinct > MIN_DISTINCT_VALUES)
+    return mask
+
+
+def is_valid_palette(data, offset):
+    return bool(valid_palette_mask(data, [offset])[0])
+
+
+def extract_palette(data, offset) -> List[int]:
+    """768-byte VGA palette at offset as an 8-bit RGB list"""
+    pal_data = np.frombuffer(data, dtype=np.uint8, count=PALETTE_SIZE, offset=offset)
+    return np.minimum(pal_data.astype(np.int32) * 4, 255).tolist()
+
+
+class PaletteCatalog:
+    """Palettes following the BUDA markers of one file"""
+
+    def __init__(self, data, budas: Optional[List[int]] = None):
+        self.data = data
+        self.budas = find_budas(data) if budas is None else list(budas)
+        mask = valid_palette_mask(data, np.asarray(self.budas, dtype=np.int64) + 4)
+        self.palette_budas = [b for b, valid in zip(self.budas, mask) if valid]
+        self._palette_set = set(self.palette_budas)
+        self._palettes: Dict[int, List[int]] = {}
+        self._valid_at: Dict[int, bool] = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return len(self.palette_budas)
+
+    def is_palette(self, buda_offset):
+        return buda_offset in self._palette_set
+
+    def palette(self, buda_offset) -> List[int]:
+        """8-bit palette after the BUDA marker at buda_offset"""
+        palette = self._palettes.get(buda_offset)
+        if palette is None:
+            palette = extract_palette(self.data, buda_offset + 4)
+            self._palettes[buda_offset] = palette
+        return palette
+
+    def palette_at(self, offset) -> Optional[List[int]]:
+        """8-bit palette at an arbitrary data offset, None if not valid there"""
+        valid = self._valid_at.get(offset)
+        if valid is None:
+            valid = self._valid_at[offset] = is_valid_palette(self.data, offset)
+        return self.palette(offset - 4) if valid else None
+
+    # -------------------------------------------------------------------------
+    # Lookups by BUDA offset
+    # -------------------------------------------------------------------------
+
+    def before(self, offset) -> Optional[int]:
+        """Last palette BUDA strictly before offset"""
+        i = bisect_left(self.palette_budas, offset)
+        return self.palette_budas[i - 1] if i > 0 else None
+
+    def after(self, offset) -> Optional[int]:
+        """First palette BUDA strictly after offset"""
+        i = bisect_right(self.palette_budas, offset)
+        return self.palette_budas[i] if i < len(self.palette_budas) else None
+
+    def nearest(self, offset) -> Optional[int]:
+        """Closest palette BUDA in either direction (the earlier one on ties)"""
+        i = bisect_left(self.palette_budas, offset)
+        candidates = self.palette_budas[max(i - 1, 0):i + 1]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: abs(b - offset))
+
+    def palette_before(self, offset) -> Optional[List[int]]:
+        buda = self.before(offset)
+        return self.palette(buda) if buda is not None else None
+
+    def palette_after(self, offset) -> Optional[List[int]]:
+        buda = self.after(offset)
+        return self.palette(buda) if buda is not None else None
+
+    def nearest_palette(self, offset) -> Optional[List[int]]:
+        buda = self.nearest(offset)
+        return self.palette(buda) if buda is not None else None
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    catalog = PaletteCatalog.from_file(sys.argv[1])
+    print(f"{sys.argv[1]}: {len(catalog.budas)} BUDAs, {len(catalog)} palettes")
+
+    if len(sys.argv) > 2:
+        offset = int(sys.argv[2], 0)
+        for name, buda in (('before', catalog.before(offset)), ('after', catalog.after(offset)),
+                           ('nearest', catalog.nearest(offset))):
+            where = f"BUDA at 0x{buda:06X}" if buda is not None else "none"
+            print(f"  {name:8s} 0x{offset:06X}: {where}")
+    else:
+        for buda in catalog.palette_budas:
+            print(f"  BUDA at 0x{buda:06X} (#{catalog.budas.index(buda)})")
+
+
+if __name__ == '__main__':
+    main()
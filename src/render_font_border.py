@@ -1,219 +1,205 @@
 #!/usr/bin/env python3
 """
-Alfred Pelrock Font Renderer - CORRECTED
-Applies the game's border rendering algorithm to render text with pink color and black borders
-
-THE FIX: The original script was missing edge borders because the border algorithm
-needs to check pixels OUTSIDE the character bounds. Solution: add 1 pixel padding
-on all sides to accommodate border pixels that fall outside the original 12×24 character.
+Alfred Pelrock Font Renderer - Bordered Text
+
+Applies the game's border rendering algorithm to render text with pink color
+and black borders, straight from the large font's glyph atlas (font_atlas.py).
+
+Algorithm (per character cell, as the game draws it):
+1. Each 12×24 glyph sits in a 14×26 cell, 1 pixel in from every side, so
+   borders can extend outside the original character bounds
+2. Every empty pixel in the 3×3 neighborhood of a glyph pixel is border
+3. Borders are drawn in black, glyph pixels in pink on top
+
+Whole lines are rendered at once: the glyphs are laid out 14 pixels apart
+with a 1 pixel margin, and the border is one binary dilation of the line's
+glyph mask (shifted ORs over its 3×3 neighborhood) minus the glyph pixels. Cells are 2
+pixels apart, so no border reaches into a neighboring cell and the result
+matches bordering each character on its own.
+
+Colors are palette indices (ints) or RGB tuples. Hotspot descriptions come
+from Pair 12 of ALFRED.1 (FF [ITEM_ID] 08 0D [INDEX] 00 [TEXT...] FD) and
+are rendered as raw game bytes, so accented letters use the font's own
+glyphs (0x7B-0x7F, 0x80-0x83).
+
+Usage:
+    python3 render_font_border.py [text] [output.png]
+    python3 render_font_border.py --hotspots <ALFRED.1> [output_dir]
 """
 
-from PIL import Image
+import struct
 import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
 
-def load_font(font_path):
-    """Load the bitmap font image"""
-    return Image.open(font_path).convert('RGB')
+import numpy as np
+from PIL import Image
 
-def extract_character(font_img, char):
-    """
-    Extract a character from the font bitmap
+from font_atlas import Color, FontAtlas, Text, load_atlas
 
-    Font layout (from the image):
-    Row 0: !"#$%&'()*+,-./
-    Row 1: 0123456789:;<=>?
-    Row 2: @ABCDEFGHIJKLMNO
-    Row 3: PQRSTUVWXYZ[¿]^_
-    Row 4: `abcdefghijklmno
-    Row 5: pqrstuvwxyz{¡}~
+CELL_PADDING = 1  # pixels around each glyph: 12×24 becomes 14×26
+
+# Game colors: description text is palette index 13, borders index 0
+PINK_INDEX = 13
+BORDER_INDEX = 0
+TRANSPARENT_INDEX = 0xFF
+
+PINK = (255, 105, 180)  # Hot pink (matches game palette index 13)
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+ALFRED1_PATH = 'files/ALFRED.1'
+NUM_ROOMS = 55
+ROOM_STRUCT_SIZE = 104
+DESCRIPTION_PAIR = 12
 
-    Each character is 12 pixels wide × 24 pixels tall
-    """
-    char_width = 12
-    char_height = 24
-
-    # Map character to position
-    char_map = {
-        # Row 0
-        '!': (0, 0), '"': (1, 0), '#': (2, 0), '$': (3, 0), '%': (4, 0),
-        '&': (5, 0), "'": (6, 0), '(': (7, 0), ')': (8, 0), '*': (9, 0),
-        '+': (10, 0), ',': (11, 0), '-': (12, 0), '.': (13, 0), '/': (14, 0),
-
-        # Row 1
-        '0': (0, 1), '1': (1, 1), '2': (2, 1), '3': (3, 1), '4': (4, 1),
-        '5': (5, 1), '6': (6, 1), '7': (7, 1), '8': (8, 1), '9': (9, 1),
-        ':': (10, 1), ';': (11, 1), '<': (12, 1), '=': (13, 1), '>': (14, 1), '?': (15, 1),
-
-        # Row 2
-        '@': (0, 2), 'A': (1, 2), 'B': (2, 2), 'C': (3, 2), 'D': (4, 2),
-        'E': (5, 2), 'F': (6, 2), 'G': (7, 2), 'H': (8, 2), 'I': (9, 2),
-        'J': (10, 2), 'K': (11, 2), 'L': (12, 2), 'M': (13, 2), 'N': (14, 2), 'O': (15, 2),
-
-        # Row 3
-        'P': (0, 3), 'Q': (1, 3), 'R': (2, 3), 'S': (3, 3), 'T': (4, 3),
-        'U': (5, 3), 'V': (6, 3), 'W': (7, 3), 'X': (8, 3), 'Y': (9, 3),
-        'Z': (10, 3), '[': (11, 3), '¿': (12, 3), ']': (13, 3), '^': (14, 3), '_': (15, 3),
-
-        # Row 4
-        '`': (0, 4), 'a': (1, 4), 'b': (2, 4), 'c': (3, 4), 'd': (4, 4),
-        'e': (5, 4), 'f': (6, 4), 'g': (7, 4), 'h': (8, 4), 'i': (9, 4),
-        'j': (10, 4), 'k': (11, 4), 'l': (12, 4), 'm': (13, 4), 'n': (14, 4), 'o': (15, 4),
-
-        # Row 5
-        'p': (0, 5), 'q': (1, 5), 'r': (2, 5), 's': (3, 5), 't': (4, 5),
-        'u': (5, 5), 'v': (6, 5), 'w': (7, 5), 'x': (8, 5), 'y': (9, 5),
-        'z': (10, 5), '{': (11, 5), '¡': (12, 5), '}': (13, 5), '~': (14, 5),
-
-        # Space
-        ' ': None  # Space is just blank
-    }
-
-    if char not in char_map:
-        char = char.upper()  # Try uppercase
-        if char not in char_map:
-            return None
-
-    pos = char_map[char]
-    if pos is None:  # Space character
-        return Image.new('RGB', (char_width, char_height), (0, 0, 0))
-
-    col, row = pos
-    x = col * char_width
-    y = row * char_height
-
-    # Extract the character
-    char_img = font_img.crop((x, y, x + char_width, y + char_height))
-    return char_img
-
-def apply_border_algorithm(char_img, text_color=(255, 0, 255), border_color=(0, 0, 0)):
-    """
-    Apply the Alfred Pelrock border rendering algorithm
 
-    THE FIX: Add 1 pixel padding on all sides so borders can extend outside
-    the original character bounds.
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """3×3 binary dilation over the last two axes (pixels outside count as empty).
 
-    Algorithm:
-    1. Expand canvas by 2 pixels (1 on each side) - 12×24 becomes 14×26
-    2. Place character in center of padded canvas
-    3. For each character pixel, mark 3×3 area around it for borders
-    4. Draw borders only in empty (non-character) pixels
-    5. Draw character pixels on top
+    The square neighborhood is separable: a 3-wide OR along rows, then a
+    3-tall OR along columns, four shifted ORs instead of nine.
     """
-    orig_width, orig_height = char_img.size
-
-    # Add padding: +1 pixel on each side
-    width = orig_width + 2
-    height = orig_height + 2
-
-    # Convert character to bitmask
-    pixels = char_img.load()
-    mask = [[False for _ in range(width)] for _ in range(height)]
-
-    # Place character in center of padded canvas (offset by 1)
-    for y in range(orig_height):
-        for x in range(orig_width):
-            r, g, b = pixels[x, y]
-            # White or light pixels are part of character
-            mask[y + 1][x + 1] = (r + g + b) > 128 * 3
-
-    # Create output image with white background
-    output = Image.new('RGB', (width, height), (255, 255, 255))
-    out_pixels = output.load()
-
-    # Step 1: Mark border pixels
-    # For each character pixel, mark a 3×3 area around it for border
-    border_mask = [[False for _ in range(width)] for _ in range(height)]
-
-    for y in range(height):
-        for x in range(width):
-            if mask[y][x]:  # If this is a character pixel
-                # Mark 3×3 area around it for border
-                for dy in range(-1, 2):  # -1, 0, 1
-                    for dx in range(-1, 2):  # -1, 0, 1
-                        ny, nx = y + dy, x + dx
-                        if 0 <= ny < height and 0 <= nx < width:
-                            if not mask[ny][nx]:  # Only mark empty pixels
-                                border_mask[ny][nx] = True
-
-    # Step 2: Draw the borders (black)
-    for y in range(height):
-        for x in range(width):
-            if border_mask[y][x]:
-                out_pixels[x, y] = border_color
-
-    # Step 3: Draw the character pixels (pink/text color) on top of borders
-    for y in range(height):
-        for x in range(width):
-            if mask[y][x]:
-                out_pixels[x, y] = text_color
-
-    return output
-
-def render_text(font_img, text, text_color=(255, 105, 180), border_color=(0, 0, 0)):
+    rows = mask.copy()
+    rows[..., 1:] |= mask[..., :-1]
+    rows[..., :-1] |= mask[..., 1:]
+    out = rows.copy()
+    out[..., 1:, :] |= rows[..., :-1, :]
+    out[..., :-1, :] |= rows[..., 1:, :]
+    return out
+
+
+def text_layers(atlas: FontAtlas, lines: Sequence[Text]) -> Tuple[np.ndarray, np.ndarray]:
+    """(glyph, border) masks of shape (lines, height + 2, longest * cell + 1)"""
+    spacing = 2 * CELL_PADDING
+    mask = atlas.mask_lines(lines, spacing=spacing)
+    mask = mask.reshape(len(lines), atlas.height, -1)
+    # Shift right by the padding so each glyph starts 1 pixel into its cell
+    glyphs = np.pad(mask, ((0, 0), (CELL_PADDING, CELL_PADDING), (CELL_PADDING, 0)))
+    border = dilate(glyphs) & ~glyphs
+    return glyphs, border
+
+
+def compose(glyphs: np.ndarray, border: np.ndarray, text_color: Color, border_color: Color,
+            background: Color) -> np.ndarray:
+    """Index image for int colors, (..., 3) RGB image for tuples"""
+    colors = (text_color, border_color, background)
+    if all(np.ndim(c) == 0 for c in colors):
+        return np.select([glyphs, border], [np.uint8(text_color), np.uint8(border_color)],
+                         np.uint8(background)).astype(np.uint8)
+    text_rgb, border_rgb, background_rgb = (
+        np.broadcast_to(np.asarray(c, dtype=np.uint8), (3,)) for c in colors)
+    return np.select([glyphs[..., None], border[..., None]], [text_rgb, border_rgb],
+                     background_rgb).astype(np.uint8)
+
+
+def render_lines(atlas: FontAtlas, lines: Sequence[Text], text_color: Color = PINK,
+                 border_color: Color = BLACK, background: Color = WHITE) -> List[np.ndarray]:
+    """Bordered images of many lines in one pass, each cropped to its own length"""
+    if not lines:
+        return []
+    glyphs, border = text_layers(atlas, lines)
+    images = compose(glyphs, border, text_color, border_color, background)
+    cell = atlas.width + 2 * CELL_PADDING
+    lengths = [len(line.encode('latin-1', errors='replace') if isinstance(line, str) else line)
+               for line in lines]
+    return [image[:, :n * cell] for image, n in zip(images, lengths)]
+
+
+def render_text(atlas: FontAtlas, text: Text, text_color: Color = PINK, border_color: Color = BLACK,
+                background: Color = WHITE) -> np.ndarray:
     """
     Render text using the font and border algorithm
     Pink color: (255, 105, 180) - hot pink (matches game palette)
     """
-    char_width = 12
-    char_height = 24
+    return render_lines(atlas, [text], text_color, border_color, background)[0]
+
+
+# =============================================================================
+# HOTSPOT DESCRIPTIONS
+# =============================================================================
+
+def read_room_pair(data, room_num, pair_num):
+    """Read a specific pair from a room"""
+    pair_offset_pos = room_num * ROOM_STRUCT_SIZE + pair_num * 8
+    offset, size = struct.unpack_from('<II', data, pair_offset_pos)
+    if size == 0 or offset >= len(data):
+        return None
+    return data[offset:offset + size]
+
+
+def extract_descriptions(pair12) -> List[bytes]:
+    """Raw text of each FF ... FD description, control bytes removed"""
+    descriptions = []
+    pos = 0
+    while pos < len(pair12):
+        if pair12[pos] != 0xFF:
+            pos += 1
+            continue
+        start = pos + 5  # FF, item id, 08, 0D, index
+        end = pair12.find(b'\xFD', start)
+        if end < 0:
+            end = len(pair12)
+        descriptions.append(bytes(b for b in pair12[start:end] if b >= 0x20))
+        pos = end + 1
+    return descriptions
+
+
+def hotspot_descriptions(alfred1_path=ALFRED1_PATH) -> Dict[Tuple[int, int], bytes]:
+    """(room, description index) -> raw description text, for every room"""
+    data = Path(alfred1_path).read_bytes()
+    descriptions = {}
+    for room in range(NUM_ROOMS):
+        pair12 = read_room_pair(data, room, DESCRIPTION_PAIR)
+        if pair12 is None:
+            continue
+        for i, text in enumerate(extract_descriptions(pair12)):
+            descriptions[(room, i)] = text
+    return descriptions
+
+
+def render_hotspot_descriptions(atlas: FontAtlas, alfred1_path=ALFRED1_PATH, text_color: Color = PINK_INDEX,
+                                border_color: Color = BORDER_INDEX,
+                                background: Color = TRANSPARENT_INDEX) -> Dict[Tuple[int, int], np.ndarray]:
+    """Bordered images of every hotspot description in the game, in one batch"""
+    descriptions = hotspot_descriptions(alfred1_path)
+    images = render_lines(atlas, list(descriptions.values()), text_color, border_color, background)
+    return dict(zip(descriptions.keys(), images))
 
-    # With padding, each character is 14×26
-    padded_char_width = char_width + 2
-    padded_char_height = char_height + 2
-
-    # Calculate output size
-    output_width = len(text) * padded_char_width
-    output_height = padded_char_height
-
-    # Create output image with white background
-    output = Image.new('RGB', (output_width, output_height), (255, 255, 255))
-
-    # Render each character
-    for i, char in enumerate(text):
-        char_img = extract_character(font_img, char)
-        if char_img:
-            # Apply border algorithm
-            rendered_char = apply_border_algorithm(char_img, text_color, border_color)
-
-            # Paste into output
-            x_pos = i * padded_char_width
-            output.paste(rendered_char, (x_pos, 0))
-
-    return output
 
 def main():
-    font_path = '/mnt/user-data/uploads/large_font.png'
+    atlas = load_atlas('large')
 
-    # Load font
-    print("Loading font...")
-    font_img = load_font(font_path)
+    if len(sys.argv) > 1 and sys.argv[1] == '--hotspots':
+        alfred1_path = sys.argv[2] if len(sys.argv) > 2 else ALFRED1_PATH
+        output_dir = Path(sys.argv[3] if len(sys.argv) > 3 else 'hotspot_descriptions')
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Render "Hello world" with pink text and black borders
-    text = "Hello world"
-    print(f"Rendering '{text}'...")
-
-    # Use pink color (matches game's palette index 13)
-    pink = (255, 105, 180)  # Hot pink
-    black = (0, 0, 0)
+        images = render_hotspot_descriptions(atlas, alfred1_path, PINK, BLACK, WHITE)
+        for (room, i), pixels in images.items():
+            Image.fromarray(pixels, 'RGB').save(output_dir / f"room{room:02d}_desc{i:02d}.png")
+        print(f"✓ {len(images)} descriptions rendered to {output_dir}/")
+        return
 
-    output = render_text(font_img, text, pink, black)
+    text = sys.argv[1] if len(sys.argv) > 1 else "Hello world"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else 'hello_world_rendered.png'
+    print(f"Rendering '{text}'...")
 
-    # Save output
-    output_path = '/mnt/user-data/outputs/hello_world_rendered.png'
+    output = Image.fromarray(render_text(atlas, text), 'RGB')
     output.save(output_path)
     print(f"Saved to: {output_path}")
 
     # Also create a larger version for better visibility
     scale = 3
     large_output = output.resize((output.width * scale, output.height * scale), Image.NEAREST)
-    large_output_path = '/mnt/user-data/outputs/hello_world_rendered_3x.png'
+    large_output_path = str(Path(output_path).with_name(f"{Path(output_path).stem}_3x.png"))
     large_output.save(large_output_path)
     print(f"Saved 3x version to: {large_output_path}")
 
-    print("\n✓ Done! Borders now appear on all edges including left/right.")
-    print(f"Image size: {output.width}×{output.height}")
+    print(f"\nImage size: {output.width}×{output.height}")
     print(f"Text: '{text}' ({len(text)} characters)")
     print(f"Character size with borders: 14×26 pixels (12×24 + padding)")
 
+
 if __name__ == "__main__":
     main()
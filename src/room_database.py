@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Columnar Room Database
+=======================================
+
+Parses the fixed-size records of every room's Pair 10 in bulk with
+np.frombuffer and concatenates them across all rooms into columnar tables
+(one structured array per record type, each with a `room` column), saved
+as a single .npz file.
+
+Cross-room questions become array filters instead of re-parsing 56 rooms:
+
+    db = load_database('room_db.npz')
+    s = db['sprites']
+    s[(s['action_flags'] & ACTION_TALK != 0) & (s['z_depth'] < 5)]
+
+Record layouts in Pair 10 (see extract_room_data.py, sprite_analyzer.py):
+
+  Hotspots   count @ 0x47A, array @ 0x47C, 9 bytes
+    [type:u8][x:u16][y:u16][width:u8][height:u8][extra:u16]
+  Walkboxes  count @ 0x213, array @ 0x218, 9 bytes
+    [x:u16][y:u16][width:u16][height:u16][flags:u8]
+  Exits      count @ 0x1BE, array @ 0x1BF, 14 bytes
+    [dest_room:u16][flags:u8][trigger x,y:u16][trigger w,h:u8]
+    [dest x,y:u16][direction:u8]
+  Sprites    count @ 0x05 (minus 2), array @ 0x62 (98), 44 bytes
+    File layout from sprite_analyzer.py. Sprites are numbered from 2 as in
+    the game (alfred2_mapper.py), so `index` starts at 2. File 0x17
+    (z_depth) is runtime +0x21; 0xFF means hidden.
+
+Usage:
+    python3 room_database.py <alfred.1> [room_db.npz]
+"""
+
+import struct
+import sys
+from typing import Dict
+
+import numpy as np
+
+NUM_ROOMS = 56
+
+HOTSPOT_DTYPE = np.dtype([
+    ('type', 'u1'),
+    ('x', '<u2'),
+    ('y', '<u2'),
+    ('width', 'u1'),
+    ('height', 'u1'),
+    ('extra', '<u2'),
+])
+
+WALKBOX_DTYPE = np.dtype([
+    ('x', '<u2'),
+    ('y', '<u2'),
+    ('width', '<u2'),
+    ('height', '<u2'),
+    ('flags', 'u1'),
+])
+
+EXIT_DTYPE = np.dtype([
+    ('destination_room', '<u2'),
+    ('flags', 'u1'),
+    ('trigger_x', '<u2'),
+    ('trigger_y', '<u2'),
+    ('trigger_width', 'u1'),
+    ('trigger_height', 'u1'),
+    ('dest_x', '<u2'),
+    ('dest_y', '<u2'),
+    ('dest_direction', 'u1'),
+])
+
+SPRITE_DTYPE = np.dtype([
+    ('x', '<i2'),
+    ('y', '<i2'),
+    ('width', 'u1'),
+    ('height', 'u1'),
+    ('stride', '<u2'),
+    ('num_sequences', 'u1'),
+    ('current_sequence', 'u1'),
+    ('frames_per_seq', 'u1', (4,)),
+    ('loop_counts', 'u1', (4,)),
+    ('frame_periods', 'u1', (4,)),
+    ('unknown_16', 'u1'),
+    ('z_depth', 'u1'),
+    ('movement_flags', '<u2', (4,)),
+    ('current_frame', 'u1'),
+    ('sprite_type', 'u1'),
+    ('action_flags', 'u1'),
+    ('unknown_23', 'u1', (3,)),
+    ('is_hotspot', 'u1'),
+    ('reserved', 'u1', (5,)),
+])
+
+assert HOTSPOT_DTYPE.itemsize == 9
+assert WALKBOX_DTYPE.itemsize == 9
+assert EXIT_DTYPE.itemsize == 14
+assert SPRITE_DTYPE.itemsize == 44
+
+# (count offset, array offset, dtype, count adjustment, first index)
+RECORD_LAYOUTS = {
+    'hotspots': (0x47A, 0x47C, HOTSPOT_DTYPE, 0, 0),
+    'walkboxes': (0x213, 0x218, WALKBOX_DTYPE, 0, 0),
+    'exits': (0x1BE, 0x1BF, EXIT_DTYPE, 0, 0),
+    'sprites': (0x05, 0x62, SPRITE_DTYPE, -2, 2),
+}
+
+# Action flag bits (sprite action_flags, as used by alfred2_mapper.py)
+ACTION_TALK = 0x10
+Z_HIDDEN = 0xFF
+
+
+def with_room_columns(dtype):
+    """Prefix a record dtype with room and record index columns"""
+    return np.dtype([('room', 'u1'), ('index', 'u1')] + dtype.descr)
+
+
+def read_pair10(data, room_num):
+    pair_pos = room_num * 104 + 10 * 8
+    offset, size = struct.unpack('<II', data[pair_pos:pair_pos+8])
+    if size == 0 or offset >= len(data):
+        return None
+    return data[offset:offset+size]
+
+
+def parse_records(pair10_data, table):
+    """Parse one record table of a room's Pair 10 as a structured array"""
+    count_offset, array_offset, dtype, adjust, _ = RECORD_LAYOUTS[table]
+    if count_offset >= len(pair10_data):
+        return np.empty(0, dtype=dtype)
+
+    count = max(pair10_data[count_offset] + adjust, 0)
+    # Clamp to records fully inside the pair, like the per-field extractors
+    available = max(len(pair10_data) - array_offset, 0) // dtype.itemsize
+    count = min(count, available)
+    return np.frombuffer(pair10_data, dtype=dtype, count=count, offset=array_offset)
+
+
+def build_database(data, num_rooms=NUM_ROOMS) -> Dict[str, np.ndarray]:
+    """Parse all rooms into one columnar table per record type"""
+    parts = {table: [] for table in RECORD_LAYOUTS}
+
+    for room_num in range(num_rooms):
+        pair10 = read_pair10(data, room_num)
+        if pair10 is None:
+            continue
+
+        for table, (_, _, dtype, _, first_index) in RECORD_LAYOUTS.items():
+            records = parse_records(pair10, table)
+            rows = np.empty(len(records), dtype=with_room_columns(dtype))
+            rows['room'] = room_num
+            rows['index'] = np.arange(first_index, first_index + len(records))
+            for name in dtype.names:
+                rows[name] = records[name]
+            parts[table].append(rows)
+
+    db = {}
+    for table, (_, _, dtype, _, _) in RECORD_LAYOUTS.items():
+        if parts[table]:
+            db[table] = np.concatenate(parts[table])
+        else:
+            db[table] = np.empty(0, dtype=with_room_columns(dtype))
+
+    # Same sanity filter as extract_room_data.extract_exits (screen is 640x400)
+    e = db['exits']
+    db['exits_valid'] = ((e['trigger_x'] < 640) & (e['trigger_y'] < 400) &
+                         (e['dest_x'] < 640) & (e['dest_y'] < 400))
+    return db
+
+
+def save_database(db, path):
+    np.savez_compressed(path, **db)
+
+
+def load_database(path) -> Dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def talking_sprites(db, max_z=None):
+    """Visible sprites with the TALK action flag (optionally z_depth < max_z)"""
+    s = db['sprites']
+    mask = ((s['action_flags'] & ACTION_TALK) != 0) & (s['z_depth'] != Z_HIDDEN)
+    if max_z is not None:
+        mask &= s['z_depth'] < max_z
+    return s[mask]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'rb') as f:
+        data = f.read()
+    output = sys.argv[2] if len(sys.argv) > 2 else 'room_db.npz'
+
+    db = build_database(data)
+    save_database(db, output)
+
+    for table in RECORD_LAYOUTS:
+        rooms = len(np.unique(db[table]['room']))
+        print(f"  {table:<10} {len(db[table]):5d} records in {rooms:2d} rooms")
+
+    talkers = talking_sprites(db)
+    print(f"  Talking sprites: {len(talkers)}")
+    print(f"✓ Saved {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Room Connectivity Graph
+========================================
+
+Treats the Pair 10 exit records as a directed multigraph of rooms
+(one edge per exit) and precomputes shortest room-to-room routes.
+
+  - shortest_route(a, b): fewest room transitions, answered from
+    all-pairs BFS parent tables built once
+  - fastest_route(a, b): Dijkstra where each edge costs the walking
+    distance inside the room, from where Alfred arrived to the exit's
+    trigger rect, using the walkbox pathfinder (walkbox_pathfinding.py)
+  - strongly_connected_components() / unreachable_rooms(start)
+
+Exit trigger rects usually sit at the screen edges and arrival points
+need not lie inside a walkbox, so both ends of a walk are first snapped
+to the nearest point inside the room's closest walkbox. Exits that still
+have no walkable path (a room without walkboxes, or boxes the game's
+search cannot connect) are skipped by fastest_route() and collected in
+RoomGraph.unwalkable, which the CLI reports.
+
+Exits come from room_database.py (the same filter as
+extract_room_data.extract_exits is applied).
+
+Usage:
+    python3 room_graph.py <alfred.1> <from_room> <to_room> [--walk]
+    python3 room_graph.py <alfred.1> --analyze [start_room]
+"""
+
+import heapq
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from room_database import build_database
+from walkbox_pathfinding import Walkbox, WalkboxGraph
+
+
+@dataclass(frozen=True)
+class ExitEdge:
+    room: int
+    index: int             # Exit index within the source room
+    destination_room: int
+    trigger: Tuple[int, int, int, int]  # x, y, width, height
+    arrival: Tuple[int, int]            # Position in the destination room
+    direction: int
+
+    @property
+    def trigger_point(self):
+        x, y, w, h = self.trigger
+        return (x + w // 2, y + h // 2)
+
+
+def walk_cost(steps):
+    """Total pixels walked for a list of movement steps"""
+    return sum(s.distance_x + s.distance_y for s in steps)
+
+
+class RoomGraph:
+    """Directed multigraph of rooms connected by exits"""
+
+    def __init__(self, edges: List[ExitEdge], walk_graphs: Optional[Dict[int, WalkboxGraph]] = None):
+        self.edges = list(edges)
+        self.walk_graphs = walk_graphs or {}
+        # (edge, start point) pairs walking_cost() found no path for
+        self.unwalkable = set()
+        self.rooms = sorted({e.room for e in self.edges} | {e.destination_room for e in self.edges})
+
+        self.out_edges: Dict[int, List[ExitEdge]] = {room: [] for room in self.rooms}
+        for edge in self.edges:
+            self.out_edges[edge.room].append(edge)
+
+        # All-pairs BFS: _parents[a][b] = edge used to first reach b from a
+        self._parents = {room: self._bfs(room) for room in self.rooms}
+
+    @classmethod
+    def from_database(cls, db):
+        exits = db['exits'][db['exits_valid']]
+        edges = [ExitEdge(int(e['room']), int(e['index']), int(e['destination_room']),
+                          (int(e['trigger_x']), int(e['trigger_y']),
+                           int(e['trigger_width']), int(e['trigger_height'])),
+                          (int(e['dest_x']), int(e['dest_y'])), int(e['dest_direction']))
+                 for e in exits]
+
+        walk_graphs = {}
+        boxes = db['walkboxes']
+        for room in set(int(r) for r in boxes['room']):
+            rows = boxes[boxes['room'] == room]
+            walk_graphs[room] = WalkboxGraph([
+                Walkbox(int(b['x']), int(b['y']), int(b['width']), int(b['height']), int(b['flags']))
+                for b in rows])
+
+        return cls(edges, walk_graphs)
+
+    # ------------------------------------------------------------------
+    # Hop-count routes
+    # ------------------------------------------------------------------
+
+    def _bfs(self, start):
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            room = queue.popleft()
+            for edge in self.out_edges.get(room, ()):
+                if edge.destination_room not in parents:
+                    parents[edge.destination_room] = edge
+                    queue.append(edge.destination_room)
+        return parents
+
+    def shortest_route(self, start, goal) -> Optional[List[ExitEdge]]:
+        """Exits to take from start to goal with the fewest transitions"""
+        parents = self._parents.get(start)
+        if parents is None or goal not in parents:
+            return None
+
+        route = []
+        room = goal
+        while parents[room] is not None:
+            edge = parents[room]
+            route.append(edge)
+            room = edge.room
+        route.reverse()
+        return route
+
+    def distance(self, start, goal) -> Optional[int]:
+        route = self.shortest_route(start, goal)
+        return None if route is None else len(route)
+
+    # ------------------------------------------------------------------
+    # Walking-cost routes
+    # ------------------------------------------------------------------
+
+    def walking_cost(self, room, from_point, edge) -> Optional[int]:
+        """Pixels walked in `room` from from_point to edge's trigger rect.
+
+        from_point None means "already standing anywhere", cost 0. Both
+        points are snapped into the nearest walkbox first. Returns None,
+        and records the edge in self.unwalkable, when there is still no path.
+        """
+        if from_point is None:
+            return 0
+        graph = self.walk_graphs.get(room)
+        start = graph.nearest_point(*from_point) if graph is not None else None
+        target = graph.nearest_point(*edge.trigger_point) if graph is not None else None
+        steps = graph.movement_steps(*start, *target) if start and target else None
+        if steps is None:
+            self.unwalkable.add((edge, from_point))
+            return None
+        return walk_cost(steps)
+
+    def fastest_route(self, start, goal, start_point=None) -> Optional[Tuple[int, List[ExitEdge]]]:
+        """Route minimizing total walking distance; returns (cost, exits).
+
+        Exits without a walkable path are skipped (see self.unwalkable), so
+        this can return None or a detour where shortest_route() does not.
+        """
+        # States are (room, arrival point); the arrival point decides the
+        # walking cost of the next exit.
+        best = {(start, start_point): 0}
+        heap = [(0, 0, start, start_point, ())]
+        counter = 0  # Tie-breaker so heap entries never compare routes
+
+        while heap:
+            cost, _, room, point, route = heapq.heappop(heap)
+            if room == goal:
+                return cost, list(route)
+            if cost > best.get((room, point), cost):
+                continue
+
+            for edge in self.out_edges.get(room, ()):
+                step_cost = self.walking_cost(room, point, edge)
+                if step_cost is None:
+                    continue
+                state = (edge.destination_room, edge.arrival)
+                new_cost = cost + step_cost
+                if new_cost < best.get(state, float('inf')):
+                    best[state] = new_cost
+                    counter += 1
+                    heapq.heappush(heap, (new_cost, counter, edge.destination_room,
+                                          edge.arrival, route + (edge,)))
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Connectivity analysis
+    # ------------------------------------------------------------------
+
+    def reachable_from(self, start):
+        return set(self._parents.get(start, {start: None}))
+
+    def unreachable_rooms(self, start=0, all_rooms=None):
+        """Rooms (from all_rooms, default: rooms with exits) not reachable from start"""
+        rooms = set(all_rooms) if all_rooms is not None else set(self.rooms)
+        return sorted(rooms - self.reachable_from(start))
+
+    def strongly_connected_components(self):
+        """Tarjan's algorithm (iterative); components sorted largest first"""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in self.rooms:
+            if root in index:
+                continue
+            work = [(root, iter(self.out_edges.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                room, edges = work[-1]
+                advanced = False
+                for edge in edges:
+                    nxt = edge.destination_room
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(self.out_edges.get(nxt, ()))))
+                        advanced = True
+                        break
+                    elif nxt in on_stack:
+                        low[room] = min(low[room], index[nxt])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[room])
+                if low[room] == index[room]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == room:
+                            break
+                    components.append(sorted(component))
+
+        components.sort(key=lambda c: (-len(c), c))
+        return components
+
+
+def format_route(route):
+    return '\n'.join(f"  Room {e.room:2d} exit {e.index} -> room {e.destination_room:2d} "
+                     f"at ({e.arrival[0]}, {e.arrival[1]})" for e in route)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'rb') as f:
+        data = f.read()
+    graph = RoomGraph.from_database(build_database(data))
+
+    if sys.argv[2] == '--analyze':
+        start = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+        components = graph.strongly_connected_components()
+        print(f"{len(graph.rooms)} rooms, {len(graph.edges)} exits, {len(components)} SCCs")
+        for component in components:
+            if len(component) > 1:
+                print(f"  SCC: {component}")
+        print(f"Unreachable from room {start}: {graph.unreachable_rooms(start)}")
+        return
+
+    start, goal = int(sys.argv[2]), int(sys.argv[3])
+    if '--walk' in sys.argv:
+        result = graph.fastest_route(start, goal)
+        skipped = {edge for edge, _ in graph.unwalkable}
+        if skipped:
+            names = sorted((e.room, e.index) for e in skipped)
+            print(f"Skipped {len(skipped)} exits with no walkable path: "
+                  + ', '.join(f"room {room} exit {index}" for room, index in names))
+        if result is None:
+            print(f"No walkable route from room {start} to room {goal}")
+            sys.exit(1)
+        cost, route = result
+        print(f"Fastest route ({cost} px walked, {len(route)} exits):")
+    else:
+        route = graph.shortest_route(start, goal)
+        if route is None:
+            print(f"No route from room {start} to room {goal}")
+            sys.exit(1)
+        print(f"Shortest route ({len(route)} exits):")
+    print(format_route(route))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Per-Room Walkbox/Hotspot ID Rasters
+====================================================
+
+Rasterizes a room's walkboxes and hotspots into 640x400 uint8 "id
+rasters", so hit-testing a point is one array lookup and a whole click
+trace is one vectorized gather.
+
+Raster value = record index, or NO_ID (0xFF) where nothing is hit.
+
+Overlap priority: the lowest record index wins, matching the game's
+first-match scan (find_walkbox_for_point in pathfinding.c). Rectangles are
+painted from the last record to the first so earlier records overwrite.
+
+Edges:
+  - Walkboxes are inclusive on all sides (x <= px <= x + width), as in
+    point_in_walkbox().
+  - Hotspots cover width x height pixels starting at (x, y).
+
+Usage:
+    python3 room_rasters.py <alfred.1> <room> [output.png]
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 400
+NO_ID = 0xFF
+
+
+def build_id_raster(rects, inclusive=False):
+    """Paint rect dicts (x, y, width, height) into a uint8 id raster"""
+    raster = np.full((SCREEN_HEIGHT, SCREEN_WIDTH), NO_ID, dtype=np.uint8)
+    extra = 1 if inclusive else 0
+
+    # Reverse order so lower indices take priority
+    for index in range(min(len(rects), NO_ID) - 1, -1, -1):
+        r = rects[index]
+        x0, y0 = max(r['x'], 0), max(r['y'], 0)
+        x1 = min(r['x'] + r['width'] + extra, SCREEN_WIDTH)
+        y1 = min(r['y'] + r['height'] + extra, SCREEN_HEIGHT)
+        if x1 > x0 and y1 > y0:
+            raster[y0:y1, x0:x1] = index
+
+    return raster
+
+
+def id_shades(raster):
+    """Debug-image shade per id, black for NO_ID.
+
+    Shades are never black and are distinct for ids below 224 (37 is
+    coprime with 224), computed in int32 so large ids cannot wrap.
+    """
+    shades = 32 + (raster.astype(np.int32) * 37) % 224
+    return np.where(raster != NO_ID, shades, 0).astype(np.uint8)
+
+
+def gather(raster, xs, ys):
+    """Vectorized lookup of many points; out-of-screen points give NO_ID"""
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    inside = (xs >= 0) & (xs < SCREEN_WIDTH) & (ys >= 0) & (ys < SCREEN_HEIGHT)
+    result = np.full(xs.shape, NO_ID, dtype=np.uint8)
+    result[inside] = raster[ys[inside], xs[inside]]
+    return result
+
+
+class RoomRasters:
+    """Walkbox and hotspot id rasters for one room"""
+
+    def __init__(self, walkboxes, hotspots):
+        self.walkboxes = build_id_raster(walkboxes or [], inclusive=True)
+        self.hotspots = build_id_raster(hotspots or [])
+
+    def walkbox_at(self, x, y) -> Optional[int]:
+        if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
+            value = int(self.walkboxes[y, x])
+            return None if value == NO_ID else value
+        return None
+
+    def hotspot_at(self, x, y) -> Optional[int]:
+        if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
+            value = int(self.hotspots[y, x])
+            return None if value == NO_ID else value
+        return None
+
+    def walkboxes_at(self, xs, ys):
+        return gather(self.walkboxes, xs, ys)
+
+    def hotspots_at(self, xs, ys):
+        return gather(self.hotspots, xs, ys)
+
+    @property
+    def walkable(self):
+        return self.walkboxes != NO_ID
+
+    def reachable_mask(self, graph, start_box):
+        """Boolean raster of walkable pixels reachable from start_box.
+
+        graph is a walkbox_pathfinding.WalkboxGraph for the same room.
+        """
+        reachable = np.zeros(NO_ID + 1, dtype=bool)
+        for dest_box in range(len(graph.walkboxes)):
+            reachable[dest_box] = graph.reachable(start_box, dest_box)
+        return reachable[self.walkboxes]
+
+    def exit_coverage(self, graph, exits):
+        """For each exit, the fraction of walkable pixels reachable from it.
+
+        Returns [(exit_index, start_box or None, fraction)].
+        """
+        walkable_count = int(self.walkable.sum())
+        coverage = []
+        for index, exit_data in enumerate(exits or []):
+            trig = exit_data['trigger']
+            cx, cy = trig['x'] + trig['width'] // 2, trig['y'] + trig['height'] // 2
+            start_box = self.walkbox_at(cx, cy)
+            if start_box is None or walkable_count == 0:
+                coverage.append((index, start_box, 0.0))
+                continue
+            reached = int(self.reachable_mask(graph, start_box).sum())
+            coverage.append((index, start_box, reached / walkable_count))
+        return coverage
+
+    def save(self, path):
+        np.savez_compressed(path, walkboxes=self.walkboxes, hotspots=self.hotspots)
+
+
+_raster_cache: Dict[Tuple[str, int], RoomRasters] = {}
+
+
+def room_rasters(extractor, room_num) -> RoomRasters:
+    """Rasters for a room of a RoomDataExtractor, built once and cached"""
+    key = (extractor.alfred1_path, room_num)
+    if key not in _raster_cache:
+        _raster_cache[key] = RoomRasters(extractor.extract_walkboxes(room_num),
+                                         extractor.extract_hotspots(room_num))
+    return _raster_cache[key]
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    from extract_room_data import RoomDataExtractor
+    from walkbox_pathfinding import WalkboxGraph
+
+    extractor = RoomDataExtractor(sys.argv[1])
+    room_num = int(sys.argv[2])
+    rasters = room_rasters(extractor, room_num)
+
+    print(f"Room {room_num}: {int(rasters.walkable.sum())} walkable pixels, "
+          f"{int((rasters.hotspots != NO_ID).sum())} hotspot pixels")
+
+    graph = WalkboxGraph.from_dicts(extractor.extract_walkboxes(room_num))
+    for index, start_box, fraction in rasters.exit_coverage(graph, extractor.extract_exits(room_num)):
+        where = f"box {start_box}" if start_box is not None else "not on a walkbox"
+        print(f"  Exit {index} ({where}): {fraction:.1%} of walkable area reachable")
+
+    if len(sys.argv) > 3:
+        from PIL import Image
+        # Walkboxes in the red channel, hotspots in green (NO_ID -> black)
+        rgb = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+        rgb[..., 0] = id_shades(rasters.walkboxes)
+        rgb[..., 1] = id_shades(rasters.hotspots)
+        Image.fromarray(rgb).save(Path(sys.argv[3]))
+        print(f"✓ Saved {sys.argv[3]}")
+
+
+if __name__ == '__main__':
+    main()
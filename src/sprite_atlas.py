@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Sprite Texture Atlases
+
+Packs exported sprite and animation frames into a few power-of-two,
+palette-indexed atlases with a JSON manifest, instead of one full-size
+PNG per animation.
+
+  1. Trim: each frame is cut to the bounding box of its opaque pixels
+     (0xFF is transparent). Boxes are computed per group of equally sized
+     frames at once, from the row/column "any opaque" projections.
+  2. Deduplicate: trimmed frames with the same size and pixels (BLAKE2b
+     of size + pixels) are stored once; later frames reference the first.
+  3. Pack: unique frames, largest first, go into MaxRects bins (best
+     short side fit, free rectangles kept as NumPy arrays) of at most
+     max_size x max_size; a frame that fits in no open bin starts a new
+     one. Each bin is then shrunk to the power-of-two size covering it,
+     and halved further (repacking its frames) while they still fit.
+
+Atlases keep palette indices; the manifest names each frame's palette
+(a room, or an ALFRED.2 set) and lists the palettes it knows.
+
+Manifest (manifest.json):
+  atlases   [{file, width, height}]
+  frames    {name: {atlas, x, y, w, h, trim_x, trim_y, source_w, source_h,
+                    palette, duplicate_of}}
+  palettes  {palette: [768 ints]}
+
+Usage:
+    python3 sprite_atlas.py <output_dir> [--alfred1 F] [--alfred2 F] [--alfred6 F]
+                            [--png DIR] [--max-size N] [--padding N]
+"""
+
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+TRANSPARENT = 0xFF
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_PADDING = 1
+
+
+@dataclass
+class Frame:
+    name: str
+    pixels: np.ndarray        # (h, w) palette indices
+    palette: Optional[str] = None
+
+
+@dataclass
+class Placement:
+    atlas: int
+    x: int
+    y: int
+
+
+@dataclass
+class AtlasEntry:
+    name: str
+    palette: Optional[str]
+    source_w: int
+    source_h: int
+    trim_x: int = 0
+    trim_y: int = 0
+    w: int = 0
+    h: int = 0
+    unique: int = -1                   # index into the unique frame list
+    duplicate_of: Optional[str] = None
+
+
+@dataclass
+class AtlasSet:
+    entries: List[AtlasEntry]
+    unique_pixels: List[np.ndarray]
+    placements: List[Optional[Placement]]
+    sizes: List[Tuple[int, int]] = field(default_factory=list)   # (width, height) per atlas
+    images: List[np.ndarray] = field(default_factory=list)
+
+
+# =============================================================================
+# TRIM AND DEDUPLICATE
+# =============================================================================
+
+def trim_boxes(frames: np.ndarray, transparent=TRANSPARENT) -> np.ndarray:
+    """(n, 4) x, y, w, h opaque bounding boxes of (n, h, w) frames; 0x0 if empty"""
+    opaque = frames != transparent
+    rows = opaque.any(axis=2)
+    cols = opaque.any(axis=1)
+    n, h, w = frames.shape
+    top = rows.argmax(axis=1)
+    bottom = h - rows[:, ::-1].argmax(axis=1)
+    left = cols.argmax(axis=1)
+    right = w - cols[:, ::-1].argmax(axis=1)
+
+    boxes = np.stack([left, top, right - left, bottom - top], axis=1)
+    boxes[~rows.any(axis=1)] = 0
+    return boxes
+
+
+def trim_frames(frames: List[Frame], transparent=TRANSPARENT) -> np.ndarray:
+    """Bounding boxes of all frames, batched by frame size"""
+    boxes = np.zeros((len(frames), 4), dtype=np.int64)
+    by_shape: Dict[Tuple[int, int], List[int]] = {}
+    for i, frame in enumerate(frames):
+        by_shape.setdefault(frame.pixels.shape, []).append(i)
+    for indices in by_shape.values():
+        boxes[indices] = trim_boxes(np.stack([frames[i].pixels for i in indices]), transparent)
+    return boxes
+
+
+def deduplicate(frames: List[Frame], boxes: np.ndarray) -> Tuple[List[AtlasEntry], List[np.ndarray]]:
+    """Manifest entries for all frames and the unique trimmed pixel arrays"""
+    entries = []
+    unique_pixels: List[np.ndarray] = []
+    first: Dict[bytes, Tuple[int, str]] = {}
+    for frame, (x, y, w, h) in zip(frames, boxes.tolist()):
+        entry = AtlasEntry(frame.name, frame.palette, frame.pixels.shape[1], frame.pixels.shape[0],
+                           x, y, w, h)
+        entries.append(entry)
+        if w == 0 or h == 0:
+            continue
+
+        trimmed = np.ascontiguousarray(frame.pixels[y:y + h, x:x + w])
+        digest = hashlib.blake2b(bytes([w & 0xFF, w >> 8, h & 0xFF, h >> 8]) + trimmed.tobytes(),
+                                 digest_size=16).digest()
+        known = first.get(digest)
+        if known is None:
+            first[digest] = (len(unique_pixels), frame.name)
+            entry.unique = len(unique_pixels)
+            unique_pixels.append(trimmed)
+        else:
+            entry.unique, entry.duplicate_of = known
+    return entries, unique_pixels
+
+
+# =============================================================================
+# MAXRECTS PACKER
+# =============================================================================
+
+class MaxRectsBin:
+    """MaxRects bin with best-short-side-fit placement"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # Free rectangles as x0, y0, x1, y1 columns
+        self.free = np.array([[0, 0, width, height]], dtype=np.int64)
+        self.used_w = 0
+        self.used_h = 0
+
+    def find(self, w, h) -> Optional[Tuple[int, int, int]]:
+        """(x, y, short side leftover) of the best free position, None if it does not fit"""
+        free_w = self.free[:, 2] - self.free[:, 0]
+        free_h = self.free[:, 3] - self.free[:, 1]
+        fits = (free_w >= w) & (free_h >= h)
+        if not fits.any():
+            return None
+        leftover_w, leftover_h = free_w - w, free_h - h
+        short = np.where(fits, np.minimum(leftover_w, leftover_h), np.iinfo(np.int64).max)
+        long = np.where(fits, np.maximum(leftover_w, leftover_h), np.iinfo(np.int64).max)
+        best = np.lexsort((long, short))[0]
+        return int(self.free[best, 0]), int(self.free[best, 1]), int(short[best])
+
+    def place(self, x, y, w, h):
+        x1, y1 = x + w, y + h
+        f = self.free
+        hit = (f[:, 0] < x1) & (f[:, 2] > x) & (f[:, 1] < y1) & (f[:, 3] > y)
+        split = f[hit]
+        pieces = [
+            np.column_stack([split[:, 0], split[:, 1], np.full(len(split), x), split[:, 3]])[split[:, 0] < x],
+            np.column_stack([np.full(len(split), x1), split[:, 1], split[:, 2], split[:, 3]])[split[:, 2] > x1],
+            np.column_stack([split[:, 0], split[:, 1], split[:, 2], np.full(len(split), y)])[split[:, 1] < y],
+            np.column_stack([split[:, 0], np.full(len(split), y1), split[:, 2], split[:, 3]])[split[:, 3] > y1],
+        ]
+        self.free = self._prune(np.concatenate([f[~hit]] + pieces))
+        self.used_w = max(self.used_w, x1)
+        self.used_h = max(self.used_h, y1)
+
+    @staticmethod
+    def _prune(free: np.ndarray) -> np.ndarray:
+        """Drop free rectangles contained in another (one copy of equal ones survives)"""
+        a, b = free[:, None, :], free[None, :, :]
+        inside = ((a[..., 0] >= b[..., 0]) & (a[..., 1] >= b[..., 1]) &
+                  (a[..., 2] <= b[..., 2]) & (a[..., 3] <= b[..., 3]))
+        equal = (a == b).all(axis=2)
+        later = np.arange(len(free))[:, None] > np.arange(len(free))[None, :]
+        np.fill_diagonal(inside, False)
+        redundant = (inside & ~equal) | (equal & later)
+        return free[~redundant.any(axis=1)]
+
+
+def next_power_of_two(n) -> int:
+    return 1 << max(0, int(n) - 1).bit_length()
+
+
+def pack_into(sizes: List[Tuple[int, int]], order: List[int], width, height,
+              padding=DEFAULT_PADDING) -> Optional[Dict[int, Tuple[int, int]]]:
+    """Positions of sizes[i] for i in order in one width x height bin, None if they do not all fit"""
+    packer = MaxRectsBin(width + padding, height + padding)
+    positions = {}
+    for i in order:
+        w, h = sizes[i][0] + padding, sizes[i][1] + padding
+        found = packer.find(w, h)
+        if found is None:
+            return None
+        packer.place(found[0], found[1], w, h)
+        positions[i] = found[:2]
+    return positions
+
+
+def pack(sizes: List[Tuple[int, int]], max_size=DEFAULT_MAX_SIZE,
+         padding=DEFAULT_PADDING) -> Tuple[List[Placement], List[Tuple[int, int]]]:
+    """Placements for (w, h) sizes and the power-of-two (width, height) of each bin"""
+    order = sorted(range(len(sizes)), key=lambda i: (-max(sizes[i]), -sizes[i][0] * sizes[i][1], i))
+    bins: List[MaxRectsBin] = []
+    contents: List[List[int]] = []
+    placements: List[Optional[Placement]] = [None] * len(sizes)
+    for i in order:
+        w, h = sizes[i][0] + padding, sizes[i][1] + padding
+        if sizes[i][0] > max_size or sizes[i][1] > max_size:
+            raise ValueError(f"Frame of {sizes[i][0]}x{sizes[i][1]} exceeds the {max_size}x{max_size} atlas size")
+
+        best = None
+        for b, packer in enumerate(bins):
+            found = packer.find(w, h)
+            if found is not None and (best is None or found[2] < best[3]):
+                best = (b, found[0], found[1], found[2])
+        if best is None:
+            bins.append(MaxRectsBin(max_size + padding, max_size + padding))
+            contents.append([])
+            x, y, _ = bins[-1].find(w, h)
+            best = (len(bins) - 1, x, y, 0)
+
+        b, x, y, _ = best
+        bins[b].place(x, y, w, h)
+        contents[b].append(i)
+        placements[i] = Placement(b, x, y)
+
+    # Shrink each bin: halve a side while its frames still pack into the smaller size
+    atlas_sizes = []
+    for b, (packer, items) in enumerate(zip(bins, contents)):
+        width = next_power_of_two(max(1, packer.used_w - padding))
+        height = next_power_of_two(max(1, packer.used_h - padding))
+        while True:
+            candidates = sorted([(width, height // 2), (width // 2, height)], key=lambda s: -max(s))
+            for w, h in candidates:
+                positions = pack_into(sizes, items, w, h, padding) if w and h else None
+                if positions is not None:
+                    width, height = w, h
+                    for i, (x, y) in positions.items():
+                        placements[i] = Placement(b, x, y)
+                    break
+            else:
+                break
+        atlas_sizes.append((width, height))
+    return placements, atlas_sizes
+
+
+# =============================================================================
+# BUILD AND WRITE
+# =============================================================================
+
+def build_atlases(frames: List[Frame], max_size=DEFAULT_MAX_SIZE, padding=DEFAULT_PADDING,
+                  transparent=TRANSPARENT) -> AtlasSet:
+    """Trim, deduplicate and pack frames into atlas images"""
+    boxes = trim_frames(frames, transparent)
+    entries, unique_pixels = deduplicate(frames, boxes)
+    placements, sizes = pack([(p.shape[1], p.shape[0]) for p in unique_pixels], max_size, padding)
+
+    images = [np.full((h, w), transparent, dtype=np.uint8) for w, h in sizes]
+    for pixels, placement in zip(unique_pixels, placements):
+        h, w = pixels.shape
+        images[placement.atlas][placement.y:placement.y + h, placement.x:placement.x + w] = pixels
+    return AtlasSet(entries, unique_pixels, placements, sizes, images)
+
+
+def manifest(atlas_set: AtlasSet, files: List[str], palettes: Optional[Dict[str, List[int]]] = None) -> Dict:
+    frames = {}
+    for entry in atlas_set.entries:
+        record = {'atlas': None, 'x': 0, 'y': 0, 'w': entry.w, 'h': entry.h,
+                  'trim_x': entry.trim_x, 'trim_y': entry.trim_y,
+                  'source_w': entry.source_w, 'source_h': entry.source_h,
+                  'palette': entry.palette, 'duplicate_of': entry.duplicate_of}
+        if entry.unique >= 0:
+            placement = atlas_set.placements[entry.unique]
+            record.update(atlas=placement.atlas, x=placement.x, y=placement.y)
+        frames[entry.name] = record
+    return {
+        'atlases': [{'file': f, 'width': w, 'height': h} for f, (w, h) in zip(files, atlas_set.sizes)],
+        'frames': frames,
+        'palettes': palettes or {},
+    }
+
+
+def write_atlases(atlas_set: AtlasSet, output_dir, palettes: Optional[Dict[str, List[int]]] = None,
+                  transparent=TRANSPARENT) -> Path:
+    """atlasN.png files and manifest.json; returns the manifest path"""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    palettes = palettes or {}
+
+    files = []
+    for i, pixels in enumerate(atlas_set.images):
+        # Preview colors: the palette of the atlas' first frame, if known
+        palette = next((palettes[e.palette] for e in atlas_set.entries
+                        if e.unique >= 0 and atlas_set.placements[e.unique].atlas == i
+                        and e.palette in palettes), None)
+        img = Image.fromarray(pixels, 'P')
+        img.putpalette(palette if palette is not None else [v for g in range(256) for v in (g, g, g)])
+        name = f"atlas{i}.png"
+        img.save(output_path / name, transparency=transparent)
+        files.append(name)
+
+    manifest_path = output_path / 'manifest.json'
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest(atlas_set, files, palettes), f, indent=1)
+    return manifest_path
+
+
+# =============================================================================
+# FRAME SOURCES
+# =============================================================================
+
+def alfred1_frames(alfred1_path, palettes: Dict[str, List[int]]) -> Iterable[Frame]:
+    """Room animation frames from Pair 8 of ALFRED.1 (as extract_animations.py cuts them)"""
+    from extract_animations import extract_palette, extract_sprite_data, get_animation_metadata
+
+    data = Path(alfred1_path).read_bytes()
+    for room in range(56):
+        room_offset = room * 104
+        sprite_data, sprite_end = extract_sprite_data(data, room_offset)
+        if not sprite_data or not sprite_end:
+            continue
+        palette = extract_palette(data, room_offset)
+        if palette:
+            palettes[f"room{room:02d}"] = palette
+        animations, _ = get_animation_metadata(data, sprite_end)
+
+        pixels = np.frombuffer(sprite_data, dtype=np.uint8)
+        offset = 0
+        for i, anim in enumerate(animations):
+            w, h, count = anim['width'], anim['height'], anim['frames']
+            needed = w * h * count
+            if offset + needed > len(pixels):
+                break
+            frames = pixels[offset:offset + needed].reshape(count, h, w)
+            for f in range(count):
+                yield Frame(f"room{room:02d}/anim{i}/{f}", frames[f], f"room{room:02d}")
+            offset += needed
+
+
+def alfred2_frames(alfred2_path) -> Iterable[Frame]:
+    """Talking animation frames of every ALFRED.2 set (palette keyed by set)"""
+    from alfred2_index import Alfred2Index
+
+    index = Alfred2Index.load(alfred2_path)
+    for i in index.valid_indices():
+        for part, frames in zip('ab', index.get_animation(i)):
+            if frames is None:
+                continue
+            for f in range(len(frames)):
+                yield Frame(f"alfred2/{i:02d}/{part}/{f}", frames[f], f"alfred2_{i:02d}")
+
+
+def alfred6_frames(alfred6_path) -> Iterable[Frame]:
+    """ALFRED.6 sprites (palette keyed by their room)"""
+    from alfred6_index import Alfred6Index
+
+    index = Alfred6Index.load(alfred6_path)
+    for i in range(len(index)):
+        yield Frame(f"alfred6/{i:03d}", index.get_sprite(i), f"room{index.info(i)['room']:02d}")
+
+
+def png_frames(directory) -> Iterable[Frame]:
+    """Frames from indexed PNGs written by the other extractors (one frame per file)"""
+    directory = Path(directory)
+    for path in sorted(directory.rglob('*.png')):
+        img = Image.open(path)
+        if img.mode != 'P':
+            continue
+        yield Frame(f"{directory.name}/{path.relative_to(directory).with_suffix('').as_posix()}",
+                    np.asarray(img))
+
+
+def main():
+    args = sys.argv[1:]
+    options = {'--alfred1': [], '--alfred2': [], '--alfred6': [], '--png': [],
+               '--max-size': [], '--padding': []}
+    rest = []
+    while args:
+        arg = args.pop(0)
+        if arg in options and args:
+            options[arg].append(args.pop(0))
+        else:
+            rest.append(arg)
+    if len(rest) != 1:
+        print(__doc__)
+        sys.exit(1)
+    if not any(options[k] for k in ('--alfred1', '--alfred2', '--alfred6', '--png')):
+        options['--alfred2'] = [p for p in ['files/ALFRED.2'] if Path(p).exists()]
+        options['--alfred6'] = [p for p in ['files/ALFRED.6'] if Path(p).exists()]
+
+    palettes: Dict[str, List[int]] = {}
+    frames: List[Frame] = []
+    for path in options['--alfred1']:
+        frames.extend(alfred1_frames(path, palettes))
+    for path in options['--alfred2']:
+        frames.extend(alfred2_frames(path))
+    for path in options['--alfred6']:
+        frames.extend(alfred6_frames(path))
+    for path in options['--png']:
+        frames.extend(png_frames(path))
+
+    max_size = int(options['--max-size'][-1]) if options['--max-size'] else DEFAULT_MAX_SIZE
+    padding = int(options['--padding'][-1]) if options['--padding'] else DEFAULT_PADDING
+    atlas_set = build_atlases(frames, max_size, padding)
+    manifest_path = write_atlases(atlas_set, rest[0], palettes)
+
+    source_px = sum(f.pixels.size for f in frames)
+    atlas_px = sum(w * h for w, h in atlas_set.sizes)
+    print(f"{len(frames)} frames, {len(atlas_set.unique_pixels)} unique after trimming")
+    for i, (w, h) in enumerate(atlas_set.sizes):
+        print(f"  atlas{i}.png: {w}x{h}")
+    print(f"  {source_px} source pixels -> {atlas_px} atlas pixels")
+    print(f"✓ Manifest: {manifest_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Batch Dialogue Layout
+
+Lays out a whole string table at once with the display_dialog_text rules
+of text_centering_algorithm.py (word wrap at 47 characters, 5 lines per
+page, short lines centered), and reports which strings break the limits.
+
+Each string is tokenized once with a regular expression into words:
+non-space characters plus their trailing spaces, or plus the end marker
+that stops the text (0xFD, 0xF4, 0xF8, 0xF0). 0xF8 is an end marker, so
+calculate_word_length()'s +3 case for it never applies and is not
+reproduced. Newline (0xF6), which word_wrap_text() leaves in the text,
+ends the current line here.
+
+Lines are kept as byte ranges into the string, with trailing spaces
+removed. Every string of the table is joined into one buffer and the
+glyph-width table is prefix-summed over it once, so a line's pixel width
+is cum[end] - cum[start]. Centered lines (shorter than 45 characters, as
+display_text_example() applies center_line()) are indented by
+(47 - length) // 2 spaces; x is that indent in pixels.
+
+    layout = layout_strings(strings)
+    layout.lines        # LINE_DTYPE: string, page, line, start, end, length, indent, x, width
+    layout.strings      # STRING_DTYPE: pages, lines, longest, overflow
+    layout.pages(i)     # [[line bytes, ...], ...] for string i
+
+Usage:
+    python3 text_layout.py <strings.txt>    (one string per line)
+"""
+
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from text_centering_algorithm import (
+    CHAR_NEWLINE,
+    CHAR_SPACE,
+    MAX_CHARS_PER_LINE,
+    MAX_LINES,
+)
+
+# Pixels per character cell: the 12-pixel glyph plus its 1-pixel border on each side
+CELL_WIDTH = 14
+
+# A word, then what ends it: an end marker, a newline, or its trailing spaces
+TOKEN = re.compile(rb'([^ \xF0\xF4\xF6\xF8\xFD]*)([\xF0\xF4\xF8\xFD]|\xF6| *)')
+NEWLINE = bytes([CHAR_NEWLINE])
+
+LINE_DTYPE = np.dtype([
+    ('string', '<i4'),   # index in the string table
+    ('page', '<i2'),
+    ('line', '<i2'),     # line within the page
+    ('start', '<i4'),    # byte range in the string, trailing spaces removed
+    ('end', '<i4'),
+    ('length', '<i2'),   # characters
+    ('indent', '<i2'),   # centering spaces
+    ('x', '<i4'),        # indent in pixels
+    ('width', '<i4'),    # line width in pixels
+])
+
+STRING_DTYPE = np.dtype([
+    ('pages', '<i2'),
+    ('lines', '<i2'),
+    ('longest', '<i2'),   # characters in the longest line
+    ('overflow', '?'),    # a line is longer than MAX_CHARS_PER_LINE
+])
+
+Text = Union[str, bytes]
+
+
+def glyph_width_table(cell_width=CELL_WIDTH) -> np.ndarray:
+    """Per-code pixel widths; the game's dialogue font is fixed width"""
+    return np.full(256, cell_width, dtype=np.int32)
+
+
+def wrap_ranges(text: bytes, max_chars_per_line=MAX_CHARS_PER_LINE, max_lines=MAX_LINES):
+    """(page, line, start, end) of each wrapped line of one string, as word_wrap_text() splits it"""
+    lines = []
+    page = line_num = 0
+    line_start = 0
+    line_open = False
+    chars_remaining = max_chars_per_line
+    position = 0
+
+    def close_line(end):
+        nonlocal page, line_num
+        lines.append((page, line_num, line_start, len(text[line_start:end].rstrip(b' ')) + line_start))
+        line_num += 1
+        if line_num >= max_lines:
+            page += 1
+            line_num = 0
+
+    while position < len(text):
+        word, boundary = TOKEN.match(text, position).groups()
+        is_end = len(boundary) == 1 and boundary[0] not in (CHAR_SPACE, CHAR_NEWLINE)
+        is_newline = boundary == NEWLINE
+        word_length = len(word) if is_end or is_newline else len(word) + len(boundary)
+
+        if word_length > chars_remaining:
+            close_line(position)
+            line_start = position
+            chars_remaining = max_chars_per_line
+
+        line_open = True
+        chars_remaining -= word_length
+        end = position + word_length
+
+        # A line filled exactly hands its trailing spaces to the next line
+        if chars_remaining == 0 and not is_end:
+            trailing = (end - line_start) - len(text[line_start:end].rstrip(b' '))
+            if trailing > 0:
+                close_line(end - trailing)
+                line_start = end - trailing
+                chars_remaining = max_chars_per_line - trailing
+
+        position = end
+        if is_end:
+            break
+        if is_newline:
+            close_line(position)
+            position += 1
+            line_start = position
+            line_open = False
+            chars_remaining = max_chars_per_line
+
+    if line_open:
+        close_line(position)
+    return lines
+
+
+def encode(text: Text) -> bytes:
+    return text.encode('latin-1') if isinstance(text, str) else bytes(text)
+
+
+@dataclass
+class TextLayout:
+    texts: List[bytes]
+    lines: np.ndarray      # LINE_DTYPE, in string then line order
+    strings: np.ndarray    # STRING_DTYPE, one per string
+    first_line: np.ndarray  # index of each string's first row in lines (plus a final total)
+
+    def line_text(self, row) -> bytes:
+        line = self.lines[row]
+        return self.texts[line['string']][line['start']:line['end']]
+
+    def pages(self, i) -> List[List[bytes]]:
+        """Wrapped lines of string i, grouped by page"""
+        pages: List[List[bytes]] = []
+        for row in range(self.first_line[i], self.first_line[i + 1]):
+            page = int(self.lines[row]['page'])
+            while len(pages) <= page:
+                pages.append([])
+            pages[page].append(self.line_text(row))
+        return pages
+
+    def centered(self, i) -> List[List[bytes]]:
+        """pages(i) with the game's centering spaces prepended"""
+        rows = range(self.first_line[i], self.first_line[i + 1])
+        pages: List[List[bytes]] = [[] for _ in range(self.strings[i]['pages'])]
+        for row in rows:
+            pages[self.lines[row]['page']].append(b' ' * int(self.lines[row]['indent']) + self.line_text(row))
+        return pages
+
+    def overflowing(self) -> List[int]:
+        """Strings with a line longer than the game allows"""
+        return np.flatnonzero(self.strings['overflow']).tolist()
+
+
+def layout_strings(texts: Sequence[Text], glyph_widths: Optional[np.ndarray] = None,
+                   max_chars_per_line=MAX_CHARS_PER_LINE, max_lines=MAX_LINES) -> TextLayout:
+    """Wrap, paginate and center every string of a table in one call"""
+    texts = [encode(t) for t in texts]
+    glyph_widths = glyph_width_table() if glyph_widths is None else np.asarray(glyph_widths)
+
+    rows = []
+    counts = np.zeros(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        ranges = wrap_ranges(text, max_chars_per_line, max_lines)
+        counts[i] = len(ranges)
+        rows.extend((i, page, line, start, end) for page, line, start, end in ranges)
+
+    lines = np.zeros(len(rows), dtype=LINE_DTYPE)
+    if rows:
+        table = np.array(rows, dtype=np.int64)
+        for column, field in enumerate(('string', 'page', 'line', 'start', 'end')):
+            lines[field] = table[:, column]
+
+    length = lines['end'] - lines['start']
+    lines['length'] = length
+    centered = length < max_chars_per_line - 2
+    lines['indent'] = np.where(centered, (max_chars_per_line - length) // 2, 0)
+    lines['x'] = lines['indent'] * int(glyph_widths[CHAR_SPACE])
+
+    # Pixel widths from one prefix sum over the whole table
+    buffer = np.frombuffer(b''.join(texts), dtype=np.uint8)
+    cum = np.concatenate([[0], np.cumsum(glyph_widths[buffer], dtype=np.int64)])
+    string_base = np.concatenate([[0], np.cumsum([len(t) for t in texts], dtype=np.int64)])
+    base = string_base[lines['string']]
+    lines['width'] = cum[base + lines['end']] - cum[base + lines['start']]
+
+    first_line = np.concatenate([[0], np.cumsum(counts)])
+    strings = np.zeros(len(texts), dtype=STRING_DTYPE)
+    strings['lines'] = counts
+    has_lines = counts > 0
+    starts = first_line[:-1][has_lines]
+    strings['pages'][has_lines] = np.maximum.reduceat(lines['page'], starts) + 1 if len(starts) else 0
+    strings['longest'][has_lines] = np.maximum.reduceat(length, starts) if len(starts) else 0
+    strings['overflow'] = strings['longest'] > max_chars_per_line
+    return TextLayout(texts, lines, strings, first_line)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        texts = [line.rstrip('\n').encode('latin-1', errors='replace') for line in f]
+
+    began = time.perf_counter()
+    layout = layout_strings(texts)
+    elapsed = time.perf_counter() - began
+
+    overflowing = layout.overflowing()
+    print(f"{len(texts)} strings, {len(layout.lines)} lines, "
+          f"{int(layout.strings['pages'].sum())} pages in {elapsed:.3f}s")
+    multi_page = np.flatnonzero(layout.strings['pages'] > 1)
+    print(f"  {len(multi_page)} strings span more than one page")
+    print(f"  {len(overflowing)} strings have a line over {MAX_CHARS_PER_LINE} characters")
+    for i in overflowing:
+        print(f"    #{i}: {texts[i].decode('latin-1')!r}")
+
+
+if __name__ == '__main__':
+    main()
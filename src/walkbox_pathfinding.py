@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Walkbox Pathfinding (Python port of pathfinding.c)
+===================================================================
+
+Builds each room's walkbox adjacency graph once and precomputes the
+box-to-box path for every (start box, destination box) pair, so movement
+steps for any two points can be produced without re-running the search.
+
+The movement steps are identical to src/pathfinding.c:
+  - get_adjacent_walkbox() picks the lowest-index unvisited adjacent box,
+    with backtracking on dead ends (a depth-first walk, not shortest path)
+  - calculate_movement_to_target() / generate_movement_steps() produce
+    (flags, distance_x, distance_y) steps, plus a final step to the target
+  - compress_movement_path() packs steps into FE xx xx ... FF
+
+Because the game's walk is depth-first, the path from box A to C need not
+continue along the path from B (A's next hop) to C. The tables therefore
+store the complete box sequence per pair; next_hop() is derived from it.
+
+Walkbox record (9 bytes, pair 10 +0x218, count at +0x213):
+  [x:u16][y:u16][width:u16][height:u16][flags:u8]
+
+Usage:
+    python3 walkbox_pathfinding.py <alfred.1> <room> <x0> <y0> <x1> <y1>
+    python3 walkbox_pathfinding.py <alfred.1> <room> --validate
+"""
+
+import struct
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Direction flags (bit-packed, see pathfinding.c)
+MOVE_RIGHT = 0x01
+MOVE_LEFT = 0x02
+MOVE_HORIZ = 0x03
+MOVE_DOWN = 0x04
+MOVE_UP = 0x08
+MOVE_VERT = 0x0C
+
+PATH_END = 0xFF
+MOVEMENT_MARKER = 0xFE
+
+MAX_PATH_LENGTH = 100
+MAX_STEP_X = 6
+MAX_STEP_Y = 5
+
+WALKBOX_COUNT_OFFSET = 0x213
+WALKBOX_ARRAY_OFFSET = 0x218
+WALKBOX_RECORD_SIZE = 9
+
+
+@dataclass(frozen=True)
+class Walkbox:
+    x: int
+    y: int
+    width: int
+    height: int
+    flags: int = 0
+
+    @property
+    def x_max(self):
+        return (self.x + self.width) & 0xFFFF
+
+    @property
+    def y_max(self):
+        return (self.y + self.height) & 0xFFFF
+
+    def contains(self, x, y):
+        return self.x <= x <= self.x_max and self.y <= y <= self.y_max
+
+
+@dataclass(frozen=True)
+class MovementStep:
+    flags: int
+    distance_x: int
+    distance_y: int
+
+    def describe(self):
+        dirs = [name for bit, name in ((MOVE_RIGHT, 'RIGHT'), (MOVE_LEFT, 'LEFT'),
+                                       (MOVE_DOWN, 'DOWN'), (MOVE_UP, 'UP'))
+                if self.flags & bit]
+        return f"{' '.join(dirs)} (dx={self.distance_x}, dy={self.distance_y})"
+
+
+def parse_walkbox_records(pair10_data) -> List[Walkbox]:
+    """Decode the 9-byte walkbox records from a room's pair 10"""
+    if WALKBOX_COUNT_OFFSET >= len(pair10_data):
+        return []
+
+    count = pair10_data[WALKBOX_COUNT_OFFSET]
+    walkboxes = []
+    for i in range(count):
+        base = WALKBOX_ARRAY_OFFSET + i * WALKBOX_RECORD_SIZE
+        if base + WALKBOX_RECORD_SIZE > len(pair10_data):
+            break
+        x, y, w, h, flags = struct.unpack_from('<HHHHB', pair10_data, base)
+        walkboxes.append(Walkbox(x, y, w, h, flags))
+    return walkboxes
+
+
+def read_pair10(data, room_num):
+    pair_pos = room_num * 104 + 10 * 8
+    offset, size = struct.unpack('<II', data[pair_pos:pair_pos+8])
+    if size == 0 or offset >= len(data):
+        return None
+    return data[offset:offset+size]
+
+
+def walkboxes_adjacent(a: Walkbox, b: Walkbox) -> bool:
+    """Boxes overlap or touch (inclusive edges)"""
+    return (a.x <= b.x_max and b.x <= a.x_max and
+            a.y <= b.y_max and b.y <= a.y_max)
+
+
+class WalkboxGraph:
+    """Adjacency graph and precomputed box paths for one room"""
+
+    def __init__(self, walkboxes: Sequence[Walkbox]):
+        self.walkboxes = list(walkboxes)
+        n = len(self.walkboxes)
+
+        # Adjacent boxes in ascending index order (the game's search order)
+        self.adjacency = [
+            [j for j in range(n) if j != i and walkboxes_adjacent(self.walkboxes[i], self.walkboxes[j])]
+            for i in range(n)
+        ]
+
+        # box_paths[start][dest] -> tuple of box indices, or () if unreachable
+        self.box_paths = [[self._search(s, d) for d in range(n)] for s in range(n)]
+        self._step_cache: Dict[Tuple[int, int, int, int], Optional[List[MovementStep]]] = {}
+
+    @classmethod
+    def from_records(cls, pair10_data):
+        return cls(parse_walkbox_records(pair10_data))
+
+    @classmethod
+    def from_dicts(cls, walkbox_dicts):
+        """Build from RoomDataExtractor.extract_walkboxes() output"""
+        return cls([Walkbox(w['x'], w['y'], w['width'], w['height'], w.get('flags', 0))
+                    for w in walkbox_dicts or []])
+
+    # ------------------------------------------------------------------
+    # Box-level search (build_walkbox_path)
+    # ------------------------------------------------------------------
+
+    def _search(self, start_box, dest_box):
+        if start_box == dest_box:
+            return (start_box,)
+
+        visited = [False] * len(self.walkboxes)
+        path = [start_box]
+        current = start_box
+
+        while current != dest_box and len(path) < MAX_PATH_LENGTH - 1:
+            visited[current] = True
+            next_box = next((j for j in self.adjacency[current] if not visited[j]), None)
+
+            if next_box is None:
+                # Dead end - backtrack
+                if len(path) > 1:
+                    path.pop()
+                    current = path[-1]
+                else:
+                    return ()
+            elif next_box == dest_box:
+                path.append(dest_box)
+                break
+            else:
+                path.append(next_box)
+                current = next_box
+
+        return tuple(path)
+
+    def next_hop(self, start_box, dest_box):
+        """Box to head for next from start_box towards dest_box (None if unreachable)"""
+        path = self.box_paths[start_box][dest_box]
+        if not path:
+            return None
+        return path[1] if len(path) > 1 else path[0]
+
+    def reachable(self, start_box, dest_box):
+        return bool(self.box_paths[start_box][dest_box])
+
+    # ------------------------------------------------------------------
+    # Point-level queries
+    # ------------------------------------------------------------------
+
+    def find_walkbox(self, x, y):
+        """First walkbox containing the point, or None (find_walkbox_for_point)"""
+        for i, box in enumerate(self.walkboxes):
+            if box.contains(x, y):
+                return i
+        return None
+
+    def nearest_point(self, x, y) -> Optional[Tuple[int, int]]:
+        """The point if it is in a walkbox, else the closest point inside the closest box.
+
+        Distance is |dx| + |dy|; ties go to the lowest box index. None when
+        the room has no walkboxes.
+        """
+        if self.find_walkbox(x, y) is not None:
+            return (x, y)
+        best = None
+        for box in self.walkboxes:
+            px = min(max(x, box.x), box.x_max)
+            py = min(max(y, box.y), box.y_max)
+            distance = abs(px - x) + abs(py - y)
+            if best is None or distance < best[0]:
+                best = (distance, px, py)
+        return None if best is None else (best[1], best[2])
+
+    def movement_steps(self, start_x, start_y, dest_x, dest_y) -> Optional[List[MovementStep]]:
+        """Movement steps from start to dest, or None if no path exists"""
+        key = (start_x, start_y, dest_x, dest_y)
+        if key not in self._step_cache:
+            self._step_cache[key] = self._movement_steps(*key)
+        return self._step_cache[key]
+
+    def _movement_steps(self, start_x, start_y, dest_x, dest_y):
+        start_box = self.find_walkbox(start_x, start_y)
+        dest_box = self.find_walkbox(dest_x, dest_y)
+        if start_box is None or dest_box is None:
+            return None
+
+        if start_box == dest_box:
+            # Direct movement: the game always sets one X and one Y flag
+            if start_x < dest_x:
+                dx, flags = dest_x - start_x, MOVE_RIGHT
+            else:
+                dx, flags = start_x - dest_x, MOVE_LEFT
+            if start_y < dest_y:
+                dy, flags = dest_y - start_y, flags | MOVE_DOWN
+            else:
+                dy, flags = start_y - dest_y, flags | MOVE_UP
+            return [MovementStep(flags, dx, dy)]
+
+        path = self.box_paths[start_box][dest_box]
+        if not path:
+            return None
+
+        return self._steps_along(path, start_x, start_y, dest_x, dest_y)
+
+    def _steps_along(self, path, start_x, start_y, dest_x, dest_y):
+        """generate_movement_steps()"""
+        steps = []
+        cx, cy = start_x, start_y
+
+        for box_index in path:
+            box = self.walkboxes[box_index]
+            flags = dx = dy = 0
+
+            if cx < box.x:
+                dx, flags = box.x - cx, flags | MOVE_RIGHT
+            elif cx > box.x_max:
+                dx, flags = cx - box.x_max, flags | MOVE_LEFT
+
+            if cy < box.y:
+                dy, flags = box.y - cy, flags | MOVE_DOWN
+            elif cy > box.y_max:
+                dy, flags = cy - box.y_max, flags | MOVE_UP
+
+            if dx > 0 or dy > 0:
+                steps.append(MovementStep(flags, dx, dy))
+                if flags & MOVE_RIGHT:
+                    cx = box.x
+                elif flags & MOVE_LEFT:
+                    cx = box.x_max
+                if flags & MOVE_DOWN:
+                    cy = box.y
+                elif flags & MOVE_UP:
+                    cy = box.y_max
+
+        # Final movement to exact destination
+        flags = dx = dy = 0
+        if cx < dest_x:
+            dx, flags = dest_x - cx, flags | MOVE_RIGHT
+        elif cx > dest_x:
+            dx, flags = cx - dest_x, flags | MOVE_LEFT
+        if cy < dest_y:
+            dy, flags = dest_y - cy, flags | MOVE_DOWN
+        elif cy > dest_y:
+            dy, flags = cy - dest_y, flags | MOVE_UP
+
+        if dx > 0 or dy > 0:
+            steps.append(MovementStep(flags, dx, dy))
+
+        return steps
+
+    def batch_movement_steps(self, sources, targets):
+        """Movement steps for every (source point, target point) pair.
+
+        Returns {(source, target): steps or None}; box paths come from the
+        precomputed tables, so this is linear in the number of pairs.
+        """
+        return {(s, t): self.movement_steps(s[0], s[1], t[0], t[1])
+                for s in sources for t in targets}
+
+
+# =============================================================================
+# PATH COMPRESSION (compress_movement_path)
+# =============================================================================
+
+def pack_movement(flags, dx, dy):
+    return ((flags & 0x0F) << 12) | ((dx & 0x07) << 9) | ((dy & 0x07) << 6)
+
+
+def compress_movement_path(steps: Sequence[MovementStep]) -> bytes:
+    out = bytearray()
+
+    def emit(packed):
+        out.extend((MOVEMENT_MARKER, (packed >> 8) & 0xFF, packed & 0xFF))
+
+    for step in steps:
+        dx, dy = step.distance_x, step.distance_y
+        while dx > MAX_STEP_X:
+            emit(pack_movement(step.flags & MOVE_HORIZ, MAX_STEP_X, 0))
+            dx -= MAX_STEP_X
+        while dy > MAX_STEP_Y:
+            emit(pack_movement(step.flags & MOVE_VERT, 0, MAX_STEP_Y))
+            dy -= MAX_STEP_Y
+        if dx > 0 or dy > 0:
+            emit(pack_movement(step.flags, dx, dy))
+
+    out.append(PATH_END)
+    return bytes(out)
+
+
+# =============================================================================
+# PER-ROOM CACHE AND BULK VALIDATION
+# =============================================================================
+
+_graph_cache: Dict[Tuple[int, int], WalkboxGraph] = {}
+
+
+def room_graph(data, room_num) -> Optional[WalkboxGraph]:
+    """WalkboxGraph for a room of ALFRED.1, built once per data buffer"""
+    key = (id(data), room_num)
+    if key not in _graph_cache:
+        pair10 = read_pair10(data, room_num)
+        if pair10 is None:
+            return None
+        _graph_cache[key] = WalkboxGraph.from_records(pair10)
+    return _graph_cache[key]
+
+
+def rect_center(rect):
+    return (rect['x'] + rect['width'] // 2, rect['y'] + rect['height'] // 2)
+
+
+def validate_room_layout(graph: WalkboxGraph, exits, hotspots):
+    """Check every exit trigger against every hotspot.
+
+    Returns a list of (exit_index, hotspot_index, status) where status is
+    'ok', 'unreachable', or 'outside' (a point not on any walkbox).
+    """
+    results = []
+    exit_points = [rect_center(e['trigger']) for e in exits or []]
+    hotspot_points = [rect_center(h) for h in hotspots or []]
+    paths = graph.batch_movement_steps(exit_points, hotspot_points)
+
+    for ei, ep in enumerate(exit_points):
+        for hi, hp in enumerate(hotspot_points):
+            if graph.find_walkbox(*ep) is None or graph.find_walkbox(*hp) is None:
+                status = 'outside'
+            elif paths[(ep, hp)] is None:
+                status = 'unreachable'
+            else:
+                status = 'ok'
+            results.append((ei, hi, status))
+    return results
+
+
+def main():
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'rb') as f:
+        data = f.read()
+    room_num = int(sys.argv[2])
+    graph = room_graph(data, room_num)
+    if graph is None:
+        print(f"Room {room_num} has no pair 10 data")
+        sys.exit(1)
+
+    for i, box in enumerate(graph.walkboxes):
+        print(f"Walkbox {i}: x={box.x}, y={box.y}, w={box.width}, h={box.height} "
+              f"adjacent={graph.adjacency[i]}")
+
+    if sys.argv[3] == '--validate':
+        from extract_room_data import RoomDataExtractor
+        extractor = RoomDataExtractor(sys.argv[1])
+        results = validate_room_layout(graph, extractor.extract_exits(room_num),
+                                       extractor.extract_hotspots(room_num))
+        for ei, hi, status in results:
+            if status != 'ok':
+                print(f"  exit {ei} -> hotspot {hi}: {status}")
+        print(f"{sum(1 for r in results if r[2] == 'ok')}/{len(results)} exit/hotspot pairs reachable")
+        return
+
+    x0, y0, x1, y1 = map(int, sys.argv[3:7])
+    steps = graph.movement_steps(x0, y0, x1, y1)
+    if steps is None:
+        print("No path found!")
+        sys.exit(1)
+
+    start_box, dest_box = graph.find_walkbox(x0, y0), graph.find_walkbox(x1, y1)
+    print(f"\nWalkbox path: {list(graph.box_paths[start_box][dest_box])}")
+    for i, step in enumerate(steps):
+        print(f"  Step {i}: {step.describe()}")
+    print(f"Compressed path: {compress_movement_path(steps).hex(' ').upper()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,18 @@ from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
 def generate_scaling_lookup_tables():
+    """
+    Scaling lookup tables, generated once and shared through the
+    alfred_scaling table cache (see _generate_scaling_lookup_tables).
+    """
+    from alfred_scaling import cached_table
+    width_table = cached_table('demo_width_table', lambda: _generate_scaling_lookup_tables()[0],
+                               source=_generate_scaling_lookup_tables)
+    height_table = cached_table('demo_height_table', lambda: _generate_scaling_lookup_tables()[1],
+                                source=_generate_scaling_lookup_tables)
+    return width_table, height_table
+
+def _generate_scaling_lookup_tables():
     """
     Generate scaling lookup tables using the EXACT algorithm from the game.
     Based on Ghidra decompilation of init_character_scaling_tables @ 0x00011e28.
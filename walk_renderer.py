@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Alfred Pelrock - Batch Walk-Cycle Video Renderer
+================================================
+
+Renders Alfred walking from a start point to a target point in a room, one
+frame per game tick (18.2 Hz), as a visual regression check against the
+original game.
+
+Pipeline per walk:
+  1. The walkbox pathfinder (src/walkbox_pathfinding.py) produces movement
+     steps, which are compressed exactly as the game does
+     (compress_movement_path: at most 6 px horizontal / 5 px vertical per
+     command). Each compressed command is one tick of movement.
+  2. The walking frame is picked from the command's direction flags
+     (WALKING_ALGORITHM_DOCUMENTATION.md: vertical overrides horizontal),
+     cycling through that direction's frames of ALFRED.3 set 0.
+  3. scene_renderer.SceneRenderer composites the tick: scaling from the
+     room's scaling config, shadow remap from the ALFRED.5 map, Z from Y,
+     dirty rectangles only. Scaled/shadowed frames are cached per
+     (frame, scale, shadow), and room assets are loaded once per room.
+  4. Frames stream to a Y4M (4:4:4), raw RGB24 or APNG writer.
+
+ALFRED.3 set 0 holds 60 frames of 51x102. WALK_FRAMES assumes 4 blocks of
+15 frames in the order right, left, down, up, each a standing frame
+followed by the walk cycle; pass a different table to render_walk() if a
+room shows otherwise.
+
+Usage:
+    python3 walk_renderer.py <room> <x0> <y0> <x1> <y1> <output.y4m|.rgb|.png>
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from scene_renderer import SCREEN_HEIGHT, SCREEN_WIDTH, TICK_RATE, load_room_scene
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'src'))
+from walkbox_pathfinding import (MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MOVEMENT_MARKER,  # noqa: E402
+                                 compress_movement_path, room_graph)
+
+ALFRED_WIDTH = 51
+ALFRED_HEIGHT = 102
+WALK_SET_FRAMES = 60
+
+FRAMES_PER_DIRECTION = 15
+WALK_CYCLE_LENGTH = 8
+
+# direction -> (standing frame, walk cycle frames) within ALFRED.3 set 0
+WALK_FRAMES: Dict[str, Tuple[int, List[int]]] = {
+    name: (block * FRAMES_PER_DIRECTION,
+           list(range(block * FRAMES_PER_DIRECTION + 1,
+                      block * FRAMES_PER_DIRECTION + 1 + WALK_CYCLE_LENGTH)))
+    for block, name in enumerate(('right', 'left', 'down', 'up'))
+}
+
+
+def direction_name(flags, previous='right'):
+    """Animation direction for movement flags; vertical overrides horizontal"""
+    if flags & MOVE_DOWN:
+        return 'down'
+    if flags & MOVE_UP:
+        return 'up'
+    if flags & MOVE_RIGHT:
+        return 'right'
+    if flags & MOVE_LEFT:
+        return 'left'
+    return previous
+
+
+def load_walk_frames(alfred3_path='files/ALFRED.3') -> np.ndarray:
+    """Decode ALFRED.3 set 0 as a (60, 102, 51) array"""
+    data = np.fromfile(alfred3_path, dtype=np.uint8)
+    raw = data.tobytes()
+    end = raw.find(b'BUDA')
+    while end >= 0 and end % 2:  # The terminator sits on a pair boundary
+        end = raw.find(b'BUDA', end + 1)
+    if end < 0:
+        end = len(data) & ~1
+    pairs = data[:end].reshape(-1, 2)
+
+    size = WALK_SET_FRAMES * ALFRED_WIDTH * ALFRED_HEIGHT
+    # Only decode the runs needed to cover set 0
+    needed = np.searchsorted(np.cumsum(pairs[:, 0], dtype=np.int64), size) + 1
+    pixels = np.repeat(pairs[:needed, 1], pairs[:needed, 0])[:size]
+    return pixels.reshape(WALK_SET_FRAMES, ALFRED_HEIGHT, ALFRED_WIDTH)
+
+
+def tick_moves(compressed: bytes) -> Iterator[Tuple[int, int, int]]:
+    """Decode a compressed path into per-tick (flags, dx, dy) moves"""
+    pos = 0
+    while pos + 2 < len(compressed) and compressed[pos] == MOVEMENT_MARKER:
+        packed = (compressed[pos + 1] << 8) | compressed[pos + 2]
+        yield (packed >> 12) & 0x0F, (packed >> 9) & 0x07, (packed >> 6) & 0x07
+        pos += 3
+
+
+def walk_ticks(graph, start, target) -> Optional[List[Tuple[int, int, int]]]:
+    """Per-tick (x, y, flags) positions of a walk, or None if unreachable.
+
+    The first entry is the start position with flags 0.
+    """
+    steps = graph.movement_steps(start[0], start[1], target[0], target[1])
+    if steps is None:
+        return None
+
+    x, y = start
+    ticks = [(x, y, 0)]
+    for flags, dx, dy in tick_moves(compress_movement_path(steps)):
+        if flags & MOVE_RIGHT:
+            x += dx
+        elif flags & MOVE_LEFT:
+            x -= dx
+        if flags & MOVE_DOWN:
+            y += dy
+        elif flags & MOVE_UP:
+            y -= dy
+        ticks.append((x, y, flags))
+    return ticks
+
+
+# =============================================================================
+# FRAME WRITERS
+# =============================================================================
+
+class Y4MWriter:
+    """YUV4MPEG2 4:4:4 stream; colour conversion is one lookup per palette index"""
+
+    def __init__(self, path, palette, fps=TICK_RATE):
+        rgb = np.asarray(palette, dtype=np.float64).reshape(256, 3)
+        r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        # BT.601 limited range
+        y = 16 + 0.257 * r + 0.504 * g + 0.098 * b
+        u = 128 - 0.148 * r - 0.291 * g + 0.439 * b
+        v = 128 + 0.439 * r - 0.368 * g - 0.071 * b
+        self.lut = np.clip(np.round(np.stack([y, u, v])), 0, 255).astype(np.uint8)  # (3, 256)
+
+        self.f = open(path, 'wb')
+        self.f.write(f"YUV4MPEG2 W{SCREEN_WIDTH} H{SCREEN_HEIGHT} F{round(fps * 10)}:10 "
+                     f"Ip A1:1 C444\n".encode())
+
+    def write(self, frame):
+        self.f.write(b'FRAME\n')
+        self.f.write(self.lut[:, frame].tobytes())
+
+    def close(self):
+        self.f.close()
+
+
+class RawRGBWriter:
+    """Headerless rgb24 frames (ffmpeg -f rawvideo -pix_fmt rgb24 -s 640x400)"""
+
+    def __init__(self, path, palette, fps=TICK_RATE):
+        self.lut = np.asarray(palette, dtype=np.uint8).reshape(256, 3)
+        self.f = open(path, 'wb')
+
+    def write(self, frame):
+        self.f.write(self.lut[frame].tobytes())
+
+    def close(self):
+        self.f.close()
+
+
+class APNGWriter:
+    """Animated PNG; PIL needs all frames at close, so indexed frames are kept"""
+
+    def __init__(self, path, palette, fps=TICK_RATE):
+        self.path = path
+        self.palette = list(palette)
+        self.duration = 1000.0 / fps
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame.copy())
+
+    def close(self):
+        from PIL import Image
+        if not self.frames:
+            return
+        images = []
+        for frame in self.frames:
+            img = Image.fromarray(frame, mode='P')
+            img.putpalette(self.palette)
+            images.append(img)
+        images[0].save(self.path, save_all=True, append_images=images[1:],
+                       duration=self.duration, loop=0)
+
+
+WRITERS = {'.y4m': Y4MWriter, '.rgb': RawRGBWriter, '.raw': RawRGBWriter,
+           '.png': APNGWriter, '.apng': APNGWriter}
+
+
+def open_writer(path, palette, fps=TICK_RATE):
+    suffix = Path(path).suffix.lower()
+    if suffix not in WRITERS:
+        raise ValueError(f"Unsupported output format {suffix!r} (use {', '.join(WRITERS)})")
+    return WRITERS[suffix](path, palette, fps)
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def render_walk(scene, walk_frames, ticks, writer, walk_table=WALK_FRAMES,
+                animation_speed=1, hold_ticks=0) -> int:
+    """Composite and write one frame per tick; returns the frame count.
+
+    scene       SceneRenderer for the room (room sprites already added)
+    walk_frames (N, h, w) array of ALFRED.3 set 0 frames
+    ticks       output of walk_ticks()
+    hold_ticks  extra standing frames at the end
+    """
+    direction = 'right'
+    cycle_pos = 0
+    counter = 0
+    written = 0
+
+    for tick, (x, y, flags) in enumerate(ticks):
+        if flags:
+            direction = direction_name(flags, direction)
+            cycle = walk_table[direction][1]
+            frame_index = cycle[cycle_pos % len(cycle)]
+            counter += 1
+            if counter >= animation_speed:
+                cycle_pos += 1
+                counter = 0
+        else:
+            frame_index = walk_table[direction][0]
+
+        scene.set_alfred(walk_frames[frame_index], x, y, frame_key=frame_index)
+        if tick == 0:
+            scene.render_full()
+        else:
+            scene.render()
+        writer.write(scene.frame)
+        written += 1
+
+    if ticks and hold_ticks:
+        x, y, _ = ticks[-1]
+        standing = walk_table[direction][0]
+        scene.set_alfred(walk_frames[standing], x, y, frame_key=standing)
+        scene.render()
+        for _ in range(hold_ticks):
+            writer.write(scene.frame)
+            written += 1
+
+    return written
+
+
+def main():
+    if len(sys.argv) < 7:
+        print(__doc__)
+        sys.exit(1)
+
+    import demo_shadow_in_room as demo
+
+    room_number = int(sys.argv[1])
+    start = (int(sys.argv[2]), int(sys.argv[3]))
+    target = (int(sys.argv[4]), int(sys.argv[5]))
+    output = sys.argv[6]
+
+    with open(demo.ALFRED1_PATH, 'rb') as f:
+        graph = room_graph(f.read(), room_number)
+    if graph is None:
+        print(f"Room {room_number} has no walkboxes")
+        sys.exit(1)
+
+    ticks = walk_ticks(graph, start, target)
+    if ticks is None:
+        print(f"No path from {start} to {target} in room {room_number}")
+        sys.exit(1)
+
+    scene, palette = load_room_scene(room_number)
+    frames = load_walk_frames(demo.ALFRED3_PATH)
+
+    began = time.perf_counter()
+    writer = open_writer(output, palette)
+    try:
+        count = render_walk(scene, frames, ticks, writer, hold_ticks=int(TICK_RATE))
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - began
+
+    print(f"Room {room_number}: {len(ticks) - 1} movement ticks, {count} frames "
+          f"({count / TICK_RATE:.1f}s of game time) in {elapsed:.2f}s")
+    print(f"✓ Saved {output}")
+
+
+if __name__ == '__main__':
+    main()